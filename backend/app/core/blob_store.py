@@ -0,0 +1,76 @@
+import hashlib
+from typing import Any, Dict, Iterable, List
+
+from .cache import CACHE
+
+
+# Bundle sections whose documents carry full extracted text
+TEXT_SECTIONS = ("fetched_docs", "sources")
+
+
+class BlobStore:
+    """
+    Content-addressed store for document text shared across run bundles.
+
+    Text is hashed (sha256) as is and written once to `cache:blob:{hash}`
+    (compressed by Cache like any large value, no TTL since bundles are
+    permanent). Bundles keep only `raw_text_ref` in place of `raw_text`, so a
+    page fetched by hundreds of runs, and duplicated between `fetched_docs`
+    and `sources` within a run, is stored once. Blobs live outside the
+    versioned ai_search namespace because identical text is identical across
+    pipeline versions. Text is stored and returned byte for byte: snippet and
+    citation offsets are computed against it, so it must not be normalized.
+    """
+
+    @staticmethod
+    def blob_key(ref: str) -> str:
+        return f"cache:blob:{ref}"
+
+    def put(self, text: str) -> str:
+        ref = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        CACHE.set_if_absent(self.blob_key(ref), text, ttl=-1)
+        return ref
+
+    def get_many(self, refs: Iterable[str]) -> Dict[str, str]:
+        refs = list(set(refs))
+        texts = CACHE.get_many([self.blob_key(ref) for ref in refs])
+        return {ref: text for ref, text in zip(refs, texts) if text is not None}
+
+    def externalize(self, bundle: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a copy of `bundle` with document raw_text replaced by raw_text_ref."""
+        out = dict(bundle)
+        written: Dict[str, str] = {}  # text -> ref, avoids re-hashing duplicates
+        for section in TEXT_SECTIONS:
+            items: List[Dict[str, Any]] = []
+            for item in bundle.get(section) or []:
+                text = item.get("raw_text") if isinstance(item, dict) else None
+                if text:
+                    item = dict(item)
+                    ref = written.get(text) or self.put(text)
+                    written[text] = ref
+                    item["raw_text_ref"] = ref
+                    del item["raw_text"]
+                items.append(item)
+            if section in bundle:
+                out[section] = items
+        return out
+
+    def hydrate(self, bundle: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve raw_text_ref back into raw_text in place; legacy inline text is left as is."""
+        refs = [
+            item["raw_text_ref"]
+            for section in TEXT_SECTIONS
+            for item in bundle.get(section) or []
+            if isinstance(item, dict) and item.get("raw_text_ref") and "raw_text" not in item
+        ]
+        if not refs:
+            return bundle
+        texts = self.get_many(refs)
+        for section in TEXT_SECTIONS:
+            for item in bundle.get(section) or []:
+                if isinstance(item, dict) and item.get("raw_text_ref") and "raw_text" not in item:
+                    item["raw_text"] = texts.get(item["raw_text_ref"], "")
+        return bundle
+
+
+BLOBS = BlobStore()
@@ -1,6 +1,11 @@
 import os
 import json
-from typing import Optional, Any, List
+import time
+import asyncio
+import zlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Any, Dict, List, Tuple, Union
 from dotenv import load_dotenv
 
 # Load environment variables before importing anything else
@@ -11,6 +16,39 @@ try:
 except Exception:  # pragma: no cover
     redis = None
 
+try:
+    import redis.asyncio as aioredis  # type: ignore
+except Exception:  # pragma: no cover
+    aioredis = None
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # pragma: no cover
+    zstandard = None
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except Exception:  # pragma: no cover
+    msgpack = None
+
+# Compressed values start with a NUL byte, which never begins the plain UTF-8
+# JSON/HTML stored before compression existed, so old values still decode.
+_MAGIC_ZSTD = b"\x00zs"
+_MAGIC_ZSTD_DICT = b"\x00zd"
+_MAGIC_ZLIB = b"\x00zl"
+# Serializer tags (inside any compression). Untagged payloads are JSON, which
+# both the json and orjson serializers read and write. _MAGIC_JSON marks the
+# stdlib-json fallback of the orjson serializer (values orjson can't encode,
+# e.g. ints beyond 64 bits), which must be read back with stdlib json too:
+# orjson.loads would turn such ints into floats.
+_MAGIC_MSGPACK = b"\x00mp"
+_MAGIC_JSON = b"\x00js"
+
 
 class Cache:
     def __init__(self) -> None:
@@ -18,6 +56,28 @@ class Cache:
         if redis is None:
             raise RuntimeError("Redis library not available")
         
+        # Transparent value compression (see _encode/_decode)
+        default_codec = "zstd" if zstandard is not None else "zlib"
+        self.compression = os.getenv("CACHE_COMPRESSION", default_codec).strip().lower()
+        if self.compression == "zstd" and zstandard is None:
+            self.compression = "zlib"
+        self.compress_min_bytes = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+        self.compress_level = int(os.getenv("CACHE_COMPRESSION_LEVEL", "3" if self.compression == "zstd" else "6"))
+        self.dict_prefixes = tuple(
+            p.strip() for p in os.getenv("CACHE_ZSTD_DICT_PREFIXES", "cache:content:").split(",") if p.strip()
+        )
+        self._zstd_dict = self._load_zstd_dict(os.getenv("CACHE_ZSTD_DICT_PATH", ""))
+        self._local = threading.local()
+        # Keys per MGET / pipeline round-trip in the *_many helpers
+        self.batch_size = int(os.getenv("CACHE_BATCH_SIZE", "200"))
+
+        # Serializer for get_json/set_json and the *_json hash helpers
+        default_serializer = "orjson" if orjson is not None else "json"
+        self.serializer = os.getenv("CACHE_SERIALIZER", default_serializer).strip().lower()
+        if (self.serializer == "orjson" and orjson is None) or (self.serializer == "msgpack" and msgpack is None):
+            print(f"[CACHE] {self.serializer} not installed, using json serializer")
+            self.serializer = "json"
+
         url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self._redis = redis.Redis.from_url(url)
         
@@ -27,30 +87,142 @@ class Cache:
         except Exception as e:
             raise RuntimeError(f"Redis connection failed: {e}")
 
+    # Compression
+    @staticmethod
+    def _load_zstd_dict(path: str):
+        if not path or zstandard is None:
+            return None
+        try:
+            with open(path, "rb") as fh:
+                return zstandard.ZstdCompressionDict(fh.read())
+        except Exception as e:
+            print(f"[CACHE] Could not load zstd dictionary {path}: {e}")
+            return None
+
+    def _zstd(self, with_dict: bool):
+        # zstandard (de)compressors are not thread-safe; Cache is used from worker threads
+        attr = "zstd_dict" if with_dict else "zstd"
+        pair = getattr(self._local, attr, None)
+        if pair is None:
+            kwargs = {"dict_data": self._zstd_dict} if with_dict else {}
+            pair = (
+                zstandard.ZstdCompressor(level=self.compress_level, **kwargs),
+                zstandard.ZstdDecompressor(**kwargs),
+            )
+            setattr(self._local, attr, pair)
+        return pair
+
+    def _encode(self, key: str, value: Union[str, bytes]) -> bytes:
+        data = value.encode("utf-8") if isinstance(value, str) else value
+        if self.compression == "none" or len(data) < self.compress_min_bytes:
+            return data
+        if self.compression == "zstd":
+            if self._zstd_dict is not None and key.startswith(self.dict_prefixes):
+                return _MAGIC_ZSTD_DICT + self._zstd(True)[0].compress(data)
+            return _MAGIC_ZSTD + self._zstd(False)[0].compress(data)
+        return _MAGIC_ZLIB + zlib.compress(data, self.compress_level)
+
+    def _decompress(self, val: bytes) -> bytes:
+        if val[:1] == b"\x00":
+            magic, body = val[:3], val[3:]
+            if magic == _MAGIC_ZLIB:
+                return zlib.decompress(body)
+            if magic == _MAGIC_ZSTD:
+                return self._zstd(False)[1].decompress(body)
+            if magic == _MAGIC_ZSTD_DICT:
+                if self._zstd_dict is None:
+                    raise RuntimeError("zstd dictionary required to decode value (set CACHE_ZSTD_DICT_PATH)")
+                return self._zstd(True)[1].decompress(body)
+        return val
+
+    def _decode(self, val: bytes) -> str:
+        return self._decompress(val).decode("utf-8")
+
+    # Serialization
+    def dumps(self, value: Any) -> bytes:
+        """Serialize with CACHE_SERIALIZER (json, orjson or msgpack)."""
+        if self.serializer == "msgpack":
+            return _MAGIC_MSGPACK + msgpack.packb(value, use_bin_type=True)
+        if self.serializer == "orjson":
+            try:
+                return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+            except TypeError:
+                # e.g. ints beyond 64 bits; tagged so loads() uses stdlib json
+                return _MAGIC_JSON + json.dumps(value).encode("utf-8")
+        return json.dumps(value).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        """Deserialize any format dumps() has produced, whatever CACHE_SERIALIZER is now.
+
+        Untagged JSON goes through orjson unless CACHE_SERIALIZER=json, falling
+        back to stdlib json for what orjson rejects (NaN/Infinity written by
+        stdlib json). Ints beyond 64 bits in untagged values written by the
+        json serializer read back exactly only with CACHE_SERIALIZER=json.
+        """
+        if data[:3] == _MAGIC_MSGPACK:
+            if msgpack is None:
+                raise RuntimeError("msgpack required to decode value (pip install msgpack)")
+            return msgpack.unpackb(data[3:], raw=False, strict_map_key=False)
+        if data[:3] == _MAGIC_JSON:
+            return json.loads(data[3:])
+        if orjson is not None and self.serializer != "json":
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return json.loads(data)
+
     def get(self, key: str) -> Optional[str]:
         val = self._redis.get(key)
-        return val.decode("utf-8") if val else None
+        return self._decode(val) if val else None
 
-    def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+    def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
         # If no TTL specified, use default. If explicitly None passed, make it permanent.
         if ttl is None:
             ttl = self.ttl_default
         elif ttl == -1:  # Use -1 as sentinel for permanent storage
             ttl = None
             
+        data = self._encode(key, value)
         if ttl is None:
             # Permanent storage - no TTL
-            self._redis.set(key, value)
+            self._redis.set(key, data)
         else:
             # Temporary storage with TTL
-            self._redis.setex(key, ttl, value)
+            self._redis.setex(key, ttl, data)
+
+    def set_if_absent(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """SET NX; returns False if the key already existed. Same ttl semantics as set()."""
+        if ttl is None:
+            ttl = self.ttl_default
+        elif ttl == -1:
+            ttl = None
+        return bool(self._redis.set(key, self._encode(key, value), nx=True, ex=ttl))
 
     def get_json(self, key: str) -> Optional[Any]:
-        val = self.get(key)
-        return json.loads(val) if val else None
+        val = self._redis.get(key)
+        return self.loads(self._decompress(val)) if val else None
 
     def set_json(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        self.set(key, json.dumps(value), ttl)
+        self.set(key, self.dumps(value), ttl)
+
+    # Batched reads: one round-trip per batch_size keys instead of one per key.
+    # Results line up with `keys`; missing keys come back as None.
+    def _chunks(self, keys: List[str]):
+        for i in range(0, len(keys), self.batch_size):
+            yield keys[i:i + self.batch_size]
+
+    def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        out: List[Optional[str]] = []
+        for chunk in self._chunks(list(keys)):
+            out.extend(self._decode(v) if v else None for v in self._redis.mget(chunk))
+        return out
+
+    def get_many_json(self, keys: List[str]) -> List[Optional[Any]]:
+        out: List[Optional[Any]] = []
+        for chunk in self._chunks(list(keys)):
+            out.extend(self.loads(self._decompress(v)) if v else None for v in self._redis.mget(chunk))
+        return out
 
     # Debug helpers
     def keys(self, pattern: str = "*") -> List[str]:
@@ -68,23 +240,134 @@ class Cache:
         except Exception:
             pass
 
+    def exists(self, key: str) -> bool:
+        try:
+            return bool(self._redis.exists(key))
+        except Exception:
+            return False
+
+    def exists_many(self, keys: List[str]) -> List[bool]:
+        out: List[bool] = []
+        for chunk in self._chunks(list(keys)):
+            pipe = self._redis.pipeline(transaction=False)
+            for key in chunk:
+                pipe.exists(key)
+            out.extend(bool(n) for n in pipe.execute())
+        return out
+
+    def ttl_many(self, keys: List[str]) -> List[Optional[int]]:
+        out: List[Optional[int]] = []
+        for chunk in self._chunks(list(keys)):
+            pipe = self._redis.pipeline(transaction=False)
+            for key in chunk:
+                pipe.ttl(key)
+            out.extend(int(t) if t is not None else None for t in pipe.execute())
+        return out
+
+    # Hash operations (field values go through the same serializer and compression as set_json/get_json)
+    def hset_json(self, key: str, mapping: Dict[str, Any], ttl: Optional[int] = None, replace: bool = True) -> None:
+        """Write `mapping` into a hash atomically, replacing the whole hash unless replace=False.
+        Same ttl semantics as set()."""
+        if ttl is None:
+            ttl = self.ttl_default
+        elif ttl == -1:
+            ttl = None
+        pipe = self._redis.pipeline(transaction=True)
+        if replace:
+            pipe.delete(key)
+        pipe.hset(key, mapping={f: self._encode(key, self.dumps(v)) for f, v in mapping.items()})
+        if ttl:
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+    def hmget_json(self, key: str, fields: List[str]) -> List[Optional[Any]]:
+        values = self._redis.hmget(key, fields)
+        return [self.loads(self._decompress(v)) if v is not None else None for v in values]
+
+    def hgetall_json(self, key: str) -> Dict[str, Any]:
+        return {f.decode("utf-8"): self.loads(self._decompress(v)) for f, v in self._redis.hgetall(key).items()}
+
+    # Raw variants: values decompressed but left serialized (decode with loads())
+    def hgetall_raw(self, key: str) -> Dict[str, bytes]:
+        return {f.decode("utf-8"): self._decompress(v) for f, v in self._redis.hgetall(key).items()}
+
+    def hmget_raw(self, key: str, fields: List[str]) -> List[Optional[bytes]]:
+        return [self._decompress(v) if v is not None else None for v in self._redis.hmget(key, fields)]
+
+    def hmget_many_json(self, keys: List[str], fields: List[str]) -> List[List[Optional[Any]]]:
+        """HMGET the same fields from many hashes, pipelined in batches."""
+        out: List[List[Optional[Any]]] = []
+        for chunk in self._chunks(list(keys)):
+            pipe = self._redis.pipeline(transaction=False)
+            for key in chunk:
+                pipe.hmget(key, fields)
+            for values in pipe.execute():
+                out.append([self.loads(self._decompress(v)) if v is not None else None for v in values])
+        return out
+
+    def hgetall_many_json(self, keys: List[str]) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for chunk in self._chunks(list(keys)):
+            pipe = self._redis.pipeline(transaction=False)
+            for key in chunk:
+                pipe.hgetall(key)
+            for fields in pipe.execute():
+                out.append({f.decode("utf-8"): self.loads(self._decompress(v)) for f, v in fields.items()})
+        return out
+
     # Redis-only sorted set operations
     def zadd(self, key: str, score: float, member: str, ttl: Optional[int] = None) -> None:
         self._redis.zadd(key, {member: score})
         if ttl:
             self._redis.expire(key, ttl)
 
+    def zcard(self, key: str) -> int:
+        try:
+            return int(self._redis.zcard(key))
+        except Exception:
+            return 0
+
+    # Sets
+    def sadd(self, key: str, *members: str) -> int:
+        """Add members; returns how many were not already present."""
+        return int(self._redis.sadd(key, *members))
+
+    def smembers(self, key: str) -> List[str]:
+        try:
+            return [m.decode("utf-8") for m in self._redis.smembers(key)]
+        except Exception:
+            return []
+
+    def srem(self, key: str, *members: str) -> int:
+        return int(self._redis.srem(key, *members)) if members else 0
+
+    def scard(self, key: str) -> int:
+        try:
+            return int(self._redis.scard(key))
+        except Exception:
+            return 0
+
     def lpush(self, key: str, value: str, ttl: Optional[int] = None) -> None:
         self._redis.lpush(key, value)
         if ttl:
             self._redis.expire(key, ttl)
 
+    def rpush(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        self._redis.rpush(key, value)
+        if ttl:
+            self._redis.expire(key, ttl)
+
     def ltrim(self, key: str, max_len: int) -> None:
         try:
             self._redis.ltrim(key, 0, max_len - 1)
         except Exception:
             pass
 
+    def brpop(self, key: str, timeout: int = 1) -> Optional[str]:
+        """Blocking pop from the tail of a list (FIFO with lpush); None on timeout."""
+        item = self._redis.brpop(key, timeout=timeout)
+        return item[1].decode("utf-8") if item else None
+
     def zrevrange_withscores(self, key: str, start: int, end: int) -> List[tuple[str, float]]:
         try:
             items = self._redis.zrevrange(key, start, end, withscores=True)
@@ -92,6 +375,15 @@ class Cache:
         except Exception:
             return []
 
+    def zrevrangebyscore_withscores(self, key: str, max_score: Any, min_score: Any,
+                                    start: Optional[int] = None, num: Optional[int] = None) -> List[tuple[str, float]]:
+        """Members with min_score <= score <= max_score, highest first; "(" prefixes make a bound exclusive."""
+        try:
+            items = self._redis.zrevrangebyscore(key, max_score, min_score, start=start, num=num, withscores=True)
+            return [(m.decode("utf-8"), float(s)) for m, s in items]
+        except Exception:
+            return []
+
     def lrange(self, key: str, start: int, end: int) -> List[str]:
         try:
             items = self._redis.lrange(key, start, end)
@@ -99,6 +391,14 @@ class Cache:
         except Exception:
             return []
 
+    def pipeline(self, transaction: bool = True):
+        """Raw redis pipeline for multi-command updates (values are not encoded)."""
+        return self._redis.pipeline(transaction=transaction)
+
+    def register_script(self, script: str):
+        """Register a Lua script; the returned callable runs it atomically via EVALSHA."""
+        return self._redis.register_script(script)
+
     # Namespacing
     @staticmethod
     def ai_prefix() -> str:
@@ -112,3 +412,192 @@ class Cache:
 
 CACHE = Cache()
 
+
+class AsyncCache:
+    """
+    Non-blocking counterpart of Cache for coroutines, on redis.asyncio with a
+    connection pool of REDIS_ASYNC_MAX_CONNECTIONS. Values go through CACHE's
+    serializer and compression, so either client reads what the other wrote.
+    Connections are bound to the event loop they were opened on; if the
+    running loop changed, a new client is created for it.
+    """
+
+    def __init__(self, codec: Cache) -> None:
+        self.codec = codec
+        self.url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.max_connections = int(os.getenv("REDIS_ASYNC_MAX_CONNECTIONS", "50"))
+        self._client = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def _redis(self):
+        if aioredis is None:
+            raise RuntimeError("redis.asyncio not available")
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = aioredis.Redis.from_url(self.url, max_connections=self.max_connections)
+            self._loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the running loop's client (called on app shutdown)."""
+        client, owner = self._client, self._loop
+        self._client = self._loop = None
+        if client is not None and owner is asyncio.get_running_loop():
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    async def get(self, key: str) -> Optional[str]:
+        val = await self._redis.get(key)
+        return self.codec._decode(val) if val else None
+
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> None:
+        # Same ttl semantics as Cache.set: None = default TTL, -1 = permanent
+        if ttl is None:
+            ttl = self.codec.ttl_default
+        elif ttl == -1:
+            ttl = None
+        await self._redis.set(key, self.codec._encode(key, value), ex=ttl)
+
+    async def get_json(self, key: str) -> Optional[Any]:
+        val = await self._redis.get(key)
+        return self.codec.loads(self.codec._decompress(val)) if val else None
+
+    async def set_json(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        await self.set(key, self.codec.dumps(value), ttl)
+
+    async def exists(self, key: str) -> bool:
+        try:
+            return bool(await self._redis.exists(key))
+        except Exception:
+            return False
+
+    async def smembers(self, key: str) -> List[str]:
+        try:
+            return [m.decode("utf-8") for m in await self._redis.smembers(key)]
+        except Exception:
+            return []
+
+    async def brpop(self, key: str, timeout: int = 1) -> Optional[str]:
+        """Blocking pop from the tail of a list (FIFO with lpush); None on timeout."""
+        item = await self._redis.brpop(key, timeout=timeout)
+        return item[1].decode("utf-8") if item else None
+
+    async def zadd(self, key: str, score: float, member: str, ttl: Optional[int] = None) -> None:
+        await self._redis.zadd(key, {member: score})
+        if ttl:
+            await self._redis.expire(key, ttl)
+
+    async def lpush(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self._redis.lpush(key, value)
+        if ttl:
+            await self._redis.expire(key, ttl)
+
+    async def rpush(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        await self._redis.rpush(key, value)
+        if ttl:
+            await self._redis.expire(key, ttl)
+
+    async def lrange(self, key: str, start: int, end: int) -> List[str]:
+        try:
+            items = await self._redis.lrange(key, start, end)
+            return [i.decode("utf-8") for i in items]
+        except Exception:
+            return []
+
+    async def zrevrange_withscores(self, key: str, start: int, end: int) -> List[tuple[str, float]]:
+        try:
+            items = await self._redis.zrevrange(key, start, end, withscores=True)
+            return [(m.decode("utf-8"), float(s)) for m, s in items]
+        except Exception:
+            return []
+
+
+ASYNC_CACHE = AsyncCache(CACHE)
+
+
+class LocalCache:
+    """
+    In-process LRU in front of Redis, bounded by bytes (the size passed to
+    set()) with a TTL per entry. Values are shared by every caller and must be
+    treated as read-only. Thread-safe; each worker process has its own, so a
+    write in one process only reaches the others when their entries expire.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counts = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._drop(key)
+                self.counts["expirations"] += 1
+                entry = None
+            if entry is None:
+                self.counts["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            self.counts["hits"] += 1
+            return entry[2]
+
+    def set(self, key: str, value: Any, size: int) -> None:
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._items[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._items)))
+                self.counts["evictions"] += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if self._drop(key):
+                self.counts["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def _drop(self, key: str) -> bool:
+        entry = self._items.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry[1]
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.counts["hits"], self.counts["misses"]
+            total = hits + misses
+            return {
+                **self.counts,
+                "hit_rate": round(hits / total, 3) if total else None,
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
+
+
+# Serialized run bundle sections for single-run reads (see Store.get_run / get_sections);
+# BUNDLE_L1_MAX_BYTES=0 disables it
+BUNDLE_CACHE = LocalCache(
+    max_bytes=int(os.getenv("BUNDLE_L1_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=float(os.getenv("BUNDLE_L1_TTL", "30")),
+)
+
@@ -0,0 +1,208 @@
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Deque, Dict, List, Optional, Tuple
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a provider is skipped because its breaker is open."""
+
+
+class Admission:
+    """A call let through by CircuitBreaker.allow(); probes belong to one half-open period."""
+
+    __slots__ = ("probe", "epoch")
+
+    def __init__(self, probe: bool, epoch: int) -> None:
+        self.probe = probe
+        self.epoch = epoch
+
+
+def _quantile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with a latency-derived timeout for one provider.
+
+    closed     calls pass; outcomes go into a sliding window of the last
+               CB_WINDOW calls. Once CB_MIN_CALLS are recorded and the failure
+               rate reaches CB_FAILURE_RATE, the breaker opens.
+    open       calls are skipped for CB_COOLDOWN_S seconds.
+    half_open  up to CB_HALF_OPEN_PROBES concurrent probe calls are let through;
+               a successful probe closes the breaker, a failed one reopens it.
+               Only the probes' outcomes count here; late results of calls
+               admitted while closed are ignored.
+
+    The per-call timeout is the observed p95 latency of successful calls times
+    CB_TIMEOUT_MULTIPLIER, clamped to [CB_TIMEOUT_MIN_S, CB_TIMEOUT_MAX_S].
+    Until CB_MIN_CALLS successes are seen the ceiling is used.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.window = int(os.getenv("CB_WINDOW", "20"))
+        self.min_calls = int(os.getenv("CB_MIN_CALLS", "5"))
+        self.failure_rate_threshold = float(os.getenv("CB_FAILURE_RATE", "0.5"))
+        self.cooldown_s = float(os.getenv("CB_COOLDOWN_S", "30"))
+        self.half_open_probes = int(os.getenv("CB_HALF_OPEN_PROBES", "1"))
+        self.timeout_multiplier = float(os.getenv("CB_TIMEOUT_MULTIPLIER", "1.5"))
+        self.timeout_min_s = float(os.getenv("CB_TIMEOUT_MIN_S", "3"))
+        self.timeout_max_s = float(os.getenv("CB_TIMEOUT_MAX_S", "30"))
+
+        self.state = "closed"
+        self.opened_at: Optional[float] = None
+        self._outcomes: Deque[Tuple[bool, float]] = deque(maxlen=self.window)  # (ok, latency_s)
+        self._probes_in_flight = 0
+        self._epoch = 0  # bumped on entering half_open
+        self.short_circuited = 0
+        self.timeouts = 0
+        self.times_opened = 0
+
+    # State transitions
+    def allow(self) -> Optional[Admission]:
+        """Admit a call, or return None to skip it. In half_open this claims a
+        probe slot, which `call()` frees; callers that never reach `call()`
+        must hand the admission back with `release()`."""
+        if self.state == "open":
+            if time.monotonic() - (self.opened_at or 0) < self.cooldown_s:
+                self.short_circuited += 1
+                return None
+            self.state = "half_open"
+            self._probes_in_flight = 0
+            self._epoch += 1
+            print(f"[BREAKER] {self.name} half-open, probing")
+        if self.state == "half_open":
+            if self._probes_in_flight >= self.half_open_probes:
+                self.short_circuited += 1
+                return None
+            self._probes_in_flight += 1
+            return Admission(probe=True, epoch=self._epoch)
+        return Admission(probe=False, epoch=self._epoch)
+
+    def _is_current_probe(self, admission: Optional[Admission]) -> bool:
+        return (
+            admission is not None and admission.probe
+            and self.state == "half_open" and admission.epoch == self._epoch
+        )
+
+    def release(self, admission: Optional[Admission]) -> None:
+        """Give back a probe slot whose call never produced an outcome."""
+        if self._is_current_probe(admission):
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _open(self) -> None:
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        print(f"[BREAKER] {self.name} opened for {self.cooldown_s:.0f}s (failure rate {self.failure_rate():.0%})")
+
+    def record(self, ok: bool, latency_s: float, admission: Optional[Admission] = None) -> None:
+        if self.state == "half_open":
+            if not self._is_current_probe(admission):
+                return
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if ok:
+                self.state = "closed"
+                self.opened_at = None
+                self._outcomes.clear()
+                print(f"[BREAKER] {self.name} closed after successful probe")
+            else:
+                self._open()
+            self._outcomes.append((ok, latency_s))
+            return
+        self._outcomes.append((ok, latency_s))
+        if (
+            self.state == "closed"
+            and len(self._outcomes) >= self.min_calls
+            and self.failure_rate() >= self.failure_rate_threshold
+        ):
+            self._open()
+
+    # Observations
+    def failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for ok, _ in self._outcomes if not ok) / len(self._outcomes)
+
+    def latencies(self) -> List[float]:
+        return [lat for ok, lat in self._outcomes if ok]
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Observed latency quantile of successful calls, or None without enough samples."""
+        lat = self.latencies()
+        if len(lat) < self.min_calls:
+            return None
+        return _quantile(lat, q)
+
+    def timeout(self) -> float:
+        p95 = self.latency_quantile(0.95)
+        if p95 is None:
+            return self.timeout_max_s
+        return min(self.timeout_max_s, max(self.timeout_min_s, p95 * self.timeout_multiplier))
+
+    async def call(self, coro: Awaitable[Any], admission: Optional[Admission] = None) -> Any:
+        """Await `coro` under the adaptive timeout and record the outcome.
+
+        `admission` is what `allow()` returned for this call.
+        """
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(coro, timeout=self.timeout())
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.record(False, time.monotonic() - start, admission)
+            raise
+        except asyncio.CancelledError:
+            # Not the provider's fault; just release a half-open probe slot
+            self.release(admission)
+            raise
+        except Exception:
+            self.record(False, time.monotonic() - start, admission)
+            raise
+        self.record(True, time.monotonic() - start, admission)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        lat = self.latencies()
+        cooldown_left = None
+        if self.state == "open" and self.opened_at is not None:
+            cooldown_left = round(max(0.0, self.cooldown_s - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "calls_in_window": len(self._outcomes),
+            "failure_rate": round(self.failure_rate(), 3),
+            "latency_p50_ms": round(_quantile(lat, 0.5) * 1000) if lat else None,
+            "latency_p95_ms": round(_quantile(lat, 0.95) * 1000) if lat else None,
+            "timeout_s": round(self.timeout(), 2),
+            "cooldown_remaining_s": cooldown_left,
+            "short_circuited": self.short_circuited,
+            "timeouts": self.timeouts,
+            "times_opened": self.times_opened,
+        }
+
+
+class CircuitBreakers:
+    """Process-wide registry of per-provider breakers."""
+
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, provider: str) -> CircuitBreaker:
+        provider = provider.lower()
+        breaker = self._breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(provider)
+            self._breakers[provider] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: b.snapshot() for name, b in sorted(self._breakers.items())}
+
+
+PROVIDER_BREAKERS = CircuitBreakers()
@@ -0,0 +1,111 @@
+import os
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .circuit_breaker import PROVIDER_BREAKERS
+
+
+class RequestHedger:
+    """Hedged provider requests for heavy-tailed providers.
+
+    If a call has not returned after the provider's observed latency quantile
+    (HEDGE_QUANTILE, default p90, taken from its circuit breaker window), an
+    identical second request is fired and whichever succeeds first wins; the
+    loser is cancelled.
+
+    Extra spend is capped per provider by a budget: each primary request earns
+    HEDGE_BUDGET_RATIO hedge tokens (at most HEDGE_BUDGET_MAX banked) and each
+    hedge spends one, so hedges stay below that fraction of traffic. Hedges do
+    not take rate-limit tokens; the budget is what bounds them.
+
+    HEDGE_ENABLED=true turns it on for HEDGE_PROVIDERS (default the LLM-backed
+    perplexity, gemini and openai providers).
+    """
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv("HEDGE_ENABLED", "false").strip().lower() == "true"
+        self.providers = {
+            p.strip().lower()
+            for p in os.getenv("HEDGE_PROVIDERS", "perplexity,gemini,openai").split(",")
+            if p.strip()
+        }
+        self.quantile = float(os.getenv("HEDGE_QUANTILE", "0.9"))
+        self.min_delay_s = float(os.getenv("HEDGE_MIN_DELAY_S", "0.5"))
+        self.budget_ratio = float(os.getenv("HEDGE_BUDGET_RATIO", "0.1"))
+        self.budget_max = float(os.getenv("HEDGE_BUDGET_MAX", "3"))
+        self._budget: Dict[str, float] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _stats_for(self, provider: str) -> Dict[str, int]:
+        return self._stats.setdefault(provider, {"primaries": 0, "hedges": 0, "hedge_wins": 0, "budget_denied": 0})
+
+    def delay_for(self, provider: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None when hedging does not apply."""
+        if not self.enabled or provider not in self.providers:
+            return None
+        observed = PROVIDER_BREAKERS.get(provider).latency_quantile(self.quantile)
+        if observed is None:
+            return None
+        return max(self.min_delay_s, observed)
+
+    def _take_budget(self, provider: str) -> bool:
+        if self._budget.get(provider, 0.0) >= 1.0:
+            self._budget[provider] -= 1.0
+            return True
+        return False
+
+    async def run(self, provider: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await factory(), hedging with a second factory() call if it runs long."""
+        provider = provider.lower()
+        delay = self.delay_for(provider)
+        if delay is None:
+            return await factory()
+
+        stats = self._stats_for(provider)
+        stats["primaries"] += 1
+        self._budget[provider] = min(self.budget_max, self._budget.get(provider, 0.0) + self.budget_ratio)
+
+        primary = asyncio.ensure_future(factory())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+            if not self._take_budget(provider):
+                stats["budget_denied"] += 1
+                return await primary
+
+            stats["hedges"] += 1
+            print(f"[HEDGE] {provider} slower than {delay:.2f}s, sending hedge request")
+            hedge = asyncio.ensure_future(factory())
+            tasks.append(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the primary if both landed together
+                for t in sorted(done, key=lambda t: t is not primary):
+                    if t.exception() is None:
+                        if t is hedge:
+                            stats["hedge_wins"] += 1
+                        return t.result()
+            # Both failed: surface the primary's error
+            hedge.exception()
+            raise primary.exception()
+        finally:
+            for t in tasks:
+                if not t.done():
+                    t.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "providers": sorted(self.providers),
+            "quantile": self.quantile,
+            "stats": {
+                p: {**s, "budget": round(self._budget.get(p, 0.0), 2), "delay_s": self.delay_for(p)}
+                for p, s in sorted(self._stats.items())
+            },
+        }
+
+
+REQUEST_HEDGER = RequestHedger()
@@ -0,0 +1,99 @@
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, AsyncIterator
+from urllib.parse import urlparse
+
+import httpx
+
+# HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 keep-alive without it
+try:
+    import h2  # type: ignore  # noqa: F401
+    HTTP2_AVAILABLE = True
+except Exception:  # pragma: no cover
+    HTTP2_AVAILABLE = False
+
+
+class HttpClients:
+    """App-lifetime registry of pooled httpx.AsyncClient instances.
+
+    One client per name ("tavily", "perplexity", "fetch", ...). Provider clients
+    talk to a single API host, so their pool limits are effectively per-host
+    limits. The shared "fetch" client hits arbitrary hosts, so page fetches
+    additionally go through a per-host semaphore (see `host_slot`).
+    """
+
+    def __init__(self) -> None:
+        self.max_per_host = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "8"))
+        self.max_connections = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+        self.keepalive_expiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+        self.http2 = HTTP2_AVAILABLE and os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._loops: Dict[str, asyncio.AbstractEventLoop] = {}
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+        self._host_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _limits(self, name: str) -> httpx.Limits:
+        if name == "fetch":
+            return httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+        return httpx.Limits(
+            max_connections=self.max_per_host,
+            max_keepalive_connections=self.max_per_host,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the pooled client for `name`, creating it on first use.
+
+        Connections are bound to the event loop they were opened on; if the
+        running loop changed (e.g. a fresh `asyncio.run`), the stale client is
+        dropped and a new one is created for the current loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(name)
+        if client is not None and self._loops.get(name) is loop and not client.is_closed:
+            return client
+
+        client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=self._limits(name),
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            follow_redirects=(name == "fetch"),
+        )
+        self._clients[name] = client
+        self._loops[name] = loop
+        return client
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncIterator[None]:
+        """Bound concurrent requests to a single host on the shared fetch client."""
+        loop = asyncio.get_running_loop()
+        if self._host_loop is not loop:
+            self._host_sems = {}
+            self._host_loop = loop
+        host = (urlparse(url).hostname or "").lower()
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_per_host)
+            self._host_sems[host] = sem
+        async with sem:
+            yield
+
+    async def aclose(self) -> None:
+        """Close every client owned by the running loop (called on app shutdown)."""
+        loop = asyncio.get_running_loop()
+        for name in list(self._clients):
+            client = self._clients.pop(name)
+            owner = self._loops.pop(name, None)
+            if owner is loop:
+                try:
+                    await client.aclose()
+                except Exception:
+                    pass
+
+
+HTTP_CLIENTS = HttpClients()
@@ -0,0 +1,125 @@
+import os
+import time
+import asyncio
+from typing import Dict
+
+from .cache import CACHE
+
+
+# Defaults match the per-provider RATE_LIMIT_* env vars documented for the search pipeline
+DEFAULT_RATES = {
+    "brave": 0.5,
+    "tavily": 2.0,
+    "openai": 2.0,
+    "perplexity": 1.0,
+    "gemini": 1.0,
+}
+
+# Reserve one token and return how long (ms) the caller must wait before using it.
+# KEYS[1] = bucket hash, ARGV = rate (tokens/s), burst capacity
+_REDIS_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+  tokens = burst
+  ts = now
+end
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+tokens = tokens - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+if tokens >= 0 then
+  return 0
+end
+return math.ceil(-tokens / rate * 1000)
+"""
+
+
+class TokenBucket:
+    """In-process async token bucket.
+
+    Each acquire reserves a token immediately (the balance may go negative)
+    and sleeps for the deficit, so concurrent callers queue up at exactly
+    `rate` requests/second instead of all reading the same timestamp.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.ts = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take one token; return the seconds to wait before it is valid."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.ts) * self.rate)
+        self.ts = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """Per-provider token buckets shared by every run in the process.
+
+    RATE_LIMIT_{PROVIDER}        requests/second (e.g. RATE_LIMIT_TAVILY=2)
+    RATE_LIMIT_BURST_{PROVIDER}  bucket capacity (default 1)
+    RATE_LIMIT_BACKEND=redis     share buckets across processes via a Lua script
+    """
+
+    def __init__(self) -> None:
+        self.backend = os.getenv("RATE_LIMIT_BACKEND", "local").strip().lower()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._script = None
+
+    @staticmethod
+    def rate_for(provider: str) -> float:
+        default = DEFAULT_RATES.get(provider, 1.0)
+        return float(os.getenv(f"RATE_LIMIT_{provider.upper()}", str(default)))
+
+    @staticmethod
+    def burst_for(provider: str) -> float:
+        return float(os.getenv(f"RATE_LIMIT_BURST_{provider.upper()}", "1"))
+
+    def _bucket(self, provider: str) -> TokenBucket:
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_for(provider), self.burst_for(provider))
+            self._buckets[provider] = bucket
+        return bucket
+
+    def _redis_reserve(self, provider: str) -> float:
+        if self._script is None:
+            self._script = CACHE.register_script(_REDIS_BUCKET_LUA)
+        key = CACHE.ai_key(f"ratelimit:{provider}")
+        wait_ms = self._script(keys=[key], args=[self.rate_for(provider), self.burst_for(provider)])
+        return int(wait_ms) / 1000.0
+
+    async def acquire(self, provider: str) -> float:
+        """Wait for a request slot for `provider`; returns the seconds waited."""
+        provider = provider.lower()
+        if self.rate_for(provider) <= 0:
+            return 0.0
+        if self.backend == "redis":
+            try:
+                wait = await asyncio.to_thread(self._redis_reserve, provider)
+            except Exception as e:
+                print(f"[RATE_LIMIT] Redis bucket unavailable, using local bucket: {e}")
+                return await self._bucket(provider).acquire()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            return wait
+        return await self._bucket(provider).acquire()
+
+
+RATE_LIMITER = RateLimiter()
@@ -3,9 +3,10 @@ import uuid
 from datetime import datetime
 import os
 import hashlib
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-from ..core.cache import CACHE
+from ..core.cache import CACHE, ASYNC_CACHE, BUNDLE_CACHE
+from ..core.blob_store import BLOBS
 from ..utils.source_categorization import categorize_source
 
 
@@ -58,8 +59,16 @@ class Store:
             # del stats["total_credibility"] REMOVED
             del stats["total_content_length"]
         
-        # Add provider performance data to bundle
-        bundle["provider_performance"] = provider_stats
+        # Merge into the search-stage entries (queries, errors, breaker, hedging,
+        # cache hits); providers that returned no sources still get the fields
+        provider_performance = bundle.get("provider_performance") or {}
+        for provider, stats in provider_stats.items():
+            provider_performance.setdefault(provider, {}).update(stats)
+        for stats in provider_performance.values():
+            stats.setdefault("count", 0)
+            stats.setdefault("categories", {})
+            stats.setdefault("avg_content_length", 0)
+        bundle["provider_performance"] = provider_performance
         
         # Add computed analysis with funnel metrics
         from ..services.analysis import compute_analysis
@@ -67,7 +76,7 @@ class Store:
         bundle["analysis"] = analysis  # Always include analysis metrics
 
         # ONLY REDIS - Store the complete bundle permanently (no TTL)
-        CACHE.set_json(CACHE.ai_key(f"{run_id}"), bundle, ttl=-1)
+        self.save_bundle(run_id, bundle, ttl=-1)
 
         # Store query hash for deduplication (30m TTL)
         query = (run_data.get("query") or "").strip().lower()
@@ -77,6 +86,7 @@ class Store:
             # Add to query history list (7d TTL)
             CACHE.lpush(CACHE.ai_key(f"q:{qhash}"), run_id)
             CACHE.ltrim(CACHE.ai_key(f"q:{qhash}"), 20)
+            self.register("indexes", CACHE.ai_key(f"q:{qhash}"))
 
         # Index this run for recent queries (permanent)
         created_at = run_data.get("created_at")
@@ -89,26 +99,447 @@ class Store:
                 ts = None
         if ts is None:
             ts = datetime.now(datetime.UTC).timestamp()
-        CACHE.zadd(CACHE.ai_key("recent"), score=ts, member=run_id)
+        self.index_run(run_id, run_data, ts)
+
+        # Fold this run into the insights rollups (see services/rollups.py)
+        from ..services.rollups import ROLLUPS
+        try:
+            ROLLUPS.apply(run_id, bundle, ts=ts)
+        except Exception as e:
+            print(f"[ROLLUPS] Failed to apply run {run_id}: {e}")
         
         return run_id
 
-    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+    # Bundles are stored as a Redis hash `run:{run_id}` with one JSON field per
+    # top-level section (run, sources, claims, evidence, analysis, ...), so
+    # endpoints read only the sections they need. Document text lives in the
+    # blob store; `sources`/`fetched_docs` carry raw_text_ref. Bundles written
+    # before this layout are plain JSON strings at `{run_id}` and are still read.
+    @staticmethod
+    def run_key(run_id: str) -> str:
+        return CACHE.ai_key(f"run:{run_id}")
+
+    @staticmethod
+    def legacy_key(run_id: str) -> str:
+        return CACHE.ai_key(f"{run_id}")
+
+    def save_bundle(self, run_id: str, bundle: Dict[str, Any], ttl: Optional[int] = -1) -> None:
+        bundle = BLOBS.externalize(bundle)
+        CACHE.hset_json(self.run_key(run_id), bundle, ttl=ttl)
+        BUNDLE_CACHE.invalidate(self.run_key(run_id))
+        # Keeps any `report` field recorded for the run
+        CACHE.hset_json(self.summary_key(run_id), self.run_summary(bundle, run_id), ttl=ttl, replace=False)
+        self.register("bundles", run_id)
+
+    @staticmethod
+    def analysis_key(run_id: str) -> str:
+        return CACHE.ai_key(f"analysis:{run_id}")
+
+    def save_analysis(self, run_id: str, analysis: Dict[str, Any], ttl: Optional[int] = -1,
+                      report: bool = True) -> None:
+        """Store a run's intelligence analysis; with report=True also list it in the `reports` index."""
+        CACHE.set_json(self.analysis_key(run_id), analysis, ttl=ttl)
+        self.register("analyses", run_id)
+        if "metadata" in analysis:
+            self.record_report(run_id, analysis)
+        if report:
+            CACHE.zadd(CACHE.ai_key("reports"), score=datetime.utcnow().timestamp(), member=run_id)
+            self.register("indexes", CACHE.ai_key("reports"))
+
+    def get_run(self, run_id: str, hydrate_text: bool = True) -> Optional[Dict[str, Any]]:
+        """Load a whole run bundle. With hydrate_text=False, documents keep `raw_text_ref`
+        instead of `raw_text` (no blob reads) - use it when text isn't needed."""
+        if BUNDLE_CACHE.enabled:
+            bundle = self._cached_sections(run_id)
+            if bundle is not None and hydrate_text:
+                BLOBS.hydrate(bundle)
+            return bundle
+        return self.get_runs_many([run_id], hydrate_text=hydrate_text).get(run_id)
+
+    def get_runs_many(self, run_ids: List[str], hydrate_text: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Load whole bundles for many runs in batched round-trips; missing runs are omitted."""
         # ONLY REDIS
-        return CACHE.get_json(CACHE.ai_key(f"{run_id}"))
+        out: Dict[str, Dict[str, Any]] = {}
+        for run_id, bundle in zip(run_ids, CACHE.hgetall_many_json([self.run_key(r) for r in run_ids])):
+            if bundle:
+                out[run_id] = bundle
+        out = self._load_legacy(run_ids, out, None)
+        if hydrate_text:
+            for bundle in out.values():
+                BLOBS.hydrate(bundle)
+        return out
+
+    def get_sections(self, run_id: str, sections: List[str], hydrate_text: bool = False) -> Optional[Dict[str, Any]]:
+        """Load only the named sections of a run (plus `run`); None if the run doesn't exist.
+
+        Sections missing from the bundle are absent from the result.
+        """
+        if BUNDLE_CACHE.enabled:
+            bundle = self._cached_sections(run_id, ["run"] + [s for s in sections if s != "run"])
+            if bundle is not None and hydrate_text:
+                BLOBS.hydrate(bundle)
+            return bundle
+        return self.get_sections_many([run_id], sections, hydrate_text=hydrate_text).get(run_id)
+
+    # Single-run reads (get_run/get_sections, i.e. the run dashboard endpoints)
+    # go through BUNDLE_CACHE. An entry is (complete, {section: serialized
+    # bytes or None if absent}) and is filled with only the sections asked for
+    # (get_run fills it whole), so a dashboard's several calls for one run cost
+    # one Redis read per section without pulling large sections nobody asked
+    # for. Every call decodes its own copy, so callers may mutate results.
+    # save_bundle invalidates this process's entry, other workers' entries
+    # expire after BUNDLE_L1_TTL. Batch reads bypass it.
+    def _cached_sections(self, run_id: str, names: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Sections `names` (all if None) of a run; None if the run doesn't exist."""
+        key = self.run_key(run_id)
+        complete, cached = BUNDLE_CACHE.get(key) or (False, {})
+        missing = None if complete or names is None else [n for n in names if n not in cached]
+        if not complete and missing != []:
+            if missing is None:
+                cached, complete = CACHE.hgetall_raw(key), True
+            else:
+                cached = {**cached, **dict(zip(missing, CACHE.hmget_raw(key, missing)))}
+            if cached.get("run") is None:
+                # No hash bundle: a legacy JSON-string bundle, or no such run
+                cached, complete = self._legacy_sections(run_id), True
+                if cached is None:
+                    return None
+            BUNDLE_CACHE.set(key, (complete, cached), sum(len(v) for v in cached.values() if v))
+        wanted = cached if names is None else names
+        return {n: CACHE.loads(cached[n]) for n in wanted if cached.get(n) is not None}
+
+    def _legacy_sections(self, run_id: str) -> Optional[Dict[str, bytes]]:
+        bundle = CACHE.get_json(self.legacy_key(run_id))
+        if not bundle or "run" not in bundle:
+            return None
+        return {n: CACHE.dumps(v) for n, v in bundle.items()}
+
+    def get_sections_many(self, run_ids: List[str], sections: List[str],
+                          hydrate_text: bool = False) -> Dict[str, Dict[str, Any]]:
+        """get_sections for many runs in batched round-trips; missing runs are omitted."""
+        names = ["run"] + [s for s in sections if s != "run"]
+        out: Dict[str, Dict[str, Any]] = {}
+        for run_id, values in zip(run_ids, CACHE.hmget_many_json([self.run_key(r) for r in run_ids], names)):
+            if values[0] is not None:
+                out[run_id] = {n: v for n, v in zip(names, values) if v is not None}
+        out = self._load_legacy(run_ids, out, names)
+        if hydrate_text:
+            for bundle in out.values():
+                BLOBS.hydrate(bundle)
+        return out
+
+    def _load_legacy(self, run_ids: List[str], found: Dict[str, Dict[str, Any]],
+                     names: Optional[List[str]]) -> Dict[str, Dict[str, Any]]:
+        # Fill runs not found as hashes from pre-sectioned JSON-string bundles; keeps run_ids order
+        missing = [r for r in run_ids if r not in found]
+        if missing:
+            for run_id, legacy in zip(missing, CACHE.get_many_json([self.legacy_key(r) for r in missing])):
+                if legacy:
+                    found[run_id] = legacy if names is None else {n: legacy[n] for n in names if n in legacy}
+        return {r: found[r] for r in run_ids if r in found}
+
+    def get_section(self, run_id: str, section: str, hydrate_text: bool = False) -> Any:
+        bundle = self.get_sections(run_id, [section], hydrate_text=hydrate_text)
+        return bundle.get(section) if bundle else None
+
+    def run_exists(self, run_id: str) -> bool:
+        return CACHE.exists(self.run_key(run_id)) or CACHE.exists(self.legacy_key(run_id))
+
+    async def run_exists_async(self, run_id: str) -> bool:
+        return await ASYNC_CACHE.exists(self.run_key(run_id)) or await ASYNC_CACHE.exists(self.legacy_key(run_id))
+
+    # Run indices: `recent` ZSET of every run (score = created_at), one
+    # `recent:subject:{subject}` ZSET per subject and a `subjects` SET. The
+    # subject index is trusted once backfill_subject_index() has run (it sets
+    # `subject_index:built_at`); until then subject filters read run headers.
+    @staticmethod
+    def subject_key(subject: str) -> str:
+        return CACHE.ai_key(f"recent:subject:{subject}")
+
+    def index_run(self, run_id: str, run_data: Dict[str, Any], ts: float) -> None:
+        CACHE.zadd(CACHE.ai_key("recent"), score=ts, member=run_id)
+        self.register("indexes", CACHE.ai_key("recent"))
+        subject = run_data.get("subject")
+        if subject:
+            CACHE.zadd(self.subject_key(subject), score=ts, member=run_id)
+            CACHE.sadd(CACHE.ai_key("subjects"), subject)
+            self.register("indexes", self.subject_key(subject), CACHE.ai_key("subjects"))
+
+    def subject_index_built(self) -> bool:
+        return CACHE.exists(CACHE.ai_key("subject_index:built_at"))
+
+    def backfill_subject_index(self) -> Dict[str, int]:
+        """Index every run in the `recent` ZSET by subject."""
+        recent = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, -1)
+        indexed = 0
+        for i in range(0, len(recent), CACHE.batch_size):
+            chunk = recent[i:i + CACHE.batch_size]
+            bundles = self.get_sections_many([r for r, _ in chunk], ["run"])
+            for run_id, ts in chunk:
+                subject = (bundles.get(run_id) or {}).get("run", {}).get("subject")
+                if subject:
+                    CACHE.zadd(self.subject_key(subject), score=ts, member=run_id)
+                    CACHE.sadd(CACHE.ai_key("subjects"), subject)
+                    indexed += 1
+        CACHE.set(CACHE.ai_key("subject_index:built_at"), str(datetime.now().timestamp()), ttl=-1)
+        print(f"[STORE] Indexed {indexed} of {len(recent)} runs by subject")
+        return {"runs": len(recent), "indexed": indexed}
+
+    def recent_runs(self, limit: int = 0, subject: Optional[str] = None) -> List[Tuple[str, float]]:
+        """(run_id, created_at ts) pairs, newest first; limit <= 0 means all."""
+        end = limit - 1 if limit > 0 else -1
+        if subject and self.subject_index_built():
+            return CACHE.zrevrange_withscores(self.subject_key(subject), 0, end)
+        items = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, end)
+        if not subject:
+            return items
+        # No subject index yet: filter the recent window by run header
+        headers = self.get_sections_many([r for r, _ in items], ["run"])
+        return [(r, ts) for r, ts in items if (headers.get(r) or {}).get("run", {}).get("subject") == subject]
+
+    def count_runs(self, subject: Optional[str] = None) -> int:
+        if subject and self.subject_index_built():
+            return CACHE.zcard(self.subject_key(subject))
+        return CACHE.zcard(CACHE.ai_key("recent"))
+
+    def subjects(self) -> Optional[List[str]]:
+        """All subjects from the index, or None if it hasn't been backfilled."""
+        if not self.subject_index_built():
+            return None
+        return sorted(CACHE.smembers(CACHE.ai_key("subjects")))
+
+    async def subjects_async(self) -> Optional[List[str]]:
+        if not await ASYNC_CACHE.exists(CACHE.ai_key("subject_index:built_at")):
+            return None
+        return sorted(await ASYNC_CACHE.smembers(CACHE.ai_key("subjects")))
+
+    # Key registries, written alongside the keys so admin utilities don't SCAN
+    # the shared keyspace: `registry:bundles` and `registry:analyses` are SETs
+    # of run ids with a stored bundle (either layout) or analysis document, and
+    # `registry:indexes` holds the names of index keys (recent, reports,
+    # subjects, per-subject and query-history). They are trusted once
+    # backfill_registries() has run (it sets `registry:built_at`). Members can
+    # outlive keys that expire; readers skip them and prune_registries() drops them.
+    REGISTRIES = ("bundles", "analyses", "indexes")
+
+    @staticmethod
+    def registry_key(kind: str) -> str:
+        return CACHE.ai_key(f"registry:{kind}")
+
+    def register(self, kind: str, *members: str) -> None:
+        if members:
+            CACHE.sadd(self.registry_key(kind), *members)
+
+    def registries_built(self) -> bool:
+        return CACHE.exists(CACHE.ai_key("registry:built_at"))
+
+    def registry(self, kind: str) -> List[str]:
+        return sorted(CACHE.smembers(self.registry_key(kind)))
+
+    def all_run_ids(self) -> List[str]:
+        """Every stored run id: the bundle registry, or a key scan until it is backfilled."""
+        if self.registries_built():
+            return self.registry("bundles")
+        return self.scan_run_ids()
+
+    def iter_registered(self, sections: List[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (run_id, sections) for every stored run, reading one batch at a time."""
+        run_ids = self.all_run_ids()
+        for i in range(0, len(run_ids), CACHE.batch_size):
+            yield from self.get_sections_many(run_ids[i:i + CACHE.batch_size], sections).items()
+
+    @staticmethod
+    def classify_key(key: str) -> Optional[Tuple[str, str]]:
+        """(registry, member) for a key under the current prefix, or None if it isn't registered."""
+        rest = key[len(CACHE.ai_prefix()) + 1:]
+        if rest.startswith("run:"):
+            return "bundles", rest[len("run:"):]
+        if rest.startswith("analysis:"):
+            return "analyses", rest[len("analysis:"):]
+        if rest in ("recent", "reports", "subjects") or rest.startswith(("recent:subject:", "q:")):
+            return "indexes", key
+        if ":" not in rest:
+            return "bundles", rest  # legacy JSON-string bundle
+        return None
+
+    def scan_run_ids(self) -> List[str]:
+        """All stored run ids by key scan (hash and legacy layouts); prefer all_run_ids()."""
+        ids = set()
+        for key in CACHE.keys(f"{CACHE.ai_prefix()}:*"):
+            entry = self.classify_key(key)
+            if entry and entry[0] == "bundles":
+                ids.add(entry[1])
+        return sorted(ids)
+
+    def backfill_registries(self) -> Dict[str, int]:
+        """Register every existing bundle, analysis and index key (one keyspace SCAN)."""
+        found: Dict[str, set] = {kind: set() for kind in self.REGISTRIES}
+        for key in CACHE.keys(f"{CACHE.ai_prefix()}:*"):
+            entry = self.classify_key(key)
+            if entry:
+                found[entry[0]].add(entry[1])
+        for kind, members in found.items():
+            members = sorted(members)
+            for i in range(0, len(members), CACHE.batch_size):
+                self.register(kind, *members[i:i + CACHE.batch_size])
+        CACHE.set(CACHE.ai_key("registry:built_at"), str(datetime.now().timestamp()), ttl=-1)
+        print("[STORE] Registered " + ", ".join(f"{len(m)} {kind}" for kind, m in found.items()))
+        return {kind: len(members) for kind, members in found.items()}
+
+    def prune_registries(self) -> Dict[str, int]:
+        """Drop registry members whose keys no longer exist (expired bundles, analyses, indexes)."""
+        pruned = {}
+        for kind in self.REGISTRIES:
+            members = self.registry(kind)
+            if kind == "bundles":
+                hashes = CACHE.exists_many([self.run_key(r) for r in members])
+                legacy = CACHE.exists_many([self.legacy_key(r) for r in members])
+                alive = [a or b for a, b in zip(hashes, legacy)]
+            elif kind == "analyses":
+                alive = CACHE.exists_many([self.analysis_key(r) for r in members])
+            else:
+                alive = CACHE.exists_many(members)
+            gone = [m for m, ok in zip(members, alive) if not ok]
+            for i in range(0, len(gone), CACHE.batch_size):
+                CACHE.srem(self.registry_key(kind), *gone[i:i + CACHE.batch_size])
+            pruned[kind] = len(gone)
+        return pruned
+
+    def migrate_run(self, run_id: str) -> bool:
+        """Rewrite a legacy JSON-string bundle into the sectioned hash layout
+        (moving inline document text to the blob store); True if migrated."""
+        key = self.legacy_key(run_id)
+        bundle = CACHE.get_json(key)
+        if not bundle or "run" not in bundle:
+            return False
+        ttl = CACHE.ttl(key)
+        self.save_bundle(run_id, bundle, ttl=ttl if ttl and ttl > 0 else -1)
+        CACHE.delete(key)
+        return True
+
+    # Paged listing. A cursor is "{score}:{run_id}" of the last run returned;
+    # the next page starts strictly after it in (score desc, run_id desc)
+    # order, which is ZREVRANGE order, so runs sharing a timestamp are neither
+    # skipped nor repeated and runs added meanwhile don't shift pages.
+    @staticmethod
+    def encode_cursor(score: float, run_id: str) -> str:
+        return f"{score!r}:{run_id}"
+
+    def page_run_ids(self, cursor: Optional[str] = None, limit: int = 50,
+                     subject: Optional[str] = None) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+        """One page of (run_id, ts) newest first, and the cursor for the next page (None at the end)."""
+        use_index = bool(subject) and self.subject_index_built()
+        key = self.subject_key(subject) if use_index else CACHE.ai_key("recent")
+        if cursor:
+            score_str, last_id = cursor.split(":", 1)
+            score = float(score_str)
+            ties = [(m, s) for m, s in CACHE.zrevrangebyscore_withscores(key, score, score) if m < last_id]
+            items = ties[:limit]
+            if len(items) < limit:
+                items += CACHE.zrevrangebyscore_withscores(key, f"({score!r}", "-inf", 0, limit - len(items))
+        else:
+            items = CACHE.zrevrange_withscores(key, 0, limit - 1)
+        next_cursor = self.encode_cursor(items[-1][1], items[-1][0]) if len(items) == limit else None
+        if subject and not use_index:
+            # No subject index yet: filter this page by run header (pages may come back short)
+            headers = self.get_sections_many([r for r, _ in items], ["run"])
+            items = [(r, s) for r, s in items if (headers.get(r) or {}).get("run", {}).get("subject") == subject]
+        return items, next_cursor
+
+    # Run summaries: a small `summary:{run_id}` hash written with each bundle
+    # holding what listings show (query, subject, created_at, model, counts:
+    # cited_count is evidence items, cited_sources distinct cited sources),
+    # plus a `report` field once an intelligence report exists. Listings read
+    # these (~200 bytes each) instead of bundles; summaries missing for runs
+    # stored before they existed are computed and written on first read.
+    @staticmethod
+    def summary_key(run_id: str) -> str:
+        return CACHE.ai_key(f"summary:{run_id}")
+
+    @staticmethod
+    def run_summary(bundle: Dict[str, Any], run_id: Optional[str] = None) -> Dict[str, Any]:
+        run = bundle.get("run") or {}
+        return {
+            "run_id": run.get("run_id") or run_id,
+            "query": run.get("query"),
+            "subject": run.get("subject"),
+            "created_at": run.get("created_at"),
+            "search_model": run.get("search_model", "Unknown"),
+            "sources_count": len(bundle.get("sources") or []),
+            "cited_count": len(bundle.get("evidence") or []),
+            "cited_sources": len({e.get("source_id") for e in bundle.get("evidence") or [] if e.get("source_id")}),
+        }
+
+    def get_summaries_many(self, run_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Summaries for many runs in one pipelined read; unknown runs are omitted."""
+        rows = dict(zip(run_ids, CACHE.hgetall_many_json([self.summary_key(r) for r in run_ids])))
+        # Summaries without `cited_sources` predate it and counted unique sources
+        # as cited_count; recompute those too
+        missing = [r for r in run_ids if not rows[r].get("run_id") or "cited_sources" not in rows[r]]
+        if missing:
+            bundles = self.get_sections_many(missing, ["sources", "evidence"])
+            for run_id in missing:
+                if run_id in bundles:
+                    summary = self.run_summary(bundles[run_id], run_id)
+                    CACHE.hset_json(self.summary_key(run_id), summary, ttl=-1, replace=False)
+                    rows[run_id].update(summary)
+        return {r: rows[r] for r in run_ids if rows[r].get("run_id")}
+
+    def page_summaries(self, cursor: Optional[str] = None, limit: int = 50,
+                       subject: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        items, next_cursor = self.page_run_ids(cursor, limit, subject)
+        summaries = self.get_summaries_many([r for r, _ in items])
+        return [summaries[r] for r, _ in items if r in summaries], next_cursor
+
+    def record_report(self, run_id: str, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Note an intelligence report's metadata in the run summary (for report listings)."""
+        metadata = analysis.get("metadata") or {}
+        report = {
+            "query": metadata.get("query", ""),
+            "search_model": metadata.get("search_model", "Unknown"),
+            "created_at": metadata.get("created_at", ""),
+            "generated_at": metadata.get("generated_at", ""),
+            "has_analysis": bool(analysis.get("analysis") or analysis.get("classifications")),
+        }
+        CACHE.hset_json(self.summary_key(run_id), {"report": report}, ttl=-1, replace=False)
+        return report
+
+    def get_reports_many(self, run_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Report metadata for runs in the `reports` index, from summaries (analysis docs as fallback)."""
+        rows = CACHE.hmget_many_json([self.summary_key(r) for r in run_ids], ["report"])
+        reports = {r: row[0] for r, row in zip(run_ids, rows) if row[0]}
+        missing = [r for r in run_ids if r not in reports]
+        if missing:
+            for run_id, analysis in zip(missing, CACHE.get_many_json([self.analysis_key(r) for r in missing])):
+                # Only reports saved with metadata are listed
+                if analysis and "metadata" in analysis:
+                    reports[run_id] = self.record_report(run_id, analysis)
+        return {r: reports[r] for r in run_ids if r in reports}
+
+    def iter_runs(self, subject: Optional[str] = None, sections: Optional[List[str]] = None,
+                  hydrate_text: bool = False, batch_size: int = 50) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (run_id, bundle) newest first, holding one batch in memory at a time.
+
+        With `sections`, only those sections (plus `run`) are loaded.
+        """
+        cursor = None
+        while True:
+            items, cursor = self.page_run_ids(cursor, batch_size, subject)
+            run_ids = [r for r, _ in items]
+            if sections is None:
+                bundles = self.get_runs_many(run_ids, hydrate_text=hydrate_text)
+            else:
+                bundles = self.get_sections_many(run_ids, sections, hydrate_text=hydrate_text)
+            for run_id in run_ids:
+                if run_id in bundles:
+                    yield run_id, bundles.pop(run_id)
+            if not cursor:
+                return
 
     def list_runs(self) -> Dict[str, Dict[str, Any]]:
-        # Get all runs from Redis
-        recent_key = CACHE.ai_key("recent")
-        items = CACHE.zrevrange_withscores(recent_key, 0, -1)
-        
-        runs = {}
-        for run_id, _ in items:  # Ignore the scores, just get run_ids
-            bundle = CACHE.get_json(CACHE.ai_key(f"{run_id}"))
-            if bundle:
-                runs[run_id] = bundle
-        
-        return runs
+        # Get all runs from Redis (document text stays as raw_text_ref; see get_run).
+        # Holds every bundle in memory - prefer iter_runs/page_summaries for large stores.
+        return dict(self.iter_runs())
 
 
 STORE = Store()
\ No newline at end of file
@@ -3,6 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from .routers import search, runs
 from dotenv import load_dotenv
 from .core.db import init_db
+from .core.http import HTTP_CLIENTS
+from .core.cache import ASYNC_CACHE
+from .services.run_jobs import RUN_QUEUE
+from .services.html_extract import PARSE_POOL
 import os
 
 # Load environment variables from the root .env file
@@ -24,6 +28,20 @@ app.add_middleware(
 app.include_router(search.router, prefix="/api/search", tags=["search"]) 
 app.include_router(runs.router, prefix="/api", tags=["runs"]) 
 
+@app.on_event("startup")
+async def start_run_workers():
+    await PARSE_POOL.start()
+    await RUN_QUEUE.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_services():
+    await RUN_QUEUE.stop()
+    await HTTP_CLIENTS.aclose()
+    await ASYNC_CACHE.aclose()
+    PARSE_POOL.shutdown()
+
+
 @app.get("/")
 def root():
     return {"ok": True, "service": "demo-api"}
@@ -34,51 +34,37 @@ class RedisUtils:
     
     @staticmethod
     def get_search_runs() -> List[Dict[str, Any]]:
-        """Get all search run data."""
-        keys = CACHE.keys(f"{CACHE.ai_prefix()}:*")
+        """Get summaries of all search runs, newest first."""
+        from app.core.store import STORE
+
         runs = []
-        
-        for key in keys:
-            # Skip analysis and index keys, only get run data
-            if ":analysis:" in key or ":recent" in key or ":reports" in key or ":q:" in key or ":query_hash:" in key:
-                continue
-                
-            # This should be a run bundle
-            bundle = CACHE.get_json(key)
-            if bundle and "run" in bundle:
-                run_data = bundle["run"]
-                runs.append({
-                    "run_id": run_data.get("run_id"),
-                    "query": run_data.get("query"),
-                    "search_model": run_data.get("search_model", "Unknown"),
-                    "created_at": run_data.get("created_at"),
-                    "sources_count": len(bundle.get("sources", [])),
-                    "cited_count": len(bundle.get("evidence", [])),
-                    "bundle": bundle
-                })
-        
-        # Sort by created_at
-        runs.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return runs
+        cursor = None
+        while True:
+            page, cursor = STORE.page_summaries(cursor, limit=200)
+            runs.extend(page)
+            if not cursor:
+                return runs
     
     @staticmethod
     def get_intelligence_reports() -> List[Dict[str, Any]]:
         """Get all stored intelligence reports."""
+        from app.core.store import STORE
+
         try:
             reports_index = CACHE.zrevrange_withscores(CACHE.ai_key("reports"), 0, -1)
             reports = []
             
+            report_meta = STORE.get_reports_many([run_id for run_id, _ in reports_index])
             for run_id, timestamp in reports_index:
-                analysis = CACHE.get_json(CACHE.ai_key(f"analysis:{run_id}"))
-                if analysis and "metadata" in analysis:
-                    metadata = analysis["metadata"]
+                metadata = report_meta.get(run_id)
+                if metadata:
                     reports.append({
                         "run_id": run_id,
                         "query": metadata.get("query", ""),
                         "search_model": metadata.get("search_model", "Unknown"),
                         "created_at": metadata.get("created_at", ""),
                         "generated_at": metadata.get("generated_at", ""),
-                        "has_analysis": bool(analysis.get("analysis") or analysis.get("classifications")),
+                        "has_analysis": metadata["has_analysis"],
                         "timestamp": timestamp
                     })
             
@@ -90,36 +76,22 @@ class RedisUtils:
     @staticmethod
     def get_aggregate_stats() -> Dict[str, Any]:
         """Get aggregate statistics across all runs."""
-        runs = RedisUtils.get_search_runs()
-        
-        total_sources = sum(run["sources_count"] for run in runs)
-        total_cited = sum(run["cited_count"] for run in runs)
+        from app.services.rollups import ROLLUPS
+
+        agg = ROLLUPS.collect(sections=["sources", "evidence"])
+        total_sources = agg["totals"].get("sources", 0)
+        # Evidence citations, as before rollups; distinct cited sources per run separately
+        total_cited = agg["totals"].get("evidence", 0)
+        distinct_cited = agg["totals"].get("cited_sources", 0)
         avg_citation_rate = (total_cited / total_sources) if total_sources > 0 else 0.0
-        
-        # Get domain distribution
-        domain_citations = {}
-        for run in runs:
-            bundle = run.get("bundle", {})
-            sources = bundle.get("sources", [])
-            evidence = bundle.get("evidence", [])
-            cited_ids = {e.get("source_id") for e in evidence if e.get("source_id")}
-            
-            src_by_id = {s.get("source_id"): s for s in sources}
-            for sid in cited_ids:
-                s = src_by_id.get(sid)
-                if not s:
-                    continue
-                domain = (s.get("domain") or "").lower()
-                if domain:
-                    domain_citations[domain] = domain_citations.get(domain, 0) + 1
-        
-        domains_top = sorted(domain_citations.items(), key=lambda x: x[1], reverse=True)[:20]
+        domains_top = sorted(agg["domains"].items(), key=lambda x: x[1], reverse=True)[:20]
         
         return {
-            "runs": len(runs),
+            "runs": agg["totals"].get("runs", 0),
             "totals": {
                 "total_sources": total_sources,
                 "total_cited_sources": total_cited,
+                "total_distinct_cited_sources": distinct_cited,
                 "avg_citation_rate": round(avg_citation_rate, 4),
             },
             "domains_top": domains_top,
@@ -142,34 +114,134 @@ class RedisUtils:
         
         return cleaned
     
+    @staticmethod
+    def migrate_bundles() -> Dict[str, int]:
+        """Convert legacy JSON-string bundles to the sectioned hash layout (text moved to blobs)."""
+        from app.core.store import STORE
+
+        run_ids = STORE.all_run_ids()
+        result = {"runs": len(run_ids), "migrated": 0}
+        for run_id in run_ids:
+            try:
+                if STORE.migrate_run(run_id):
+                    result["migrated"] += 1
+            except Exception as e:
+                print(f"Failed to migrate {run_id}: {e}")
+        return result
+
+    @staticmethod
+    def backfill_registries() -> Dict[str, int]:
+        """Register existing bundle, analysis and index keys (one keyspace SCAN)."""
+        from app.core.store import STORE
+        return STORE.backfill_registries()
+
+    @staticmethod
+    def prune_registries() -> Dict[str, int]:
+        """Drop registry entries whose keys have expired."""
+        from app.core.store import STORE
+        return STORE.prune_registries()
+
+    @staticmethod
+    def backfill_subjects() -> Dict[str, int]:
+        """Build the per-subject run index from the `recent` ZSET."""
+        from app.core.store import STORE
+        return STORE.backfill_subject_index()
+
+    @staticmethod
+    def rebuild_rollups() -> Dict[str, int]:
+        """Recompute the insights rollups from every stored run."""
+        from app.services.rollups import ROLLUPS
+        return ROLLUPS.rebuild()
+
+    @staticmethod
+    def check_rollups(subject: Optional[str] = None) -> Dict[str, Any]:
+        """Compare the insights rollups for a scope with a full scan of the runs."""
+        from app.services.rollups import ROLLUPS
+        return ROLLUPS.check(subject)
+
+    @staticmethod
+    def train_html_dict(out_path: str, max_samples: int = 2000, dict_size: int = 112640) -> Dict[str, Any]:
+        """Train a zstd dictionary from cached HTML pages (for CACHE_ZSTD_DICT_PATH)."""
+        import zstandard
+
+        samples = []
+        for key in CACHE.keys("cache:content:*")[:max_samples]:
+            try:
+                html = CACHE.get(key)
+            except Exception:
+                continue
+            if html:
+                samples.append(html.encode("utf-8"))
+        if len(samples) < 10:
+            raise RuntimeError(f"Need at least 10 cached pages to train a dictionary, found {len(samples)}")
+
+        dictionary = zstandard.train_dictionary(dict_size, samples)
+        with open(out_path, "wb") as fh:
+            fh.write(dictionary.as_bytes())
+
+        # Report the gain on the training pages at the configured level
+        level = CACHE.compress_level
+        plain = zstandard.ZstdCompressor(level=level)
+        with_dict = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+        raw = sum(len(s) for s in samples)
+        return {
+            "samples": len(samples),
+            "dict_bytes": len(dictionary.as_bytes()),
+            "ratio_plain": round(raw / sum(len(plain.compress(s)) for s in samples), 2),
+            "ratio_dict": round(raw / sum(len(with_dict.compress(s)) for s in samples), 2),
+        }
+
     @staticmethod
     def show_status() -> Dict[str, Any]:
         """Show comprehensive Redis status."""
-        keys = CACHE.keys(f"{CACHE.ai_prefix()}:*")
-        
-        key_types = {
-            "search_bundles": [],
-            "intelligence_reports": [],
-            "indices": [],
-            "other": []
-        }
-        
-        for key in keys:
-            if key.endswith(":recent") or key.endswith(":reports"):
-                key_types["indices"].append(key)
-            elif ":analysis:" in key:
-                key_types["intelligence_reports"].append(key)
-            elif ":q:" in key or ":query_hash:" in key:
-                key_types["other"].append(key)
-            else:
-                # Should be search bundle
-                key_types["search_bundles"].append(key)
-        
+        from app.core.store import STORE
+
+        if STORE.registries_built():
+            # From the key registries, without scanning the keyspace. A registered
+            # run may still be in the legacy JSON layout until migrate-bundles runs.
+            run_ids = STORE.registry("bundles")
+            hashes = CACHE.exists_many([STORE.run_key(r) for r in run_ids])
+            legacy = CACHE.exists_many([STORE.legacy_key(r) for r in run_ids])
+            key_types = {
+                "search_bundles": [STORE.run_key(r) for r, ok in zip(run_ids, hashes) if ok],
+                "legacy_bundles": [STORE.legacy_key(r) for r, ok in zip(run_ids, legacy) if ok],
+                "intelligence_reports": [STORE.analysis_key(r) for r in STORE.registry("analyses")],
+                "indices": STORE.registry("indexes"),
+            }
+            source = "registry"
+        else:
+            keys = CACHE.keys(f"{CACHE.ai_prefix()}:*")
+
+            key_types = {
+                "search_bundles": [],
+                "legacy_bundles": [],
+                "intelligence_reports": [],
+                "indices": [],
+                "other": []
+            }
+
+            # Same classification backfill_registries uses
+            for key in keys:
+                entry = STORE.classify_key(key)
+                kind = entry[0] if entry else None
+                if kind == "bundles":
+                    legacy = key == STORE.legacy_key(entry[1])
+                    key_types["legacy_bundles" if legacy else "search_bundles"].append(key)
+                elif kind == "analyses":
+                    key_types["intelligence_reports"].append(key)
+                elif kind == "indexes":
+                    key_types["indices"].append(key)
+                else:
+                    key_types["other"].append(key)
+            source = "scan"
+
+        # Counted from the same key lists that are reported
         return {
-            "total_keys": len(keys),
+            "total_keys": sum(len(v) for v in key_types.values()),
             "key_types": {k: len(v) for k, v in key_types.items()},
             "detailed_keys": key_types,
-            "cache_backend": CACHE.backend,
+            "source": source,
+            "cache_backend": "redis",
             "redis_configured": CACHE._redis is not None,
             "ai_prefix": CACHE.ai_prefix()
         }
@@ -178,7 +250,7 @@ def main():
     """CLI interface for Redis utils."""
     if len(sys.argv) < 2:
         print("Usage: python redis_utils.py <command>")
-        print("Commands: status, runs, reports, stats, cleanup")
+        print("Commands: status, runs, reports, stats, cleanup, migrate-bundles, backfill-registries, prune-registries, backfill-subjects, rebuild-rollups, check-rollups [subject], train-html-dict <out_path>")
         return
     
     command = sys.argv[1].lower()
@@ -190,7 +262,7 @@ def main():
         print(f"Cache backend: {status['cache_backend']}")
         print(f"Redis configured: {status['redis_configured']}")
         print(f"AI prefix: {status['ai_prefix']}")
-        print("\nKey distribution:")
+        print(f"\nKey distribution (from {status['source']}):")
         for key_type, count in status['key_types'].items():
             print(f"  {key_type}: {count}")
     
@@ -212,6 +284,7 @@ def main():
         print(f"Runs: {stats['runs']}")
         print(f"Total sources: {stats['totals']['total_sources']}")
         print(f"Cited sources: {stats['totals']['total_cited_sources']}")
+        print(f"Distinct cited sources: {stats['totals']['total_distinct_cited_sources']}")
         print(f"Citation rate: {stats['totals']['avg_citation_rate']*100:.1f}%")
         print(f"Top domains: {len(stats['domains_top'])}")
     
@@ -219,6 +292,43 @@ def main():
         cleaned = RedisUtils.cleanup_expired_keys()
         print(f"Cleaned up {cleaned} expired keys")
     
+    elif command == "migrate-bundles":
+        result = RedisUtils.migrate_bundles()
+        print(f"Migrated {result['migrated']} of {result['runs']} runs to sectioned bundles")
+    
+    elif command == "backfill-registries":
+        result = RedisUtils.backfill_registries()
+        print(f"Registered {result['bundles']} bundles, {result['analyses']} analyses, {result['indexes']} index keys")
+    
+    elif command == "prune-registries":
+        result = RedisUtils.prune_registries()
+        print(f"Pruned {result['bundles']} bundles, {result['analyses']} analyses, {result['indexes']} index keys")
+    
+    elif command == "backfill-subjects":
+        result = RedisUtils.backfill_subjects()
+        print(f"Indexed {result['indexed']} of {result['runs']} runs by subject")
+    
+    elif command == "rebuild-rollups":
+        result = RedisUtils.rebuild_rollups()
+        print(f"Rebuilt rollups from {result['applied']} of {result['runs']} runs ({result['keys_cleared']} old keys cleared)")
+    
+    elif command == "check-rollups":
+        subject = sys.argv[2] if len(sys.argv) > 2 else None
+        result = RedisUtils.check_rollups(subject)
+        if result["consistent"]:
+            print(f"Scope {result['scope']}: consistent")
+        else:
+            print(f"Scope {result['scope']}: {result['mismatch_count']} mismatches")
+        for m in result["mismatches"]:
+            print(f"  {m}")
+    
+    elif command == "train-html-dict":
+        out_path = sys.argv[2] if len(sys.argv) > 2 else "html.zdict"
+        result = RedisUtils.train_html_dict(out_path)
+        print(f"Wrote {result['dict_bytes']} byte dictionary to {out_path} from {result['samples']} pages")
+        print(f"Compression ratio: {result['ratio_plain']}x plain, {result['ratio_dict']}x with dictionary")
+        print(f"Enable with CACHE_ZSTD_DICT_PATH={os.path.abspath(out_path)}")
+    
     else:
         print(f"Unknown command: {command}")
 
@@ -1,10 +1,18 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from datetime import datetime
+import json
 import time
 from ..core.store import STORE
 from ..services.analysis import compute_analysis
 from ..services.analysis_report import build_markdown_report
-from ..core.cache import CACHE
+from ..core.cache import CACHE, BUNDLE_CACHE
+from ..core.circuit_breaker import PROVIDER_BREAKERS
+from ..core.hedge import REQUEST_HEDGER
+from ..services.run_jobs import get_job, get_job_async
+from ..services.run_events import RUN_EVENTS
+from ..services.fetch_parse import FETCH_CACHE_STATS
+from ..services.rollups import ROLLUPS
 
 
 router = APIRouter()
@@ -13,17 +21,86 @@ router = APIRouter()
 _LLM_ANALYSIS_CACHE: dict[str, dict] = {}
 
 
+@router.get("/runs")
+def list_runs(cursor: str = None, limit: int = 50, subject: str = None):
+    """Page through run summaries, newest first; pass `next_cursor` back as `cursor`."""
+    limit = max(1, min(limit, 500))
+    try:
+        items, next_cursor = STORE.page_summaries(cursor, limit, subject)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/export/runs.ndjson")
+def export_runs(subject: str = None, include_text: bool = False):
+    """Stream every run bundle as newline-delimited JSON, newest first, one batch in memory at a time."""
+    def _lines():
+        for _, bundle in STORE.iter_runs(subject=subject, hydrate_text=include_text):
+            yield json.dumps(bundle) + "\n"
+    
+    return StreamingResponse(
+        _lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="runs.ndjson"'},
+    )
+
+
 @router.get("/runs/{run_id}")
 def get_run(run_id: str):
-    run = STORE.get_run(run_id)
+    run = STORE.get_section(run_id, "run")
+    job = get_job(run_id)
     if not run:
+        # Background run still in flight (queued/searching/.../failed)
+        if job:
+            return job
         raise HTTPException(status_code=404, detail="Run not found")
-    return run["run"]
+    if job:
+        return {**run, "status": job.get("status", "done"), "stages": job.get("stages", {})}
+    return run
+
+
+@router.get("/runs/{run_id}/stream")
+async def stream_run(run_id: str):
+    """Server-Sent Events: stage changes, provider results, fetched documents and
+    answer sentences of a background run as they happen, ending with `done`/`failed`."""
+    streamable = RUN_EVENTS.is_local(run_id)
+    job = None
+    if not streamable:
+        # Job records are shared whatever the queue backend
+        job = await get_job_async(run_id)
+        streamable = bool(job) and RUN_EVENTS.mirror_to_redis
+
+    if streamable:
+        events = RUN_EVENTS.subscribe(run_id)
+    elif job:
+        # Running in another worker without mirrored events: follow its status
+        events = RUN_EVENTS.follow_job(run_id)
+    else:
+        # Finished (or synchronous) run with no live channel: emit a single terminal event
+        exists = await STORE.run_exists_async(run_id)
+        if not exists:
+            raise HTTPException(status_code=404, detail="Run not found")
+
+        async def _finished():
+            yield {"type": "done", "run_id": run_id}
+        events = _finished()
+
+    async def event_source():
+        async for event in events:
+            yield f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/runs/{run_id}/sources")
-def get_sources(run_id: str):
-    run = STORE.get_run(run_id)
+def get_sources(run_id: str, include_text: bool = True):
+    # include_text=false returns raw_text_ref instead of reading the document blobs
+    run = STORE.get_sections(run_id, ["sources"], hydrate_text=include_text)
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     return run["sources"]
@@ -31,7 +108,7 @@ def get_sources(run_id: str):
 
 @router.get("/runs/{run_id}/claims")
 def get_claims(run_id: str):
-    run = STORE.get_run(run_id)
+    run = STORE.get_sections(run_id, ["claims"])
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     return run["claims"]
@@ -39,7 +116,7 @@ def get_claims(run_id: str):
 
 @router.get("/runs/{run_id}/evidence")
 def get_evidence(run_id: str):
-    run = STORE.get_run(run_id)
+    run = STORE.get_sections(run_id, ["evidence"])
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     return run["evidence"]
@@ -47,7 +124,7 @@ def get_evidence(run_id: str):
 
 @router.get("/runs/{run_id}/classifications")
 def get_classifications(run_id: str):
-    run = STORE.get_run(run_id)
+    run = STORE.get_sections(run_id, ["classifications"])
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     return run["classifications"]
@@ -70,6 +147,8 @@ def get_trace(run_id: str):
         base["provider_results"] = run["provider_results"]
     if "fetched_docs" in run:
         base["fetched_docs"] = run["fetched_docs"]
+    if "fetch_summary" in run:
+        base["fetch_summary"] = run["fetch_summary"]
     if "provider_performance" in run:
         base["provider_performance"] = run["provider_performance"]
     base["analysis"] = compute_analysis(run)
@@ -79,7 +158,7 @@ def get_trace(run_id: str):
 @router.get("/runs/{run_id}/providers")
 def get_provider_performance(run_id: str):
     """Get search provider performance analytics for this run."""
-    run = STORE.get_run(run_id)
+    run = STORE.get_sections(run_id, ["provider_performance"])
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
@@ -122,7 +201,7 @@ def get_provider_performance(run_id: str):
 @router.get("/runs/{run_id}/snippets")
 def get_snippet_alignment(run_id: str):
     """Get snippet alignment analysis for this run's evidence."""
-    run = STORE.get_run(run_id)
+    run = STORE.get_sections(run_id, ["evidence", "claims", "sources"])
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
@@ -192,7 +271,7 @@ def get_snippet_alignment(run_id: str):
 @router.get("/runs/{run_id}/deduplication")
 def get_deduplication_analysis(run_id: str):
     """Get content deduplication analysis for this run."""
-    run = STORE.get_run(run_id)
+    run = STORE.get_sections(run_id, ["sources", "provider_results"])
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
@@ -309,9 +388,8 @@ def generate_llm_analysis_from_bundle(run_id: str, bundle_data: dict):
                     "generated_at": datetime.utcnow().isoformat() + "Z"
                 }
             }
-            CACHE.set_json(CACHE.ai_key(f"analysis:{run_id}"), enriched_data, ttl=-1)  # Permanent storage for intelligence reports
-            # Add to reports index for easy retrieval - permanent
-            CACHE.zadd(CACHE.ai_key("reports"), score=datetime.utcnow().timestamp(), member=run_id)
+            # Permanent storage for intelligence reports, listed in the reports index
+            STORE.save_analysis(run_id, enriched_data, ttl=-1)
         except Exception:
             pass
         _LLM_ANALYSIS_CACHE[run_id] = {"ts": now, "ttl": 3600, "data": data}
@@ -349,10 +427,8 @@ def get_llm_citation_analysis(run_id: str):
             return {"ok": False, "reason": "generation_failed"}
         
         try:
-            # Store permanently for marketing intelligence
-            CACHE.set_json(CACHE.ai_key(f"analysis:{run_id}"), data, ttl=-1)
-            # Add to reports index
-            CACHE.zadd(CACHE.ai_key("reports"), score=datetime.utcnow().timestamp(), member=run_id)
+            # Store permanently for marketing intelligence (and add to reports index)
+            STORE.save_analysis(run_id, data, ttl=-1)
         except Exception:
             pass
         _LLM_ANALYSIS_CACHE[run_id] = {"ts": now, "ttl": 3600, "data": data}
@@ -376,6 +452,24 @@ def debug_redis_keys():
         return {"ok": False, "message": str(e)}
 
 
+@router.get("/debug/provider-breakers")
+def debug_provider_breakers():
+    """Circuit breaker state, adaptive timeouts and hedging of each search provider in this process."""
+    return {"providers": PROVIDER_BREAKERS.snapshot(), "hedging": REQUEST_HEDGER.snapshot()}
+
+
+@router.get("/debug/fetch-cache")
+def debug_fetch_cache():
+    """Hit rates of the parsed-document and raw HTML cache tiers in this process."""
+    return FETCH_CACHE_STATS.snapshot()
+
+
+@router.get("/debug/bundle-cache")
+def debug_bundle_cache():
+    """Hit rate and size of this process's in-memory run bundle cache."""
+    return BUNDLE_CACHE.snapshot()
+
+
 @router.get("/insights/recent")
 def insights_recent(limit: int = 20, subject: str = None):
     """Return recent run_ids with timestamps from the versioned ZSET."""
@@ -385,11 +479,7 @@ def insights_recent(limit: int = 20, subject: str = None):
     # If no items in index, rebuild it from existing runs
     if not items:
         print("[REBUILD] Recent index empty, rebuilding from existing runs...")
-        all_keys = CACHE.keys(CACHE.ai_key("*"))
-        run_keys = [k for k in all_keys if k.split(":")[-1] not in ["recent", "reports"] and len(k.split(":")) == 3]
-        
-        for run_key in run_keys:
-            bundle = CACHE.get_json(run_key)
+        for _, bundle in STORE.iter_registered(["run"]):
             if bundle and "run" in bundle:
                 run_id = bundle["run"].get("run_id")
                 created_at = bundle["run"].get("created_at")
@@ -404,23 +494,21 @@ def insights_recent(limit: int = 20, subject: str = None):
                             pass
                     if ts is None:
                         ts = datetime.now(datetime.UTC).timestamp()
-                    CACHE.zadd(CACHE.ai_key("recent"), score=ts, member=run_id)
+                    STORE.index_run(run_id, bundle["run"], ts)
+        # Every run was just re-indexed, including by subject
+        STORE.backfill_subject_index()
         
         # Get items again after rebuild
         items = CACHE.zrevrange_withscores(key, 0, max(0, limit - 1))
         print(f"[REBUILD] Added {len(items)} items to recent index")
     
-    # Filter by subject if provided
-    filtered_items = []
-    for run_id, ts in items:
-        if subject:
-            bundle = CACHE.get_json(CACHE.ai_key(f"{run_id}"))
-            if bundle and bundle.get("run", {}).get("subject") == subject:
-                filtered_items.append({"run_id": run_id, "ts": ts})
-        else:
-            filtered_items.append({"run_id": run_id, "ts": ts})
+    # Filter by subject if provided (per-subject index)
+    if subject:
+        items = STORE.recent_runs(max(1, limit), subject)
     
-    return {"items": filtered_items}
+    # Attach run summaries (query, subject, created_at, counts)
+    summaries = STORE.get_summaries_many([run_id for run_id, _ in items])
+    return {"items": [{**summaries.get(run_id, {}), "run_id": run_id, "ts": ts} for run_id, ts in items]}
 
 
 @router.get("/insights/query/{qhash}")
@@ -438,12 +526,12 @@ def insights_reports(limit: int = 20):
         # Get recent reports from index
         reports_index = CACHE.zrevrange_withscores(CACHE.ai_key("reports"), 0, max(0, limit - 1))
         reports = []
+        # Report metadata kept in run summaries (see Store.record_report)
+        report_meta = STORE.get_reports_many([run_id for run_id, _ in reports_index])
         
         for run_id, timestamp in reports_index:
-            # Get the analysis data
-            analysis = CACHE.get_json(CACHE.ai_key(f"analysis:{run_id}"))
-            if analysis and "metadata" in analysis:
-                metadata = analysis["metadata"]
+            metadata = report_meta.get(run_id)
+            if metadata:
                 # Use generated_at for both created_at and generated_at since that's when the report was actually created
                 report_date = metadata.get("generated_at", "")
                 # Fallback to converting Redis timestamp if needed
@@ -457,7 +545,7 @@ def insights_reports(limit: int = 20):
                     "search_model": metadata.get("search_model", "Unknown"),
                     "created_at": report_date,
                     "generated_at": report_date,
-                    "has_analysis": bool(analysis.get("analysis") or analysis.get("classifications"))
+                    "has_analysis": metadata["has_analysis"]
                 })
         
         return {"reports": reports}
@@ -468,12 +556,16 @@ def insights_reports(limit: int = 20):
 @router.get("/insights/subjects")
 def insights_subjects():
     """Return available subjects from stored runs."""
+    indexed = STORE.subjects()
+    if indexed is not None:
+        return {"subjects": indexed}
+    
+    # Subject index not backfilled yet: read every run header
     recent = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, -1)
     run_ids = [m for m, _ in recent]
     subjects = set()
     
-    for run_id in run_ids:
-        bundle = CACHE.get_json(CACHE.ai_key(f"{run_id}"))
+    for bundle in STORE.get_sections_many(run_ids, ["run"]).values():
         if bundle:
             subject = bundle.get("run", {}).get("subject")
             if subject:
@@ -485,78 +577,46 @@ def insights_subjects():
 @router.get("/insights/providers")
 def insights_providers(limit: int = 50, subject: str = None):
     """Analyze search provider performance across multiple runs for API comparison."""
-    recent = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, max(0, limit - 1))
-    run_ids = [m for m, _ in recent]
+    agg = ROLLUPS.collect(subject=subject, limit=limit, sections=["provider_performance"])
+    runs_analyzed = agg["totals"].get("runs", 0)
     
-    # Aggregate provider performance across runs
+    # Provider performance summed across runs (runs present, sources, credibility, content length)
     provider_aggregates = {}
-    runs_analyzed = 0
-    
-    for run_id in run_ids:
-        bundle = CACHE.get_json(CACHE.ai_key(f"{run_id}"))
-        if not bundle:
-            continue
-        
-        # Filter by subject if provided
-        if subject:
-            bundle_subject = bundle.get("run", {}).get("subject")
-            if bundle_subject != subject:
-                continue
-        
-        runs_analyzed += 1
-        provider_performance = bundle.get("provider_performance", {})
-        
-        # Aggregate metrics across runs
-        for provider, stats in provider_performance.items():
-            if provider not in provider_aggregates:
-                provider_aggregates[provider] = {
-                    "total_runs": 0,
-                    "total_sources": 0,
-                    "credibility_scores": [],
-                    "content_lengths": [],
-                    "category_distribution": {},
-                    "runs_present": 0
-                }
-            
-            agg = provider_aggregates[provider]
-            agg["runs_present"] += 1
-            agg["total_sources"] += stats.get("count", 0)
-            agg["credibility_scores"].append(stats.get("avg_credibility", 0))
-            agg["content_lengths"].append(stats.get("avg_content_length", 0))
-            
-            # Aggregate category distributions
-            for category, count in stats.get("categories", {}).items():
-                if category not in agg["category_distribution"]:
-                    agg["category_distribution"][category] = 0
-                agg["category_distribution"][category] += count
+    for field, value in agg["providers"].items():
+        provider, metric = field.rsplit(":", 1)
+        provider_aggregates.setdefault(provider, {"category_distribution": {}})[metric] = value
+    for field, count in agg["provider_categories"].items():
+        provider, category = field.split(":", 1)
+        provider_aggregates.setdefault(provider, {"category_distribution": {}})["category_distribution"][category] = count
     
     # Calculate final comparative metrics
     provider_analysis = []
-    total_all_sources = sum(agg["total_sources"] for agg in provider_aggregates.values())
+    total_all_sources = sum(p.get("sources", 0) for p in provider_aggregates.values())
     
-    for provider, agg in provider_aggregates.items():
-        if agg["total_sources"] == 0:
+    for provider, p in provider_aggregates.items():
+        if not p.get("sources"):
             continue
             
-        avg_credibility = sum(agg["credibility_scores"]) / len(agg["credibility_scores"]) if agg["credibility_scores"] else 0
-        avg_content_length = sum(agg["content_lengths"]) / len(agg["content_lengths"]) if agg["content_lengths"] else 0
-        market_share = (agg["total_sources"] / total_all_sources * 100) if total_all_sources > 0 else 0
-        query_coverage = (agg["runs_present"] / runs_analyzed * 100) if runs_analyzed > 0 else 0
+        runs_present = p.get("runs", 0)
+        avg_credibility = p.get("credibility", 0) / runs_present if runs_present else 0
+        avg_content_length = p.get("content_length", 0) / runs_present if runs_present else 0
+        market_share = (p["sources"] / total_all_sources * 100) if total_all_sources > 0 else 0
+        query_coverage = (runs_present / runs_analyzed * 100) if runs_analyzed > 0 else 0
         
         # Top categories for this provider
-        top_categories = sorted(agg["category_distribution"].items(), 
+        top_categories = sorted(p["category_distribution"].items(), 
                               key=lambda x: x[1], reverse=True)[:5]
         
         provider_analysis.append({
             "provider": provider,
             "runs_analyzed": runs_analyzed,
-            "runs_present": agg["runs_present"],
+            "runs_present": runs_present,
             "query_coverage_pct": round(query_coverage, 1),
-            "total_sources": agg["total_sources"],
+            "total_sources": p["sources"],
             "market_share_pct": round(market_share, 1),
             "avg_credibility": round(avg_credibility, 3),
             "avg_content_length": round(avg_content_length, 0),
-            "source_diversity": len(agg["category_distribution"]),
+            "source_diversity": len(p["category_distribution"]),
             "top_categories": top_categories,
             "effectiveness_score": round(query_coverage * avg_credibility * 10, 2)  # Composite metric
         })
@@ -664,61 +724,20 @@ def insights_aggregate(limit: int = 50, subject: str = None):
         - domains_top: list[[domain, citations]] sorted desc
         - source_categories: dict[category, count] of cited sources by category
     """
-    recent = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, max(0, limit - 1))
-    run_ids = [m for m, _ in recent]
-    total_sources = 0
-    total_cited_sources = 0
-    domain_citations: dict[str, int] = {}
-    category_citations: dict[str, int] = {}
-    domains_by_category: dict[str, list] = {}  # Store actual cited articles by category
-    runs_counted = 0
-
-    for run_id in run_ids:
-        bundle = CACHE.get_json(CACHE.ai_key(f"{run_id}"))
-        if not bundle:
-            continue
-        
-        # Filter by subject if provided
-        if subject:
-            bundle_subject = bundle.get("run", {}).get("subject")
-            if bundle_subject != subject:
-                continue
-        
-        runs_counted += 1
-        sources = bundle.get("sources", [])
-        evidence = bundle.get("evidence", [])
-        total_sources += len(sources)
-        cited_ids = {e.get("source_id") for e in evidence if e.get("source_id")}
-        total_cited_sources += len(cited_ids)
-        # Count domains and categories for cited sources only
-        src_by_id = {s.get("source_id"): s for s in sources}
-        for sid in cited_ids:
-            s = src_by_id.get(sid)
-            if not s:
-                continue
-            # Domain counting
-            domain = (s.get("domain") or "").lower()
-            category = s.get("category", "web")
-            
-            if domain:
-                url = s.get("url", "")
-                title = s.get("title", domain)
-                domain_citations[domain] = domain_citations.get(domain, 0) + 1
-                
-                # Store actual cited articles by category
-                if category not in domains_by_category:
-                    domains_by_category[category] = []
-                
-                # Add this specific cited article
-                domains_by_category[category].append({
-                    "domain": domain,
-                    "url": url,
-                    "title": title,
-                    "source_id": s.get("source_id")
-                })
-            
-            # Category counting
-            category_citations[category] = category_citations.get(category, 0) + 1
+    agg = ROLLUPS.collect(subject=subject, limit=limit, sections=["sources", "evidence"])
+    runs_counted = agg["totals"].get("runs", 0)
+    total_sources = agg["totals"].get("sources", 0)
+    total_cited_sources = agg["totals"].get("cited_sources", 0)
+    domain_citations: dict[str, int] = agg["domains"]
+    category_citations: dict[str, int] = agg["categories"]
+    domains_by_category: dict[str, list] = {}  # Actual cited articles by category
+    for article in agg["cited"]:
+        domains_by_category.setdefault(article["category"], []).append({
+            "domain": article["domain"],
+            "url": article["url"],
+            "title": article["title"],
+            "source_id": article["source_id"]
+        })
 
     avg_citation_rate = 0.0
     if total_sources > 0:
@@ -770,114 +789,30 @@ def insights_meta_analysis(subject: str = None):
     - Publication strategy recommendations
     - Quarterly action planning data
     """
-    recent = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, -1)
-    run_ids = [m for m, _ in recent]
+    agg = ROLLUPS.collect(subject=subject)
+    total_queries = agg["totals"].get("runs", 0)
     
-    # Data structures for meta-analysis
-    all_runs = []
+    # Query term patterns: word -> runs using it, total sources found for them
     query_patterns = {}
-    domain_performance = {}  # domain -> {total_queries: int, cited_in: int, citation_count: int}
-    category_performance = {}  # category -> {queries: set, citations: int, sources: int}
-    content_gaps = {}  # topic areas with low competition
-    success_patterns = []  # characteristics of highly cited sources
-    publication_effectiveness = {}  # platform -> citation rates
-    
-    for run_id in run_ids:
-        bundle = CACHE.get_json(CACHE.ai_key(f"{run_id}"))
-        if not bundle:
-            continue
-            
-        # Filter by subject
-        if subject:
-            bundle_subject = bundle.get("run", {}).get("subject")
-            if bundle_subject != subject:
-                continue
-        
-        all_runs.append(bundle)
-        query = bundle.get("run", {}).get("query", "")
-        sources = bundle.get("sources", [])
-        evidence = bundle.get("evidence", [])
-        
-        # Track query patterns
-        query_words = set(query.lower().split())
-        for word in query_words:
-            if len(word) > 3:  # Skip short words
-                if word not in query_patterns:
-                    query_patterns[word] = {"count": 0, "avg_sources": 0, "avg_citations": 0}
-                query_patterns[word]["count"] += 1
-                query_patterns[word]["avg_sources"] += len(sources)
-                query_patterns[word]["avg_citations"] += len(evidence)
-        
-        # Analyze domain performance across queries
-        cited_ids = {e.get("source_id") for e in evidence if e.get("source_id")}
-        src_by_id = {s.get("source_id"): s for s in sources}
-        
-        # Track all domains that appeared in this query
-        domains_in_query = set()
-        for source in sources:
-            domain = source.get("domain", "").lower()
-            if domain:
-                domains_in_query.add(domain)
-                if domain not in domain_performance:
-                    domain_performance[domain] = {
-                        "total_queries": 0,
-                        "cited_in": 0, 
-                        "total_citations": 0,
-                        "total_appearances": 0
-                    }
-                domain_performance[domain]["total_queries"] = len(all_runs)  # Will be updated each iteration
-                domain_performance[domain]["total_appearances"] += 1
-        
-        # Track citations per domain
-        for sid in cited_ids:
-            source = src_by_id.get(sid)
-            if source:
-                domain = source.get("domain", "").lower()
-                category = source.get("category", "web")
-                
-                if domain:
-                    domain_performance[domain]["total_citations"] += 1
-                    if domain in domains_in_query:
-                        domain_performance[domain]["cited_in"] += 1
-                
-                # Category performance
-                if category not in category_performance:
-                    category_performance[category] = {
-                        "queries": set(),
-                        "citations": 0,
-                        "sources": 0
-                    }
-                category_performance[category]["queries"].add(run_id)
-                category_performance[category]["citations"] += 1
-        
-        # Track all sources per category
-        for source in sources:
-            category = source.get("category", "web")
-            if category in category_performance:
-                category_performance[category]["sources"] += 1
-        
-        # Identify content gaps (queries with few sources)
-        source_count = len(sources)
-        if source_count < 5:  # Low competition threshold
-            gap_key = f"low_competition_{len(content_gaps)}"
-            content_gaps[gap_key] = {
-                "query": query,
-                "source_count": source_count,
-                "citation_rate": len(evidence) / max(source_count, 1),
-                "opportunity_score": (5 - source_count) * 20  # Higher score = bigger opportunity
-            }
+    for field, value in agg["terms"].items():
+        word, metric = field.rsplit(":", 1)
+        query_patterns.setdefault(word, {"count": 0, "avg_sources": 0})
+        query_patterns[word]["count" if metric == "runs" else "avg_sources"] = value
+    
+    # Low-competition queries (fewer than 5 sources), most recent first
+    content_gaps = {f"low_competition_{i}": gap for i, gap in enumerate(agg["gaps"])}
     
     # Calculate final domain performance metrics
-    total_queries = len(all_runs)
     domain_insights = []
-    for domain, stats in domain_performance.items():
-        citation_rate = stats["total_citations"] / max(stats["total_appearances"], 1)
-        query_presence = (stats["cited_in"] / max(total_queries, 1)) * 100
+    for domain, appearances in agg["domain_appearances"].items():
+        total_citations = agg["domains"].get(domain, 0)
+        citation_rate = total_citations / max(appearances, 1)
+        query_presence = (total_citations / max(total_queries, 1)) * 100
         
         domain_insights.append({
             "domain": domain,
             "query_presence_pct": round(query_presence, 1),
-            "total_citations": stats["total_citations"],
+            "total_citations": total_citations,
             "citation_rate": round(citation_rate, 2),
             "dominance_score": round(query_presence * citation_rate, 2)
         })
@@ -887,15 +822,16 @@ def insights_meta_analysis(subject: str = None):
     
     # Category insights
     category_insights = []
-    for category, stats in category_performance.items():
-        query_presence = len(stats["queries"])
-        citation_rate = stats["citations"] / max(stats["sources"], 1)
+    for category, citations in agg["categories"].items():
+        query_presence = agg["category_runs"].get(category, 0)
+        sources = agg["category_sources"].get(category, 0)
+        citation_rate = citations / max(sources, 1)
         
         category_insights.append({
             "category": category,
             "queries_present": query_presence,
-            "total_citations": stats["citations"], 
-            "total_sources": stats["sources"],
+            "total_citations": citations, 
+            "total_sources": sources,
             "citation_rate": round(citation_rate, 3),
             "effectiveness_score": round(query_presence * citation_rate, 2)
         })
@@ -904,7 +840,7 @@ def insights_meta_analysis(subject: str = None):
     
     # Generate strategic recommendations
     recommendations = generate_strategic_recommendations(
-        all_runs, domain_insights, category_insights, content_gaps, total_queries
+        domain_insights, category_insights, content_gaps, total_queries
     )
     
     return {
@@ -929,7 +865,7 @@ def insights_meta_analysis(subject: str = None):
     }
 
 
-def generate_strategic_recommendations(runs, domain_insights, category_insights, gaps, total_queries):
+def generate_strategic_recommendations(domain_insights, category_insights, gaps, total_queries):
     """Generate strategic recommendations based on meta-analysis"""
     recommendations = {
         "content_strategy": [],
@@ -1014,7 +950,7 @@ def calculate_market_concentration(domain_insights):
 @router.get("/runs/{run_id}/consensus")
 def get_consensus_analysis(run_id: str):
     """Analyze multi-provider consensus vs citation correlation for research insights."""
-    run = STORE.get_run(run_id)
+    run = STORE.get_sections(run_id, ["sources", "evidence"])
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
     
@@ -1161,67 +1097,30 @@ def calculate_correlation(x_values, y_values):
 @router.get("/insights/consensus_meta")
 def get_consensus_meta_analysis(subject: str = None, limit: int = 50):
     """Meta-analysis of consensus patterns across multiple runs for research insights."""
-    recent = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, max(0, limit - 1))
-    run_ids = [m for m, _ in recent]
+    agg = ROLLUPS.collect(subject=subject, limit=limit, sections=["sources", "evidence"])
     
-    # Aggregate consensus data across runs
+    # Consensus levels and per-provider discovery, found/cited across runs
     meta_analysis = {
-        "runs_analyzed": 0,
+        "runs_analyzed": agg["totals"].get("runs", 0),
         "consensus_trends": {
-            "single_provider": {"total_sources": 0, "total_cited": 0, "citation_rate": 0.0},
-            "dual_provider": {"total_sources": 0, "total_cited": 0, "citation_rate": 0.0},
-            "triple_plus_provider": {"total_sources": 0, "total_cited": 0, "citation_rate": 0.0}
+            level: {
+                "total_sources": agg["consensus"].get(f"{level}:found", 0),
+                "total_cited": agg["consensus"].get(f"{level}:cited", 0),
+                "citation_rate": 0.0
+            }
+            for level in ("single_provider", "dual_provider", "triple_plus_provider")
         },
         "provider_effectiveness": {},
         "authority_consensus_patterns": {},
         "correlation_scores": [],
         "consensus_boost_effectiveness": 0.0
     }
-    
-    for run_id in run_ids:
-        bundle = CACHE.get_json(CACHE.ai_key(f"{run_id}"))
-        if not bundle:
-            continue
-            
-        # Filter by subject if provided
-        if subject:
-            bundle_subject = bundle.get("run", {}).get("subject")
-            if bundle_subject != subject:
-                continue
-                
-        meta_analysis["runs_analyzed"] += 1
-        sources = bundle.get("sources", [])
-        evidence = bundle.get("evidence", [])
-        cited_ids = set(e.get("source_id") for e in evidence if e.get("source_id"))
-        
-        # Aggregate consensus patterns
-        for source in sources:
-            discovered_by = source.get("discovered_by", [])
-            consensus_boost = source.get("consensus_boost", 0.0)
-            is_cited = source.get("source_id") in cited_ids
-            provider_count = len(discovered_by)
-            
-            # Categorize by consensus level
-            if provider_count <= 1:
-                category = "single_provider"
-            elif provider_count == 2:
-                category = "dual_provider"
-            else:
-                category = "triple_plus_provider"
-                
-            meta_analysis["consensus_trends"][category]["total_sources"] += 1
-            if is_cited:
-                meta_analysis["consensus_trends"][category]["total_cited"] += 1
-            
-            # Provider effectiveness across runs
-            for provider in discovered_by:
-                if provider not in meta_analysis["provider_effectiveness"]:
-                    meta_analysis["provider_effectiveness"][provider] = {
-                        "total_sources": 0, "cited_sources": 0, "runs_present": 0
-                    }
-                meta_analysis["provider_effectiveness"][provider]["total_sources"] += 1
-                if is_cited:
-                    meta_analysis["provider_effectiveness"][provider]["cited_sources"] += 1
+    for field, value in agg["discovery"].items():
+        provider, metric = field.rsplit(":", 1)
+        stats = meta_analysis["provider_effectiveness"].setdefault(
+            provider, {"total_sources": 0, "cited_sources": 0, "runs_present": 0}
+        )
+        stats["total_sources" if metric == "found" else "cited_sources"] = value
     
     # Calculate final rates and insights
     for category, stats in meta_analysis["consensus_trends"].items():
@@ -1300,7 +1199,7 @@ def generate_consensus_insights(meta_analysis):
 def migrate_legacy(dry_run: bool = True, limit: int = 1000):
     """Copy legacy, un-versioned ai_search:* keys into versioned namespace.
 
-    - ai_search:{run_id}                → ai_search:v{ver}:{run_id}
+    - ai_search:{run_id}                → ai_search:v{ver}:run:{run_id}
     - ai_search:analysis:{run_id}       → ai_search:v{ver}:analysis:{run_id}
     - ai_search:query_hash:{hash}       → ai_search:v{ver}:query_hash:{hash}
     Also rebuild indices:
@@ -1308,57 +1207,74 @@ def migrate_legacy(dry_run: bool = True, limit: int = 1000):
       - q:{hash} LIST with run_id
     """
     ver_prefix = CACHE.ai_prefix()
+    # Un-versioned keys predate the key registries, so finding them takes a SCAN
     legacy_keys = [k for k in CACHE.keys("ai_search:*") if not k.startswith(f"{ver_prefix}:")]
     migrated = {"bundles": 0, "analysis": 0, "qhash": 0}
-    for k in legacy_keys[:limit]:
+    todo = legacy_keys[:limit]
+    for i in range(0, len(todo), CACHE.batch_size):
+        chunk = todo[i:i + CACHE.batch_size]
+        # Batched reads: values and TTLs for the whole chunk
+        qhash_keys = [k for k in chunk if k.startswith("ai_search:query_hash:")]
+        json_keys = [k for k in chunk if not k.startswith("ai_search:query_hash:")]
+        values = dict(zip(qhash_keys, CACHE.get_many(qhash_keys)))
         try:
-            if k.startswith("ai_search:analysis:"):
-                run_id = k.split(":", 2)[2]
-                data = CACHE.get_json(k)
-                if not data:
+            values.update(zip(json_keys, CACHE.get_many_json(json_keys)))
+        except Exception:
+            # A non-JSON value in the chunk: read its keys one by one
+            for k in json_keys:
+                try:
+                    values[k] = CACHE.get_json(k)
+                except Exception:
+                    values[k] = None
+        ttls = {} if dry_run else dict(zip(chunk, CACHE.ttl_many(chunk)))
+        for k in chunk:
+            try:
+                if k.startswith("ai_search:analysis:"):
+                    run_id = k.split(":", 2)[2]
+                    data = values.get(k)
+                    if not data:
+                        continue
+                    if not dry_run:
+                        STORE.save_analysis(run_id, data, ttl=ttls.get(k) or 3600, report=False)
+                    migrated["analysis"] += 1
                     continue
-                if not dry_run:
-                    ttl = CACHE.ttl(k) or 3600
-                    CACHE.set_json(CACHE.ai_key(f"analysis:{run_id}"), data, ttl=ttl)
-                migrated["analysis"] += 1
-                continue
-            if k.startswith("ai_search:query_hash:"):
-                h = k.split(":", 2)[2]
-                run_id = CACHE.get(k)
-                if not run_id:
+                if k.startswith("ai_search:query_hash:"):
+                    h = k.split(":", 2)[2]
+                    run_id = values.get(k)
+                    if not run_id:
+                        continue
+                    if not dry_run:
+                        CACHE.set(CACHE.ai_key(f"query_hash:{h}"), run_id, ttl=ttls.get(k) or 30 * 60)
+                        # Append to query history list
+                        CACHE.lpush(CACHE.ai_key(f"q:{h}"), run_id, ttl=7 * 24 * 3600)
+                        CACHE.ltrim(CACHE.ai_key(f"q:{h}"), 20)
+                        STORE.register("indexes", CACHE.ai_key(f"q:{h}"))
+                    migrated["qhash"] += 1
                     continue
-                if not dry_run:
-                    ttl = CACHE.ttl(k) or 30 * 60
-                    CACHE.set(CACHE.ai_key(f"query_hash:{h}"), run_id, ttl=ttl)
-                    # Append to query history list
-                    CACHE.lpush(CACHE.ai_key(f"q:{h}"), run_id, ttl=7 * 24 * 3600)
-                    CACHE.ltrim(CACHE.ai_key(f"q:{h}"), 20)
-                migrated["qhash"] += 1
+                # Otherwise treat as bundle key for run
+                if k.startswith("ai_search:"):
+                    run_id = k.split(":", 1)[1]
+                    bundle = values.get(k)
+                    if not bundle:
+                        continue
+                    if not dry_run:
+                        STORE.save_bundle(run_id, bundle, ttl=ttls.get(k) or 24 * 3600)
+                        # Index recent by created_at if present
+                        created_at = (bundle.get("run") or {}).get("created_at")
+                        ts = None
+                        if isinstance(created_at, str):
+                            try:
+                                iso = created_at[:-1] if created_at.endswith("Z") else created_at
+                                ts = datetime.fromisoformat(iso).timestamp()
+                            except Exception:
+                                ts = None
+                        if ts is None:
+                            ts = datetime.utcnow().timestamp()
+                        STORE.index_run(run_id, bundle.get("run") or {}, ts)
+                        ROLLUPS.apply(run_id, bundle, ts=ts)
+                    migrated["bundles"] += 1
+            except Exception:
+                # continue best-effort
                 continue
-            # Otherwise treat as bundle key for run
-            if k.startswith("ai_search:"):
-                run_id = k.split(":", 1)[1]
-                bundle = CACHE.get_json(k)
-                if not bundle:
-                    continue
-                if not dry_run:
-                    ttl = CACHE.ttl(k) or 24 * 3600
-                    CACHE.set_json(CACHE.ai_key(f"{run_id}"), bundle, ttl=ttl)
-                    # Index recent by created_at if present
-                    created_at = (bundle.get("run") or {}).get("created_at")
-                    ts = None
-                    if isinstance(created_at, str):
-                        try:
-                            iso = created_at[:-1] if created_at.endswith("Z") else created_at
-                            ts = datetime.fromisoformat(iso).timestamp()
-                        except Exception:
-                            ts = None
-                    if ts is None:
-                        ts = datetime.utcnow().timestamp()
-                    CACHE.zadd(CACHE.ai_key("recent"), score=ts, member=run_id, ttl=7 * 24 * 3600)
-                migrated["bundles"] += 1
-        except Exception:
-            # continue best-effort
-            continue
     return {"ok": True, "migrated": migrated, "scanned": len(legacy_keys)}
 
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import os
+import re
 import json
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 from openai import OpenAI
 try:
@@ -20,13 +21,85 @@ def _client() -> OpenAI:
     return OpenAI(api_key=api_key)
 
 
-def compose_answer(query: str, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+class _SentenceStream:
+    """Pull complete objects out of the `sentences` array of a JSON reply as it streams in."""
+
+    _ARRAY_START = re.compile(r'"sentences"\s*:\s*\[')
+
+    def __init__(self) -> None:
+        self.buf = ""
+        self.pos: Optional[int] = None  # next char to scan, once inside the array
+        self.depth = 0
+        self.start: Optional[int] = None
+        self.in_str = False
+        self.escaped = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[dict]:
+        self.buf += chunk
+        out: List[dict] = []
+        if self.done:
+            return out
+        if self.pos is None:
+            m = self._ARRAY_START.search(self.buf)
+            if not m:
+                return out
+            self.pos = m.end()
+        while self.pos < len(self.buf) and not self.done:
+            ch = self.buf[self.pos]
+            if self.in_str:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_str = False
+            elif ch == '"':
+                self.in_str = True
+            elif ch == "{":
+                if self.depth == 0:
+                    self.start = self.pos
+                self.depth += 1
+            elif ch == "}":
+                self.depth -= 1
+                if self.depth == 0 and self.start is not None:
+                    try:
+                        out.append(json.loads(self.buf[self.start:self.pos + 1]))
+                    except ValueError:
+                        pass
+                    self.start = None
+            elif ch == "]" and self.depth == 0:
+                self.done = True
+            self.pos += 1
+        return out
+
+
+def _normalize_sentence(item: Any, id_map: Dict[int, str]) -> Optional[Dict[str, Any]]:
+    # Normalize shape & keys (handle sourceIds / citations / numeric indices)
+    if not isinstance(item, dict):
+        return None
+    ids = item.get("source_ids") or item.get("sourceIds") or item.get("citations") or []
+    # map numeric refs (1-based) to source_ids
+    if ids and all(isinstance(x, (int, float)) for x in ids):
+        ids = [id_map.get(int(x)) for x in ids if id_map.get(int(x))]
+    ids = [str(x) for x in ids if x]
+    if ids and (item.get("text") or "").strip():
+        return {"text": item["text"].strip(), "source_ids": ids}
+    return None
+
+
+def compose_answer(query: str, sources: List[Dict[str, Any]],
+                   on_sentence: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
     """
     Ask the model to write an answer with sentence-level citations.
     
     Implements authority floor guardrails: refuses to compose unless minimum 
     high-authority sources are available.
 
+    With `on_sentence`, the completion is streamed and each normalized sentence
+    is passed to it as soon as the model has finished writing it (called from
+    this thread); every returned sentence goes through it exactly once.
+
     Returns a dict: { "answer_text": str, "sentences": [{"text": str, "source_ids": [str]}] }
     """
     model = os.getenv("OPENAI_MODEL_COMPOSER", "gpt-4o-mini")
@@ -97,7 +170,7 @@ def compose_answer(query: str, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
         "- Every sentence MUST include 1–3 citations referencing source_id values.\n"
         "- If a statement is not directly supported by a passage, do not include it.\n"
         "- Keep it concise (3–6 sentences), factual, and grounded.\n"
-        "Return strict JSON with keys: answer_text, sentences[]. Each sentences[] item has text and source_ids[]."
+        "Return strict JSON with keys: sentences[], answer_text (sentences first). Each sentences[] item has text and source_ids[]."
     )
     user = {
         "query": query,
@@ -106,31 +179,52 @@ def compose_answer(query: str, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
     client = _client()
-    resp = client.chat.completions.create(
-        model=model,
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": json.dumps(user)},
-        ],
-        temperature=0.2,
-    )
-    content = resp.choices[0].message.content
-    data = json.loads(content)
-    
-    # Normalize shape & keys (handle sourceIds / citations / numeric indices)
-    raw_sentences = data.get("sentences") or data.get("Sentences") or []
-    sentences = []
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": json.dumps(user)},
+    ]
     id_map = {i + 1: s["source_id"] for i, s in enumerate(selected_sources)}
-    
-    for item in raw_sentences:
-        ids = item.get("source_ids") or item.get("sourceIds") or item.get("citations") or []
-        # map numeric refs (1-based) to source_ids
-        if ids and all(isinstance(x, (int, float)) for x in ids):
-            ids = [id_map.get(int(x)) for x in ids if id_map.get(int(x))]
-        ids = [str(x) for x in ids if x]
-        if ids and (item.get("text") or "").strip():
-            sentences.append({"text": item["text"].strip(), "source_ids": ids})
+    sentences = []
+
+    if on_sentence is None:
+        resp = client.chat.completions.create(
+            model=model,
+            response_format={"type": "json_object"},
+            messages=messages,
+            temperature=0.2,
+        )
+        content = resp.choices[0].message.content
+    else:
+        # Stream the completion and hand out each sentence once its object closes
+        stream = client.chat.completions.create(
+            model=model,
+            response_format={"type": "json_object"},
+            messages=messages,
+            temperature=0.2,
+            stream=True,
+        )
+        parser = _SentenceStream()
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            for item in parser.feed(delta):
+                sent = _normalize_sentence(item, id_map)
+                if sent:
+                    sentences.append(sent)
+                    on_sentence(sent)
+        content = parser.buf
+    data = json.loads(content)
+
+    if not sentences:
+        # Not streamed, or the reply used another key (e.g. "Sentences")
+        raw_sentences = data.get("sentences") or data.get("Sentences") or []
+        for item in raw_sentences:
+            sent = _normalize_sentence(item, id_map)
+            if sent:
+                sentences.append(sent)
+                if on_sentence:
+                    on_sentence(sent)
     
     # Clean answer_text - let UI handle citation formatting from sentences[]
     answer_text = " ".join(s['text'] for s in sentences)
@@ -1,116 +1,111 @@
 from __future__ import annotations
 
-import asyncio
+import os
 from typing import Optional
 
 import httpx
 import hashlib
-from ..core.cache import CACHE
+from ..core.cache import ASYNC_CACHE
+from ..core.http import HTTP_CLIENTS
+from .html_extract import EXTRACTOR_VERSION, PARSE_POOL
 
 
-async def fetch_url(url: str, *, timeout: float = 15.0) -> Optional[str]:
+PARSED_CACHE_TTL = int(os.getenv("PARSED_CACHE_TTL", str(7 * 24 * 3600)))
+# Transient failures are re-parsed next time instead of being pinned in the cache
+_UNCACHEABLE_METHODS = {"timeout_fallback", "error_fallback"}
+
+
+class FetchCacheStats:
+    """Process-wide hit/miss counters for the parsed-document and raw HTML cache tiers."""
+
+    def __init__(self) -> None:
+        self.counts = {"parsed_hit": 0, "parsed_miss": 0, "html_hit": 0, "html_miss": 0}
+
+    def record(self, tier: str, hit: bool) -> None:
+        self.counts[f"{tier}_{'hit' if hit else 'miss'}"] += 1
+
+    def snapshot(self) -> dict:
+        out = {}
+        for tier in ("parsed", "html"):
+            hits, misses = self.counts[f"{tier}_hit"], self.counts[f"{tier}_miss"]
+            total = hits + misses
+            out[tier] = {"hits": hits, "misses": misses, "hit_rate": round(hits / total, 3) if total else None}
+        return out
+
+
+FETCH_CACHE_STATS = FetchCacheStats()
+
+
+def parsed_cache_key(url: str) -> str:
+    return f"cache:parsed:{EXTRACTOR_VERSION}:{hashlib.sha256(url.encode()).hexdigest()}"
+
+
+async def fetch_url(url: str, *, timeout: float = 15.0, client: Optional[httpx.AsyncClient] = None) -> Optional[str]:
+    html, _ = await _fetch_url(url, timeout=timeout, client=client)
+    return html
+
+
+async def _fetch_url(url: str, *, timeout: float = 15.0, client: Optional[httpx.AsyncClient] = None) -> tuple[Optional[str], str]:
+    """Return (html, tier) where tier is "html" for a raw-cache hit, else "network"."""
     cache_key = f"cache:content:{hashlib.sha256(url.encode()).hexdigest()}"
-    cached = CACHE.get(cache_key)
+    try:
+        cached = await ASYNC_CACHE.get(cache_key)
+    except Exception:
+        cached = None
+    FETCH_CACHE_STATS.record("html", bool(cached))
     if cached:
-        return cached
+        return cached, "html"
     try:
-        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-            r = await client.get(url, headers={"User-Agent": "demo-bot/0.1"})
-            if r.status_code >= 400:
-                return None
-            text = r.text
-            CACHE.set(cache_key, text, ttl=7 * 24 * 3600)
-            return text
+        client = client or HTTP_CLIENTS.get("fetch")
+        async with HTTP_CLIENTS.host_slot(url):
+            r = await client.get(url, headers={"User-Agent": "demo-bot/0.1"}, timeout=timeout, follow_redirects=True)
+        if r.status_code >= 400:
+            return None, "network"
+        text = r.text
+        await ASYNC_CACHE.set(cache_key, text, ttl=7 * 24 * 3600)
+        return text, "network"
     except Exception:
-        return None
+        return None, "network"
 
 
 async def parse_main_text(html: str) -> dict:
-    """Extract clean article text using trafilatura + readability fallback."""
+    """Extract clean article text using trafilatura + readability fallback.
+
+    Runs in the PARSE_POOL worker processes so CPU-bound extraction never
+    blocks the event loop.
+    """
+    return await PARSE_POOL.extract(html)
+
+
+async def fetch_and_parse(url: str) -> Optional[dict]:
+    # Tier 1: parsed document, so warm runs skip both the fetch and the parse
+    parsed_key = parsed_cache_key(url)
     try:
-        import trafilatura
-        from readability import Document
-        from datetime import datetime
-        
-        # Primary: Use trafilatura for clean text extraction
-        trafilatura_result = trafilatura.extract(html, include_comments=False, include_tables=False)
-        
-        # Also get metadata if available
-        metadata = trafilatura.extract_metadata(html)
-        
-        # Fallback: Use readability if trafilatura fails or returns short content
-        readability_text = ""
-        if not trafilatura_result or len(trafilatura_result) < 200:
-            try:
-                doc = Document(html)
-                readability_text = doc.summary(html_partial=True)
-                # Strip HTML tags from readability output
-                import re
-                readability_text = re.sub(r'<[^>]+>', '', readability_text)
-            except Exception:
-                readability_text = ""
-        
-        # Choose the best extraction result
-        main_text = trafilatura_result if trafilatura_result and len(trafilatura_result) >= 200 else readability_text
-        
-        # If both fail, fall back to HTML stub (better than nothing)
-        if not main_text or len(main_text) < 100:
-            main_text = html[:2000]  # Original fallback
-        
-        # Extract metadata
-        title = metadata.title if metadata else ""
-        author = metadata.author if metadata else ""
-        published_date = metadata.date if metadata else ""
-        
-        # Try to parse published date
-        published_at = None
-        if published_date:
-            try:
-                # trafilatura returns dates in various formats
-                from dateutil import parser
-                published_at = parser.parse(published_date).isoformat()
-            except Exception:
-                published_at = None
-        
-        return {
-            "text": main_text.strip(),
-            "title": title,
-            "author": author,
-            "published_at": published_at,
-            "extraction_method": "trafilatura" if trafilatura_result else ("readability" if readability_text else "html_fallback"),
-            "content_length": len(main_text.strip())
-        }
-        
-    except ImportError:
-        # If dependencies aren't installed, fall back to original method
-        return {
-            "text": html[:2000],
-            "title": "",
-            "author": "",
-            "published_at": None,
-            "extraction_method": "html_fallback",
-            "content_length": min(2000, len(html))
-        }
-    except Exception as e:
-        # Any other error, fall back gracefully
-        print(f"[PARSE ERROR] {str(e)}")
+        cached = await ASYNC_CACHE.get_json(parsed_key)
+    except Exception:
+        cached = None
+    FETCH_CACHE_STATS.record("parsed", cached is not None)
+    if cached is not None:
         return {
-            "text": html[:2000] if html else "",
-            "title": "",
-            "author": "",
-            "published_at": None,
-            "extraction_method": "error_fallback",
-            "content_length": min(2000, len(html)) if html else 0
+            "raw_html": None,  # not kept in the parsed tier
+            "raw_text": cached["text"],
+            **cached,
+            "cache_tier": "parsed",
         }
 
-
-async def fetch_and_parse(url: str) -> Optional[dict]:
-    html = await fetch_url(url)
+    # Tier 2: raw HTML cache (inside fetch_url), then the network
+    html, tier = await _fetch_url(url)
     if not html:
         return None
     
     # Parse with the new enhanced method
     parsed_result = await parse_main_text(html)
+
+    if parsed_result["extraction_method"] not in _UNCACHEABLE_METHODS:
+        try:
+            await ASYNC_CACHE.set_json(parsed_key, parsed_result, PARSED_CACHE_TTL)
+        except Exception as e:
+            print(f"[FETCH] Parsed cache write failed for {url}: {e}")
     
     return {
         "raw_html": html,
@@ -121,6 +116,6 @@ async def fetch_and_parse(url: str) -> Optional[dict]:
         "extraction_method": parsed_result["extraction_method"],
         "content_length": parsed_result["content_length"],
         # Keep the old "text" field for backward compatibility
-        "text": parsed_result["text"]
+        "text": parsed_result["text"],
+        "cache_tier": tier,
     }
-
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import re
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+# NOTE: this module is imported by pool worker processes; keep it free of
+# app imports (Redis, OpenAI) so workers start fast and hold no connections.
+
+
+# Bump when extraction output changes so the parsed-document cache is bypassed
+EXTRACTOR_VERSION = "1"
+
+
+class ExtractionTimeout(BaseException):
+    """CPU limit hit; BaseException so library-level `except Exception` can't swallow it."""
+
+
+def _fallback(html: str, method: str) -> dict:
+    return {
+        "text": html[:2000] if html else "",
+        "title": "",
+        "author": "",
+        "published_at": None,
+        "extraction_method": method,
+        "content_length": min(2000, len(html)) if html else 0,
+    }
+
+
+def extract_main_text(html: str) -> dict:
+    """Extract clean article text using trafilatura + readability fallback (blocking)."""
+    try:
+        import trafilatura
+        from readability import Document
+
+        # Primary: Use trafilatura for clean text extraction
+        trafilatura_result = trafilatura.extract(html, include_comments=False, include_tables=False)
+
+        # Also get metadata if available
+        metadata = trafilatura.extract_metadata(html)
+
+        # Fallback: Use readability if trafilatura fails or returns short content
+        readability_text = ""
+        if not trafilatura_result or len(trafilatura_result) < 200:
+            try:
+                doc = Document(html)
+                readability_text = doc.summary(html_partial=True)
+                # Strip HTML tags from readability output
+                readability_text = re.sub(r'<[^>]+>', '', readability_text)
+            except Exception:
+                readability_text = ""
+
+        # Choose the best extraction result
+        main_text = trafilatura_result if trafilatura_result and len(trafilatura_result) >= 200 else readability_text
+
+        # If both fail, fall back to HTML stub (better than nothing)
+        if not main_text or len(main_text) < 100:
+            main_text = html[:2000]  # Original fallback
+
+        # Extract metadata
+        title = metadata.title if metadata else ""
+        author = metadata.author if metadata else ""
+        published_date = metadata.date if metadata else ""
+
+        # Try to parse published date
+        published_at = None
+        if published_date:
+            try:
+                # trafilatura returns dates in various formats
+                from dateutil import parser
+                published_at = parser.parse(published_date).isoformat()
+            except Exception:
+                published_at = None
+
+        return {
+            "text": main_text.strip(),
+            "title": title,
+            "author": author,
+            "published_at": published_at,
+            "extraction_method": "trafilatura" if trafilatura_result else ("readability" if readability_text else "html_fallback"),
+            "content_length": len(main_text.strip())
+        }
+
+    except ImportError:
+        # If dependencies aren't installed, fall back to original method
+        return _fallback(html, "html_fallback")
+    except Exception as e:
+        # Any other error, fall back gracefully
+        print(f"[PARSE ERROR] {str(e)}")
+        return _fallback(html, "error_fallback")
+
+
+# Worker-process side
+
+def _on_cpu_limit(signum, frame):
+    raise ExtractionTimeout()
+
+
+def _init_worker() -> None:
+    """Preload the extraction libraries once per worker and arm the CPU-time signal."""
+    try:
+        import trafilatura  # noqa: F401
+        import readability  # noqa: F401
+        import dateutil.parser  # noqa: F401
+    except ImportError:
+        pass
+    signal.signal(signal.SIGPROF, _on_cpu_limit)
+
+
+def _warm() -> int:
+    # Brief pause so each warm-up call lands on a different idle worker
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _extract_with_cpu_limit(html: str, cpu_limit_s: float) -> dict:
+    # ITIMER_PROF counts this process's CPU time (user + system), not wall time
+    if cpu_limit_s > 0:
+        signal.setitimer(signal.ITIMER_PROF, cpu_limit_s)
+    try:
+        return extract_main_text(html)
+    except ExtractionTimeout:
+        print(f"[PARSE] Extraction exceeded {cpu_limit_s:.1f}s CPU, using fallback")
+        return _fallback(html, "timeout_fallback")
+    finally:
+        if cpu_limit_s > 0:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+
+
+class ParsePool:
+    """
+    Bounded process pool for trafilatura/readability extraction.
+
+    Extraction is CPU-bound and holds the GIL, so running it on the event loop
+    (or in threads) serializes every parse in the worker. PARSE_POOL_WORKERS
+    processes (default: CPU count) are spawned once, preload the libraries, and
+    enforce PARSE_CPU_LIMIT_S of CPU time per document. PARSE_POOL_WORKERS=0
+    parses in a thread instead. A broken pool is rebuilt on the next call.
+
+    Documents wait for a free worker here rather than in the pool's queue, so
+    the wall-clock guard (3x the CPU limit) only counts time a worker spends
+    on the document; a burst of pages doesn't time out while queued.
+    """
+
+    def __init__(self) -> None:
+        self.workers = int(os.getenv("PARSE_POOL_WORKERS", str(os.cpu_count() or 1)))
+        self.cpu_limit_s = float(os.getenv("PARSE_CPU_LIMIT_S", "5"))
+        self.start_method = os.getenv("PARSE_POOL_START_METHOD", "spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+            )
+        return self._pool
+
+    def _worker_slots(self) -> asyncio.Semaphore:
+        # One slot per worker; semaphores are bound to the loop that uses them
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    async def start(self) -> None:
+        """Spawn and warm every worker so the first run doesn't pay process start-up."""
+        if self.workers <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        try:
+            pids = await asyncio.gather(*(loop.run_in_executor(pool, _warm) for _ in range(self.workers)))
+            print(f"[PARSE] Warmed {len(set(pids))} extraction workers")
+        except Exception as e:
+            print(f"[PARSE] Worker warm-up failed: {e}")
+
+    async def extract(self, html: str) -> dict:
+        if self.workers <= 0:
+            return await asyncio.to_thread(extract_main_text, html)
+        loop = asyncio.get_running_loop()
+        # Wall-clock guard in case a worker is stuck outside the interpreter;
+        # the CPU limit itself is enforced in the worker (SIGPROF)
+        wall_limit = self.cpu_limit_s * 3 if self.cpu_limit_s > 0 else None
+        async with self._worker_slots():
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._get_pool(), _extract_with_cpu_limit, html, self.cpu_limit_s),
+                    timeout=wall_limit,
+                )
+            except asyncio.TimeoutError:
+                print(f"[PARSE] Extraction exceeded {wall_limit:.1f}s wall time, using fallback")
+                return _fallback(html, "timeout_fallback")
+            except BrokenProcessPool as e:
+                print(f"[PARSE] Process pool broken ({e}); restarting")
+                self.shutdown()
+        return await asyncio.to_thread(extract_main_text, html)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+PARSE_POOL = ParsePool()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from ..core.cache import CACHE, ASYNC_CACHE
+from .providers.base import ProviderResult
+
+
+# Fresh-window defaults per provider (seconds); LLM-curated results change slowly
+DEFAULT_TTLS = {
+    "tavily": 3600,
+    "brave": 3600,
+    "perplexity": 6 * 3600,
+    "gemini": 6 * 3600,
+    "openai": 24 * 3600,
+}
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.strip().lower().split())
+
+
+def _pack(results: List[ProviderResult]) -> list:
+    # Positional rows keep the Redis value small (no repeated field names)
+    return [
+        [r.title, r.url, r.snippet, r.published_at, r.provider, r.score,
+         r.discovered_by, r.provider_scores, r.consensus_boost]
+        for r in results
+    ]
+
+
+def _unpack(rows: list) -> List[ProviderResult]:
+    out = []
+    for title, url, snippet, published_at, provider, score, discovered_by, provider_scores, boost in rows:
+        out.append(ProviderResult(
+            title=title, url=url, snippet=snippet, published_at=published_at,
+            provider=provider, score=score, discovered_by=list(discovered_by),
+            provider_scores=dict(provider_scores), consensus_boost=boost,
+        ))
+    return out
+
+
+class ProviderResponseCache:
+    """
+    Cache of raw provider responses keyed on (provider, normalized query variant, limit).
+
+    Entries are fresh for PROVIDER_CACHE_TTL_{PROVIDER} seconds. After that
+    they are served stale for up to PROVIDER_CACHE_SWR_S more while a single
+    background refresh re-queries the provider. Empty result lists are
+    negatively cached for PROVIDER_CACHE_NEGATIVE_TTL seconds without a stale
+    window. Provider errors are never cached.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = os.getenv("PROVIDER_CACHE_ENABLED", "true").strip().lower() == "true"
+        self.swr_s = int(os.getenv("PROVIDER_CACHE_SWR_S", str(24 * 3600)))
+        self.negative_ttl = int(os.getenv("PROVIDER_CACHE_NEGATIVE_TTL", "300"))
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def ttl_for(provider: str) -> int:
+        default = DEFAULT_TTLS.get(provider, 3600)
+        return int(os.getenv(f"PROVIDER_CACHE_TTL_{provider.upper()}", str(default)))
+
+    @staticmethod
+    def key(provider: str, query: str, limit: int) -> str:
+        h = hashlib.sha256(f"{_normalize_query(query)}|{limit}".encode()).hexdigest()[:32]
+        return CACHE.ai_key(f"provider_cache:{provider}:{h}")
+
+    async def get(self, provider: str, query: str, limit: int) -> Optional[Tuple[List[ProviderResult], bool]]:
+        """Return (results, is_fresh), or None on a miss."""
+        if not self.enabled:
+            return None
+        try:
+            raw = await ASYNC_CACHE.get(self.key(provider, query, limit))
+            if not raw:
+                return None
+            entry = json.loads(raw)
+            age = time.time() - entry["ts"]
+            return _unpack(entry["r"]), age < self.ttl_for(provider)
+        except Exception as e:
+            print(f"[PROVIDER_CACHE] Read failed for {provider}: {e}")
+            return None
+
+    async def set(self, provider: str, query: str, limit: int, results: List[ProviderResult]) -> None:
+        if not self.enabled:
+            return
+        if results:
+            ttl = self.ttl_for(provider)
+            redis_ttl = ttl + self.swr_s
+        else:
+            # Negative entry: fresh for negative_ttl, then gone (no stale serving)
+            ttl = redis_ttl = self.negative_ttl
+        if ttl <= 0:
+            return
+        entry = {"ts": time.time(), "r": _pack(results)}
+        try:
+            await ASYNC_CACHE.set(self.key(provider, query, limit), json.dumps(entry, separators=(",", ":")), redis_ttl)
+        except Exception as e:
+            print(f"[PROVIDER_CACHE] Write failed for {provider}: {e}")
+
+    def revalidate(self, provider: str, query: str, limit: int,
+                   fetch: Callable[[], Awaitable[List[ProviderResult]]]) -> None:
+        """Refresh a stale entry in the background; at most one refresh per key at a time."""
+        key = self.key(provider, query, limit)
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def _refresh() -> None:
+            try:
+                results = await fetch()
+                await self.set(provider, query, limit, results)
+                print(f"[PROVIDER_CACHE] Revalidated {provider} for: {query[:50]}...")
+            except Exception as e:
+                print(f"[PROVIDER_CACHE] Revalidation failed for {provider}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.ensure_future(_refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+PROVIDER_CACHE = ProviderResponseCache()
@@ -6,17 +6,20 @@ from urllib.parse import quote
 
 import httpx
 
+from ...core.http import HTTP_CLIENTS
 from .base import SearchProvider, ProviderResult
 
 
 class BraveSearchProvider(SearchProvider):
     name = "brave"
 
-    def __init__(self) -> None:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None) -> None:
         api_key = os.getenv("BRAVE_API_KEY")
         if not api_key:
             raise RuntimeError("BRAVE_API_KEY not set")
         self.api_key = api_key
+        # Injected client for tests/benchmarks; defaults to the shared app-lifetime pool
+        self._client = client
         self.base_url = "https://api.search.brave.com/res/v1/web/search"
 
     async def search(self, query: str, *, limit: int = 10) -> List[ProviderResult]:
@@ -50,18 +53,19 @@ class BraveSearchProvider(SearchProvider):
             params["freshness"] = freshness
 
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                resp = await client.get(
-                    self.base_url,
-                    headers=headers,
-                    params=params
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            client = self._client or HTTP_CLIENTS.get(self.name)
+            resp = await client.get(
+                self.base_url,
+                headers=headers,
+                params=params,
+                timeout=20.0,
+            )
+            resp.raise_for_status()
+            data = resp.json()
         except Exception as e:
-            # Log error but don't fail entire search pipeline
+            # Log and propagate; search_one records it with the circuit breaker
             print(f"Brave Search API error: {e}")
-            return []
+            raise
 
         results = []
         web_results = data.get("web", {}).get("results", [])
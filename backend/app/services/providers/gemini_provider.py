@@ -6,17 +6,20 @@ import re
 
 import httpx
 
+from ...core.http import HTTP_CLIENTS
 from .base import SearchProvider, ProviderResult
 
 
 class GeminiProvider(SearchProvider):
     name = "gemini"
 
-    def __init__(self) -> None:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None) -> None:
         api_key = os.getenv("GOOGLE_GEMINI_API_KEY")
         if not api_key:
             raise RuntimeError("GOOGLE_GEMINI_API_KEY not set")
         self.api_key = api_key
+        # Injected client for tests/benchmarks; defaults to the shared app-lifetime pool
+        self._client = client
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
 
     async def search(self, query: str, *, limit: int = 10) -> List[ProviderResult]:
@@ -54,17 +57,18 @@ Format your response with clear citations that can be extracted."""
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json=payload
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            client = self._client or HTTP_CLIENTS.get(self.name)
+            resp = await client.post(
+                self.base_url,
+                headers=headers,
+                json=payload,
+                timeout=30.0,
+            )
+            resp.raise_for_status()
+            data = resp.json()
         except Exception as e:
             print(f"Gemini API error: {e}")
-            return []
+            raise
 
         # Extract citations from Gemini response
         results = self._extract_citations_from_response(data, query, limit)
@@ -49,6 +49,7 @@ class OpenAISearchProvider(SearchProvider):
 
         try:
             return await asyncio.to_thread(_call_llm)
-        except Exception:
-            return []
+        except Exception as e:
+            print(f"OpenAI search error: {e}")
+            raise
 
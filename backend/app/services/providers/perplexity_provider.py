@@ -6,17 +6,20 @@ import re
 
 import httpx
 
+from ...core.http import HTTP_CLIENTS
 from .base import SearchProvider, ProviderResult
 
 
 class PerplexityProvider(SearchProvider):
     name = "perplexity"
 
-    def __init__(self) -> None:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None) -> None:
         api_key = os.getenv("OPENROUTER_API_KEY")
         if not api_key:
             raise RuntimeError("OPENROUTER_API_KEY not set")
         self.api_key = api_key
+        # Injected client for tests/benchmarks; defaults to the shared app-lifetime pool
+        self._client = client
         self.base_url = "https://openrouter.ai/api/v1/chat/completions"
 
     async def search(self, query: str, *, limit: int = 10) -> List[ProviderResult]:
@@ -56,17 +59,18 @@ class PerplexityProvider(SearchProvider):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                resp = await client.post(
-                    self.base_url,
-                    headers=headers,
-                    json=payload
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            client = self._client or HTTP_CLIENTS.get(self.name)
+            resp = await client.post(
+                self.base_url,
+                headers=headers,
+                json=payload,
+                timeout=30.0,
+            )
+            resp.raise_for_status()
+            data = resp.json()
         except Exception as e:
             print(f"Perplexity API error: {e}")
-            return []
+            raise
 
         # Extract citations from Perplexity response
         results = self._extract_citations_from_response(data, query, limit)
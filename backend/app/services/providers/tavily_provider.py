@@ -1,21 +1,24 @@
 from __future__ import annotations
 
 import os
-from typing import List
+from typing import List, Optional
 
 import httpx
 
+from ...core.http import HTTP_CLIENTS
 from .base import SearchProvider, ProviderResult
 
 
 class TavilySearchProvider(SearchProvider):
     name = "tavily"
 
-    def __init__(self) -> None:
+    def __init__(self, client: Optional[httpx.AsyncClient] = None) -> None:
         api_key = os.getenv("TAVILY_API_KEY")
         if not api_key:
             raise RuntimeError("TAVILY_API_KEY not set")
         self.api_key = api_key
+        # Injected client for tests/benchmarks; defaults to the shared app-lifetime pool
+        self._client = client
 
     async def search(self, query: str, *, limit: int = 10) -> List[ProviderResult]:
         url = "https://api.tavily.com/search"
@@ -40,12 +43,14 @@ class TavilySearchProvider(SearchProvider):
             # Parse comma-separated list of domains to exclude
             payload["exclude_domains"] = [d.strip() for d in exclude_domains.split(",") if d.strip()]
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                resp = await client.post(url, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-        except Exception:
-            return []
+            client = self._client or HTTP_CLIENTS.get(self.name)
+            resp = await client.post(url, json=payload, timeout=20.0)
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception as e:
+            # Propagate so the pipeline's circuit breaker sees the failure
+            print(f"Tavily API error: {e}")
+            raise
 
         results = []
         for r in (data.get("results") or [])[:limit]:
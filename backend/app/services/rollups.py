@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from redis.exceptions import WatchError
+
+from ..core.cache import CACHE
+
+
+# Counter tables kept per scope ("all" and "subject:{subject}"). Hash tables
+# map field -> number; `domains` is a sorted set so the top domains come back
+# in order; `cited` is a list of cited-article entries (newest first) and
+# `gaps` a sorted set of low-competition runs scored by run timestamp. Both
+# keep only the newest LIST_LIMIT entries, so reading a scope stays bounded.
+HASH_TABLES = (
+    "totals",              # runs, sources, evidence, cited_sources (distinct per run)
+    "domain_appearances",  # domain -> sources seen
+    "categories",          # category -> cited sources
+    "category_sources",    # category -> sources seen
+    "category_runs",       # category -> runs citing it
+    "providers",           # {provider}:{runs|sources|credibility|content_length} from provider_performance
+    "provider_categories", # {provider}:{category} -> sources
+    "discovery",           # {provider}:{found|cited} from sources' discovered_by
+    "consensus",           # {single|dual|triple_plus}_provider:{found|cited}
+    "terms",               # {query word}:{runs|sources}
+)
+ZSET_TABLES = ("domains",)  # domain -> cited sources
+LOW_COMPETITION_SOURCES = 5
+LIST_LIMIT = int(os.getenv("ROLLUP_LIST_LIMIT", "1000"))
+# Bump when run_contribution changes: rollups built by an older version are
+# ignored (collect() scans) until `rebuild-rollups` recomputes them
+ROLLUP_VERSION = "2"
+
+
+def _level(provider_count: int) -> str:
+    if provider_count <= 1:
+        return "single_provider"
+    if provider_count == 2:
+        return "dual_provider"
+    return "triple_plus_provider"
+
+
+def _inc(table: Dict[str, float], field: str, amount: float = 1) -> None:
+    table[field] = table.get(field, 0) + amount
+
+
+def empty_aggregate() -> Dict[str, Any]:
+    agg: Dict[str, Any] = {t: {} for t in HASH_TABLES + ZSET_TABLES}
+    agg["cited"] = []
+    agg["gaps"] = []
+    return agg
+
+
+def run_contribution(bundle: Dict[str, Any]) -> Dict[str, Any]:
+    """What one run adds to every rollup table (same shape as empty_aggregate())."""
+    c = empty_aggregate()
+    run = bundle.get("run") or {}
+    sources = bundle.get("sources") or []
+    evidence = bundle.get("evidence") or []
+    cited_ids = {e.get("source_id") for e in evidence if e.get("source_id")}
+    src_by_id = {s.get("source_id"): s for s in sources}
+
+    c["totals"] = {"runs": 1, "sources": len(sources), "evidence": len(evidence), "cited_sources": len(cited_ids)}
+
+    cited_categories = set()
+    for sid in cited_ids:
+        s = src_by_id.get(sid)
+        if not s:
+            continue
+        domain = (s.get("domain") or "").lower()
+        category = s.get("category", "web")
+        if domain:
+            _inc(c["domains"], domain)
+            c["cited"].append({
+                "category": category, "domain": domain, "url": s.get("url", ""),
+                "title": s.get("title", domain), "source_id": s.get("source_id"),
+            })
+        _inc(c["categories"], category)
+        cited_categories.add(category)
+    for category in cited_categories:
+        _inc(c["category_runs"], category)
+
+    for s in sources:
+        domain = (s.get("domain") or "").lower()
+        if domain:
+            _inc(c["domain_appearances"], domain)
+        _inc(c["category_sources"], s.get("category", "web"))
+        discovered_by = s.get("discovered_by") or []
+        is_cited = s.get("source_id") in cited_ids
+        level = _level(len(discovered_by))
+        _inc(c["consensus"], f"{level}:found")
+        if is_cited:
+            _inc(c["consensus"], f"{level}:cited")
+        for provider in discovered_by:
+            _inc(c["discovery"], f"{provider}:found")
+            if is_cited:
+                _inc(c["discovery"], f"{provider}:cited")
+
+    for provider, stats in (bundle.get("provider_performance") or {}).items():
+        if not stats.get("count"):
+            # Queried but contributed no sources to this run
+            continue
+        _inc(c["providers"], f"{provider}:runs")
+        _inc(c["providers"], f"{provider}:sources", stats.get("count", 0))
+        # Always floats: a hash field written with HINCRBYFLOAT can't take HINCRBY
+        _inc(c["providers"], f"{provider}:credibility", float(stats.get("avg_credibility") or 0))
+        _inc(c["providers"], f"{provider}:content_length", float(stats.get("avg_content_length") or 0))
+        for category, count in (stats.get("categories") or {}).items():
+            _inc(c["provider_categories"], f"{provider}:{category}", count)
+
+    query = run.get("query") or ""
+    for word in set(query.lower().split()):
+        if len(word) > 3:
+            _inc(c["terms"], f"{word}:runs")
+            _inc(c["terms"], f"{word}:sources", len(sources))
+
+    if len(sources) < LOW_COMPETITION_SOURCES:
+        c["gaps"].append({
+            "query": query,
+            "source_count": len(sources),
+            "citation_rate": len(evidence) / max(len(sources), 1),
+            "opportunity_score": (LOW_COMPETITION_SOURCES - len(sources)) * 20,
+        })
+    return c
+
+
+def merge(agg: Dict[str, Any], contribution: Dict[str, Any]) -> Dict[str, Any]:
+    for table in HASH_TABLES + ZSET_TABLES:
+        for field, amount in contribution[table].items():
+            _inc(agg[table], field, amount)
+    agg["cited"].extend(contribution["cited"])
+    agg["gaps"].extend(contribution["gaps"])
+    return agg
+
+
+def trim(agg: Dict[str, Any]) -> Dict[str, Any]:
+    """Cap `cited`/`gaps` like the stored rollups (merge newest run first)."""
+    agg["cited"] = agg["cited"][:LIST_LIMIT]
+    agg["gaps"] = agg["gaps"][:LIST_LIMIT]
+    return agg
+
+
+def _num(raw) -> float:
+    value = float(raw)
+    return int(value) if value.is_integer() else value
+
+
+class Rollups:
+    """
+    Insight aggregates maintained incrementally at write time.
+
+    Store.create_run calls apply() with each new run; its contribution
+    (run_contribution) is added to the `all` scope and its subject's scope in
+    one MULTI/EXEC. A set of applied run ids makes apply() idempotent. The
+    insights endpoints read a scope back with a single pipeline instead of
+    loading every bundle; collect() falls back to the full scan for windows
+    smaller than the whole dataset or until rebuild() has backfilled the
+    rollups (`python app/redis/redis_utils.py rebuild-rollups`). check()
+    compares stored rollups with a full scan.
+    """
+
+    @staticmethod
+    def key(scope: str, table: str) -> str:
+        return CACHE.ai_key(f"rollup:{scope}:{table}")
+
+    @staticmethod
+    def scopes_for(bundle: Dict[str, Any]) -> List[str]:
+        subject = (bundle.get("run") or {}).get("subject")
+        return ["all", f"subject:{subject}"] if subject else ["all"]
+
+    @property
+    def applied_key(self) -> str:
+        return CACHE.ai_key("rollup:applied")
+
+    @property
+    def built_key(self) -> str:
+        return CACHE.ai_key(f"rollup:built_at:v{ROLLUP_VERSION}")
+
+    def is_built(self) -> bool:
+        return CACHE.exists(self.built_key)
+
+    def apply(self, run_id: str, bundle: Dict[str, Any], ts: Optional[float] = None) -> bool:
+        """Add a run to its scopes' rollups; False if it was already applied.
+
+        The applied-set check and all counter updates commit in one MULTI/EXEC
+        (WATCH on the applied set, retried on conflict), so a failure leaves
+        the run unapplied rather than marked applied without its counters.
+        """
+        contribution = run_contribution(bundle)
+        ts = ts if ts is not None else time.time()
+        with CACHE.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    pipe.watch(self.applied_key)
+                    if pipe.sismember(self.applied_key, run_id):
+                        return False
+                    pipe.multi()
+                    pipe.sadd(self.applied_key, run_id)
+                    self._queue(pipe, run_id, bundle, contribution, ts)
+                    pipe.execute()
+                    return True
+                except WatchError:
+                    continue
+
+    def _queue(self, pipe, run_id: str, bundle: Dict[str, Any], contribution: Dict[str, Any], ts: float) -> None:
+        for scope in self.scopes_for(bundle):
+            for table in HASH_TABLES:
+                key = self.key(scope, table)
+                for field, amount in contribution[table].items():
+                    if isinstance(amount, float):
+                        pipe.hincrbyfloat(key, field, amount)
+                    else:
+                        pipe.hincrby(key, field, int(amount))
+            for field, amount in contribution["domains"].items():
+                pipe.zincrby(self.key(scope, "domains"), amount, field)
+            if contribution["cited"]:
+                # Newest run at the head, its entries in their original order
+                pipe.lpush(self.key(scope, "cited"), *[json.dumps(e) for e in reversed(contribution["cited"])])
+                pipe.ltrim(self.key(scope, "cited"), 0, LIST_LIMIT - 1)
+            if contribution["gaps"]:
+                for gap in contribution["gaps"]:
+                    pipe.zadd(self.key(scope, "gaps"), {json.dumps([run_id, gap]): ts})
+                pipe.zremrangebyrank(self.key(scope, "gaps"), 0, -(LIST_LIMIT + 1))
+
+    def read(self, scope: str) -> Dict[str, Any]:
+        """Load one scope's rollups in a single round-trip (same shape as empty_aggregate())."""
+        pipe = CACHE.pipeline(transaction=False)
+        for table in HASH_TABLES:
+            pipe.hgetall(self.key(scope, table))
+        pipe.zrevrange(self.key(scope, "domains"), 0, -1, withscores=True)
+        pipe.lrange(self.key(scope, "cited"), 0, LIST_LIMIT - 1)
+        pipe.zrevrange(self.key(scope, "gaps"), 0, LIST_LIMIT - 1)
+        results = pipe.execute()
+        agg = empty_aggregate()
+        for table, fields in zip(HASH_TABLES, results):
+            agg[table] = {f.decode("utf-8"): _num(v) for f, v in fields.items()}
+        domains, cited, gaps = results[len(HASH_TABLES):]
+        agg["domains"] = {m.decode("utf-8"): _num(s) for m, s in domains}
+        agg["cited"] = [json.loads(e) for e in cited]
+        agg["gaps"] = [json.loads(g)[1] for g in gaps]
+        return agg
+
+    def scan(self, subject: Optional[str] = None, limit: int = 0,
+             sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Full-scan aggregate over the `limit` most recent runs (0 = all) of a subject."""
+        from ..core.store import STORE
+
+        run_ids = [m for m, _ in STORE.recent_runs(limit, subject)]
+        sections = sections or ["sources", "evidence", "provider_performance"]
+        bundles = STORE.get_sections_many(run_ids, sections)
+        agg = empty_aggregate()
+        for run_id in run_ids:
+            bundle = bundles.get(run_id)
+            if bundle:
+                merge(agg, run_contribution(bundle))
+        return trim(agg)
+
+    def collect(self, subject: Optional[str] = None, limit: int = 0,
+                sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Aggregate for the insights endpoints: rollups when they cover the requested window."""
+        from ..core.store import STORE
+
+        if self.is_built():
+            if limit <= 0 or limit >= STORE.count_runs(subject):
+                return self.read(f"subject:{subject}" if subject else "all")
+        return self.scan(subject=subject, limit=limit, sections=sections)
+
+    def rebuild(self) -> Dict[str, int]:
+        """Recompute every scope from the stored bundles (backfill / repair)."""
+        from ..core.store import STORE
+
+        old = CACHE.keys(CACHE.ai_key("rollup:*"))
+        for key in old:
+            CACHE.delete(key)
+        # Oldest first, so the capped lists end up holding the newest entries
+        recent = CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, -1)[::-1]
+        applied = 0
+        for i in range(0, len(recent), CACHE.batch_size):
+            chunk = recent[i:i + CACHE.batch_size]
+            bundles = STORE.get_sections_many([r for r, _ in chunk], ["sources", "evidence", "provider_performance"])
+            for run_id, ts in chunk:
+                if run_id in bundles and self.apply(run_id, bundles[run_id], ts=ts):
+                    applied += 1
+        CACHE.set(self.built_key, str(time.time()), ttl=-1)
+        print(f"[ROLLUPS] Rebuilt rollups from {applied} runs")
+        return {"runs": len(recent), "applied": applied, "keys_cleared": len(old)}
+
+    def check(self, subject: Optional[str] = None, max_mismatches: int = 20) -> Dict[str, Any]:
+        """Compare a scope's rollups with the full-scan aggregate."""
+        scope = f"subject:{subject}" if subject else "all"
+        stored, scanned = self.read(scope), self.scan(subject=subject)
+        mismatches = []
+        for table in HASH_TABLES + ZSET_TABLES:
+            for field in sorted(set(stored[table]) | set(scanned[table])):
+                a, b = stored[table].get(field, 0), scanned[table].get(field, 0)
+                if not math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6):
+                    mismatches.append({"table": table, "field": field, "rollup": a, "scan": b})
+        for table in ("cited", "gaps"):
+            a = sorted(json.dumps(e, sort_keys=True) for e in stored[table])
+            b = sorted(json.dumps(e, sort_keys=True) for e in scanned[table])
+            if a != b:
+                mismatches.append({"table": table, "rollup": len(a), "scan": len(b)})
+        return {
+            "scope": scope,
+            "consistent": not mismatches,
+            "mismatch_count": len(mismatches),
+            "mismatches": mismatches[:max_mismatches],
+        }
+
+
+ROLLUPS = Rollups()
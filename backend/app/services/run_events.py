@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+from ..core.cache import CACHE, ASYNC_CACHE
+
+
+EVENTS_TTL = 3600
+TERMINAL_EVENTS = {"done", "failed"}
+IDLE_ERROR = "run stopped reporting progress"
+
+
+class RunEventChannel:
+    """
+    Per-run progress events for GET /api/runs/{run_id}/stream.
+
+    Events are kept in an in-process history (so late subscribers replay
+    everything from the start) and fanned out to subscriber queues. When runs
+    execute in another process (RUN_QUEUE_BACKEND=redis), events are mirrored
+    to a Redis list `events:{run_id}` that subscribers poll instead.
+
+    Finished runs are dropped EVENTS_TTL after their terminal event; runs that
+    never emit one (crashed or cancelled) once idle for RUN_EVENTS_IDLE_TTL
+    seconds, ending any subscribers with a `failed` event.
+    """
+
+    def __init__(self) -> None:
+        self.mirror_to_redis = os.getenv("RUN_QUEUE_BACKEND", "local").strip().lower() == "redis"
+        self.poll_interval = float(os.getenv("RUN_EVENTS_POLL_INTERVAL", "0.25"))
+        self.idle_ttl = float(os.getenv("RUN_EVENTS_IDLE_TTL", str(EVENTS_TTL)))
+        self._history: Dict[str, List[dict]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._last_event_at: Dict[str, float] = {}
+
+    @staticmethod
+    def events_key(run_id: str) -> str:
+        return CACHE.ai_key(f"events:{run_id}")
+
+    def open(self, run_id: str) -> None:
+        """Register a run before it starts so subscribers can attach early."""
+        self._gc()
+        self._history.setdefault(run_id, [])
+        self._subscribers.setdefault(run_id, [])
+        self._last_event_at.setdefault(run_id, time.time())
+
+    def is_local(self, run_id: str) -> bool:
+        return run_id in self._history
+
+    async def publish(self, run_id: str, event: Dict[str, Any]) -> None:
+        self._last_event_at[run_id] = time.time()
+        self.open(run_id)
+        self._history[run_id].append(event)
+        for q in self._subscribers[run_id]:
+            q.put_nowait(event)
+        if event.get("type") in TERMINAL_EVENTS:
+            self._finished_at[run_id] = time.time()
+        if self.mirror_to_redis:
+            try:
+                await ASYNC_CACHE.rpush(self.events_key(run_id), json.dumps(event), EVENTS_TTL)
+            except Exception as e:
+                print(f"[EVENTS] Redis mirror failed for {run_id}: {e}")
+
+    async def subscribe(self, run_id: str) -> AsyncIterator[dict]:
+        """Yield every event of the run (history first) until a terminal event."""
+        if self.mirror_to_redis:
+            # The run may be executing in any worker process
+            async for event in self._subscribe_redis(run_id):
+                yield event
+        else:
+            async for event in self._subscribe_local(run_id):
+                yield event
+
+    async def _subscribe_local(self, run_id: str) -> AsyncIterator[dict]:
+        q: asyncio.Queue = asyncio.Queue()
+        history = list(self._history[run_id])
+        self._subscribers[run_id].append(q)
+        try:
+            for event in history:
+                yield event
+                if event.get("type") in TERMINAL_EVENTS:
+                    return
+            while True:
+                event = await q.get()
+                yield event
+                if event.get("type") in TERMINAL_EVENTS:
+                    return
+        finally:
+            subs = self._subscribers.get(run_id)
+            if subs and q in subs:
+                subs.remove(q)
+
+    async def _subscribe_redis(self, run_id: str) -> AsyncIterator[dict]:
+        from .run_jobs import get_job_async
+
+        offset = 0
+        while True:
+            items = await ASYNC_CACHE.lrange(self.events_key(run_id), offset, -1)
+            for raw in items:
+                offset += 1
+                event = json.loads(raw)
+                yield event
+                if event.get("type") in TERMINAL_EVENTS:
+                    return
+            if not items:
+                # Events expired or never mirrored: stop once the job itself is finished
+                job = await get_job_async(run_id)
+                status = (job or {}).get("status")
+                if not job or status in TERMINAL_EVENTS:
+                    yield {"type": status or "failed", "run_id": run_id, **({"error": job.get("error")} if job and job.get("error") else {})}
+                    return
+            await asyncio.sleep(self.poll_interval)
+
+    async def follow_job(self, run_id: str) -> AsyncIterator[dict]:
+        """Stage changes of a run executing in another worker, polled from its job
+        record (used when there is no shared event channel; no partial results)."""
+        from .run_jobs import get_job_async
+        from ..core.store import STORE
+
+        last_status = None
+        while True:
+            job = await get_job_async(run_id)
+            if not job:
+                # Job record expired: the stored run tells whether it finished
+                stored = await STORE.run_exists_async(run_id)
+                yield {"type": "done" if stored else "failed", "run_id": run_id}
+                return
+            status = job.get("status")
+            if status in TERMINAL_EVENTS:
+                yield {"type": status, "run_id": run_id, **({"error": job["error"]} if job.get("error") else {})}
+                return
+            if status != last_status:
+                last_status = status
+                yield {"type": "stage", "stage": status}
+            await asyncio.sleep(self.poll_interval)
+
+    def _gc(self) -> None:
+        # Drop finished runs after EVENTS_TTL so history doesn't grow unbounded
+        now = time.time()
+        for run_id, ts in list(self._finished_at.items()):
+            if ts < now - EVENTS_TTL and not self._subscribers.get(run_id):
+                self._drop(run_id)
+        # Runs that died without a terminal event
+        for run_id, ts in list(self._last_event_at.items()):
+            if run_id not in self._finished_at and ts < now - self.idle_ttl:
+                for q in self._subscribers.get(run_id) or []:
+                    q.put_nowait({"type": "failed", "run_id": run_id, "error": IDLE_ERROR})
+                self._drop(run_id)
+
+    def _drop(self, run_id: str) -> None:
+        self._history.pop(run_id, None)
+        self._subscribers.pop(run_id, None)
+        self._finished_at.pop(run_id, None)
+        self._last_event_at.pop(run_id, None)
+
+
+RUN_EVENTS = RunEventChannel()
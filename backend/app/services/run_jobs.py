@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..core.cache import CACHE, ASYNC_CACHE
+from .run_pipeline import execute_run
+from .run_events import RUN_EVENTS
+
+
+JOB_TTL = 24 * 3600
+INTERRUPTED = "interrupted: server shut down before the run finished"
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def job_key(run_id: str) -> str:
+    return CACHE.ai_key(f"job:{run_id}")
+
+
+def get_job(run_id: str) -> Optional[Dict[str, Any]]:
+    """Return the status record of a background run, if one exists."""
+    return CACHE.get_json(job_key(run_id))
+
+
+async def get_job_async(run_id: str) -> Optional[Dict[str, Any]]:
+    return await ASYNC_CACHE.get_json(job_key(run_id))
+
+
+class RunQueue:
+    """
+    Background execution of search runs.
+
+    POST /api/search/run with `background=true` enqueues a job and returns the
+    reserved run_id immediately; a fixed pool of worker tasks (RUN_WORKERS)
+    drains the queue, so pipeline concurrency is bounded independently of how
+    many HTTP requests uvicorn accepts.
+
+    RUN_QUEUE_BACKEND=local (default) uses an in-process asyncio.Queue.
+    RUN_QUEUE_BACKEND=redis uses a Redis list, so any API process can enqueue
+    and any worker process can execute.
+
+    Status records live in Redis under `job:{run_id}` so every process can
+    answer GET /api/runs/{run_id} while the run is in flight.
+
+    stop() doesn't strand jobs: with the Redis queue, runs interrupted mid-way
+    go back on the queue for another worker; with the local queue, in-flight
+    and still-queued jobs are marked `failed` (they can't outlive the process).
+    """
+
+    def __init__(self) -> None:
+        self.backend = os.getenv("RUN_QUEUE_BACKEND", "local").strip().lower()
+        self.workers = max(1, int(os.getenv("RUN_WORKERS", "4")))
+        self._local: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def queue_key() -> str:
+        return CACHE.ai_key("jobs:queue")
+
+    async def _set_status(self, run_id: str, status: str, **extra: Any) -> None:
+        record = await get_job_async(run_id) or {"run_id": run_id, "stages": {}}
+        record["status"] = status
+        record["updated_at"] = _now_iso()
+        record["stages"][status] = record["updated_at"]
+        record.update(extra)
+        await ASYNC_CACHE.set_json(job_key(run_id), record, ttl=JOB_TTL)
+
+    async def enqueue(self, query: str, subject: Optional[str] = None, filters: Optional[dict] = None) -> str:
+        run_id = str(uuid.uuid4())
+        job = {"run_id": run_id, "query": query, "subject": subject, "filters": filters}
+        RUN_EVENTS.open(run_id)
+        await self._set_status(run_id, "queued", query=query, subject=subject)
+        await RUN_EVENTS.publish(run_id, {"type": "stage", "stage": "queued"})
+
+        if self.backend == "redis":
+            await ASYNC_CACHE.lpush(self.queue_key(), json.dumps(job))
+        else:
+            if self._local is None:
+                raise RuntimeError("Run queue not started")
+            await self._local.put(job)
+        return run_id
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        run_id = job["run_id"]
+        self._in_flight[run_id] = job
+        try:
+            await self._run(job)
+        finally:
+            self._in_flight.pop(run_id, None)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        run_id = job["run_id"]
+
+        async def on_stage(stage: str) -> None:
+            await self._set_status(run_id, stage)
+            await RUN_EVENTS.publish(run_id, {"type": "stage", "stage": stage})
+
+        async def on_event(event: dict) -> None:
+            await RUN_EVENTS.publish(run_id, event)
+
+        try:
+            await execute_run(
+                job["query"], job.get("subject"), job.get("filters"),
+                run_id=run_id, on_stage=on_stage, on_event=on_event,
+            )
+            await RUN_EVENTS.publish(run_id, {"type": "done", "run_id": run_id})
+        except Exception as e:
+            print(f"[JOBS] Run {run_id} failed: {e}")
+            await self._set_status(run_id, "failed", error=str(e))
+            await RUN_EVENTS.publish(run_id, {"type": "failed", "run_id": run_id, "error": str(e)})
+
+    async def _worker(self, idx: int) -> None:
+        while True:
+            if self.backend == "redis":
+                try:
+                    raw = await ASYNC_CACHE.brpop(self.queue_key(), 1)
+                except Exception as e:
+                    print(f"[JOBS] Queue read failed: {e}")
+                    await asyncio.sleep(1)
+                    continue
+                if not raw:
+                    continue
+                job = json.loads(raw)
+            else:
+                job = await self._local.get()
+            await self._execute(job)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        if self.backend != "redis":
+            self._local = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        print(f"[JOBS] Started {self.workers} run workers ({self.backend} queue)")
+
+    async def stop(self) -> None:
+        # Taken before cancelling: cancelled runs drop out of _in_flight
+        unfinished = list(self._in_flight.values())
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._local is not None:
+            while not self._local.empty():
+                unfinished.append(self._local.get_nowait())
+            self._local = None
+        for job in unfinished:
+            run_id = job["run_id"]
+            try:
+                if self.backend == "redis":
+                    # Tail of the list is popped next
+                    await self._set_status(run_id, "queued")
+                    await ASYNC_CACHE.rpush(self.queue_key(), json.dumps(job))
+                else:
+                    await self._set_status(run_id, "failed", error=INTERRUPTED)
+                    await RUN_EVENTS.publish(run_id, {"type": "failed", "run_id": run_id, "error": INTERRUPTED})
+            except Exception as e:
+                print(f"[JOBS] Could not release run {run_id} on shutdown: {e}")
+        if unfinished:
+            action = "requeued" if self.backend == "redis" else "marked failed"
+            print(f"[JOBS] Stopped with {len(unfinished)} unfinished runs ({action})")
+
+
+RUN_QUEUE = RunQueue()
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+from ..core.store import STORE
+from .providers.base import ProviderResult
+from .search_pipeline import iter_search, iter_fetch
+from .composer import compose_answer
+from .content_deduplication import deduplicate_sources, analyze_deduplication_stats
+from .snippet_alignment import align_evidence_snippets
+
+
+# Dedicated pool for the blocking parts of a run (OpenAI SDK calls, snippet
+# alignment, Redis writes) so they never stall the server's event loop and
+# don't compete with FastAPI's own threadpool for sync routes.
+_BLOCKING_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("RUN_BLOCKING_WORKERS", "32")),
+    thread_name_prefix="run-blocking",
+)
+
+
+async def _in_executor(fn: Callable[..., Any], *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BLOCKING_EXECUTOR, fn, *args)
+
+
+def _result_summary(r: ProviderResult) -> Dict[str, Any]:
+    return {"title": r.title, "url": r.url, "snippet": r.snippet, "provider": r.provider, "score": r.score}
+
+
+def _doc_summary(doc: dict) -> Dict[str, Any]:
+    # Stream metadata only - full raw_text stays in the persisted bundle
+    return {
+        "url": doc.get("url"),
+        "title": doc.get("title"),
+        "provider": doc.get("provider"),
+        "published_at": doc.get("published_at"),
+        "content_length": doc.get("content_length", 0),
+        "snippet": doc.get("snippet"),
+    }
+
+
+def build_sources(docs: List[dict], run_id: str, now_iso: str) -> List[Dict[str, Any]]:
+    """Turn fetched documents into bundle source records."""
+    sources = []
+    for i, doc in enumerate(docs):
+        parsed = urlparse(doc.get("url") or "")
+        domain = parsed.hostname or ""
+        src_id = f"src_{i+1:02d}_{str(uuid.uuid4())[:8]}"
+        sources.append({
+            "source_id": src_id,
+            "run_id": run_id,
+            "url": doc.get("url"),
+            "canonical_url": doc.get("url"),
+            "domain": domain,
+            "title": doc.get("title") or doc.get("url"),
+            "author": doc.get("author"),
+            "publisher": (domain.split(".")[0].title() if domain else None),
+            "published_at": doc.get("published_at"),
+            "accessed_at": now_iso,
+            "media_type": "web",
+            "geography": "Unknown",
+            "paywall": False,
+            # NO HARDCODED CREDIBILITY - TRUE citation selector handles this
+            "credibility": {
+                "score": 0.5,  # Neutral - let passage scoring decide
+                "band": "N/A",
+                "rationale": "Content-based scoring in citation selector"
+            },
+            "content_hash": None,
+            "word_count": len((doc.get("raw_text") or "").split()) if doc.get("raw_text") else 0,
+            "raw_text": doc.get("raw_text") or "",
+            "search_provider": doc.get("search_provider", "unknown"),
+            # Reproducibility: extraction method used
+            "extraction_method": doc.get("extraction_method", "trafilatura+readability"),
+            "extraction_confidence": doc.get("extraction_confidence", 0.8),
+            # Multi-provider consensus metadata (if available)
+            "discovered_by": doc.get("discovered_by", [doc.get("search_provider", "unknown")]),
+            "provider_scores": doc.get("provider_scores", {doc.get("search_provider", "unknown"): 0.5}),
+            "consensus_boost": doc.get("consensus_boost", 0.0),
+        })
+
+    # Apply content deduplication to remove similar/identical content
+    original_source_count = len(sources)
+    sources = deduplicate_sources(sources)
+    analyze_deduplication_stats(sources, sources)  # For logging
+
+    if original_source_count != len(sources):
+        print(f"[DEDUP] Removed {original_source_count - len(sources)} duplicate sources")
+    return sources
+
+
+def build_claims_and_evidence(run_id: str, sentences: List[dict]) -> tuple[List[dict], List[dict]]:
+    """Turn composed answer sentences into claim and (unaligned) evidence records."""
+    claims = []
+    evidence = []
+    for idx, sent in enumerate(sentences):
+        claim_id = f"c{idx+1}_{str(uuid.uuid4())[:8]}"
+        claims.append({
+            "claim_id": claim_id,
+            "run_id": run_id,
+            "text": sent.get("text") or "",
+            "importance": 0.7,
+            "answer_sentence_index": idx,
+        })
+        for sid in sent.get("source_ids", []):
+            evidence.append({
+                "claim_id": claim_id,
+                "source_id": sid,
+                "coverage_score": 0.6,
+                "stance": "supports",
+                "snippet": "",  # Will be filled by alignment
+                "start_offset": 0,  # Will be filled by alignment
+                "end_offset": 0,  # Will be filled by alignment
+            })
+    return claims, evidence
+
+
+def empty_bundle(query: str, subject: Optional[str], filters: Optional[dict], run_id: Optional[str] = None) -> Dict[str, Any]:
+    """Bundle persisted when no provider returned results - no fake data."""
+    now_iso = datetime.utcnow().isoformat() + "Z"
+    return {
+        "run": {
+            "run_id": run_id or str(uuid.uuid4()),
+            "query": query,
+            "subject": subject or "Executive Search",
+            "created_at": now_iso,
+            "params": filters or {},
+            "timings": {"total_ms": 0},
+            "search_model": "None",
+        },
+        "sources": [],
+        "claims": [],
+        "evidence": [],
+        "classifications": [],
+        "answer": {"text": "No search results found. Try a different query."},
+        "provider_results": [],
+        "fetched_docs": [],
+    }
+
+
+# Pipeline stages reported to `on_stage`, in order
+STAGES = ["searching", "fetching", "composing", "aligning", "done"]
+
+
+async def execute_run(
+    query: str,
+    subject: Optional[str] = None,
+    filters: Optional[dict] = None,
+    *,
+    run_id: Optional[str] = None,
+    on_stage: Optional[Callable[[str], Awaitable[None]]] = None,
+    on_event: Optional[Callable[[dict], Awaitable[None]]] = None,
+) -> str:
+    """
+    Run the full search -> fetch -> compose -> align -> persist pipeline on the
+    caller's event loop and return the persisted run_id.
+
+    `run_id` lets a caller (e.g. the job queue) reserve the id up front;
+    `on_stage` is awaited with each entry of STAGES as the run progresses and
+    `on_event` with partial results (provider results, fetched documents,
+    answer sentences) as soon as each is available.
+    """
+    async def stage(name: str) -> None:
+        if on_stage:
+            await on_stage(name)
+
+    async def emit(event: dict) -> None:
+        if on_event:
+            await on_event(event)
+
+    await stage("searching")
+    results: List[ProviderResult] = []
+    provider_performance: dict = {}
+    async for event in iter_search(query):
+        if event["type"] == "provider_results":
+            await emit({**event, "results": [_result_summary(r) for r in event["results"]]})
+        elif event["type"] == "query_variants":
+            await emit(event)
+        elif event["type"] == "search_done":
+            results = event["results"]
+            provider_performance = event["provider_performance"]
+            await emit({"type": "search_done", "result_count": len(results), "provider_performance": provider_performance})
+
+    if not results:
+        run_id = await _in_executor(STORE.create_run, empty_bundle(query, subject, filters, run_id))
+        await stage("done")
+        return run_id
+
+    # Fetch top pages and build minimal real-only bundle
+    await stage("fetching")
+    docs_by_index = {}
+    fetch_summary: dict = {}
+    async for event in iter_fetch(results):
+        if event["type"] == "document":
+            doc = event["doc"]
+            docs_by_index[event["index"]] = doc
+            await emit({"type": "document", "index": event["index"], **_doc_summary(doc)})
+        elif event["type"] == "fetch_done":
+            fetch_summary = {k: v for k, v in event.items() if k != "type"}
+            await emit(event)
+    # Keep provider ranking order regardless of completion order
+    docs = [docs_by_index[i] for i in sorted(docs_by_index)]
+
+    now_iso = datetime.utcnow().isoformat() + "Z"
+    run_id = run_id or str(uuid.uuid4())
+    sources = await _in_executor(build_sources, docs, run_id, now_iso)
+
+    bundle = {
+        "run": {
+            "run_id": run_id,
+            "query": query,
+            "subject": subject or "Executive Search",
+            "created_at": now_iso,
+            "params": filters or {},
+            "timings": {"total_ms": 0},
+            "search_model": "Multi-Provider",
+            # Reproducibility metadata for research
+            "pipeline_version": os.getenv("PIPELINE_VERSION", "v1.2.0"),
+            "models": {
+                "composer": os.getenv("OPENAI_MODEL_COMPOSER", "gpt-4o-mini"),
+                "search": os.getenv("OPENAI_MODEL_SEARCH", "gpt-4o-mini"),
+                "analysis": os.getenv("OPENAI_MODEL_ANALYSIS", "gpt-4o-mini")
+            },
+            "providers_enabled": [r.provider for r in results],
+            "authority_floor_enabled": os.getenv("AUTHORITY_FLOOR_ENABLED", "true").lower() == "true",
+            "min_authority_sources": int(os.getenv("MIN_AUTHORITY_SOURCES", "2")),
+            # TODO: Add git SHA when available
+            "git_sha": os.getenv("GIT_SHA", "unknown"),
+        },
+        "sources": sources,
+        "claims": [],
+        "evidence": [],
+        "classifications": [],
+        "answer": {"text": ""},
+        "provider_results": [{"title": r.title, "url": r.url, "provider": r.provider} for r in results],
+        "fetched_docs": docs,
+        "fetch_summary": fetch_summary,
+        "provider_performance": provider_performance,
+    }
+
+    if sources:
+        await stage("composing")
+        # The composer streams the completion; sentences are emitted as the
+        # model finishes each one, while the rest is still being generated
+        loop = asyncio.get_running_loop()
+        streamed: asyncio.Queue = asyncio.Queue()
+
+        def on_sentence(sent: dict) -> None:
+            loop.call_soon_threadsafe(streamed.put_nowait, sent)
+
+        compose = asyncio.ensure_future(_in_executor(compose_answer, query, sources, on_sentence))
+        idx = 0
+        while not (compose.done() and streamed.empty()):
+            getter = asyncio.ensure_future(streamed.get())
+            await asyncio.wait({compose, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if not getter.done():
+                getter.cancel()
+                continue
+            sent = getter.result()
+            await emit({"type": "sentence", "index": idx, "text": sent.get("text") or "", "source_ids": sent.get("source_ids", [])})
+            idx += 1
+        composed = compose.result()
+        bundle["answer"]["text"] = composed.get("answer_text") or ""
+        sentences = composed.get("sentences") or []
+        claims, evidence = build_claims_and_evidence(run_id, sentences)
+
+        # Apply snippet alignment to extract actual quoted passages
+        await stage("aligning")
+        evidence = await _in_executor(align_evidence_snippets, claims, sources, evidence)
+
+        bundle["claims"] = claims
+        bundle["evidence"] = evidence
+
+    run_id = await _in_executor(STORE.create_run, bundle)
+    await stage("done")
+    return run_id
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import os
-from typing import List
-import time
-from collections import defaultdict
+import re
+from typing import AsyncIterator, List
 
+from ..core.cache import CACHE, ASYNC_CACHE
+from ..core.circuit_breaker import PROVIDER_BREAKERS, CircuitOpenError
+from ..core.hedge import REQUEST_HEDGER
+from ..core.rate_limit import RATE_LIMITER
 from .providers.base import ProviderResult
+from .provider_cache import PROVIDER_CACHE
 from .fetch_parse import fetch_and_parse
 from .providers.tavily_provider import TavilySearchProvider
 from .providers.openai_provider import OpenAISearchProvider
@@ -21,14 +26,24 @@ async def expand_queries(base_query: str) -> List[str]:
     Generate query variants using LLM for diverse search terms + authority bias.
     Combines AI-generated contextual queries with authority-focused variants.
     """
-    variants = [base_query]  # Always include the original query
-    
     # Generate LLM-based query expansions
     try:
         llm_variants = await generate_llm_query_variants(base_query)
-        variants.extend(llm_variants[:2])  # Add top 2 LLM variants
     except Exception as e:
         print(f"[ERROR] LLM query expansion failed: {e}")
+        llm_variants = []
+    return assemble_query_variants(base_query, llm_variants)
+
+
+def initial_query_variants(base_query: str) -> List[str]:
+    """Variants that do not depend on the LLM and are always in the final set."""
+    return [base_query, f'{base_query} site:.gov OR site:.edu OR site:.org']
+
+
+def assemble_query_variants(base_query: str, llm_variants: List[str]) -> List[str]:
+    """Final variant list: original, top 2 LLM variants, then authority variants (max 4)."""
+    variants = [base_query]  # Always include the original query
+    variants.extend(llm_variants[:2])  # Add top 2 LLM variants
     
     # Add authority-favoring variants as fallback/complement
     authority_variants = [
@@ -37,7 +52,7 @@ async def expand_queries(base_query: str) -> List[str]:
     ]
     
     # MANDATORY: Always include at least one authority-biased variant
-    mandatory_authority = f'{base_query} site:.gov OR site:.edu OR site:.org'
+    mandatory_authority = initial_query_variants(base_query)[1]
     if mandatory_authority not in variants:
         variants.append(mandatory_authority)
     
@@ -50,35 +65,86 @@ async def expand_queries(base_query: str) -> List[str]:
     return variants[:4]  # Limit to 4 total variants to avoid too many API calls
 
 
+_EXPANSION_SYSTEM_PROMPT = (
+    "You are a search query expansion expert. Given a base query, generate 3 diverse, "
+    "contextually relevant alternative search queries that would find different but related information. "
+    "Focus on: 1) Different terminologies, 2) Related concepts, 3) Specific aspects. "
+    "Avoid corporate marketing terms like 'trends', 'best practices', 'top 10'. "
+    "Prefer academic, research-oriented, and authoritative language. "
+    "Return as JSON: {\"variants\": [\"query1\", \"query2\", \"query3\"]}"
+)
+_EXPANSION_USER_PROMPT = "Base query: \"{base_query}\"\n\nGenerate 3 diverse search query variants."
+
+_EXPANSION_STOPWORDS = {
+    "a", "an", "the", "of", "for", "to", "in", "on", "and", "or", "is", "are",
+    "what", "how", "why", "does", "do", "with", "about", "by", "at", "from",
+}
+
+
+def normalize_expansion_query(query: str) -> str:
+    """Case, whitespace, punctuation and stopword-insensitive form used as the cache key."""
+    # Unicode word tokens; trailing + / # kept so "c++", "c#" and "c" stay distinct
+    tokens = re.findall(r"\w+[+#]*", query.casefold())
+    if not tokens:
+        # Nothing word-like (e.g. only symbols): key on the query itself
+        return " ".join(query.split())
+    kept = [t for t in tokens if t not in _EXPANSION_STOPWORDS]
+    return " ".join(kept or tokens)
+
+
+def _expansion_cache_key(base_query: str, model: str) -> str:
+    # Prompt/model changes invalidate old expansions without a flush
+    prompt_hash = hashlib.sha256(
+        f"{model}|{_EXPANSION_SYSTEM_PROMPT}|{_EXPANSION_USER_PROMPT}".encode()
+    ).hexdigest()[:12]
+    qhash = hashlib.sha256(normalize_expansion_query(base_query).encode()).hexdigest()[:32]
+    return CACHE.ai_key(f"expansion:{prompt_hash}:{qhash}")
+
+
+def _clean_variants(base_query: str, variants: List[str]) -> List[str]:
+    cleaned_variants = []
+    for variant in variants[:3]:
+        if isinstance(variant, str) and variant.strip():
+            cleaned = variant.strip()
+            # Skip if too similar to original
+            if cleaned.lower() != base_query.lower():
+                cleaned_variants.append(cleaned)
+    return cleaned_variants
+
+
 async def generate_llm_query_variants(base_query: str) -> List[str]:
     """
     Use OpenAI to generate diverse, contextually relevant query variants.
+
+    Expansions are cached for QUERY_EXPANSION_TTL seconds under the normalized
+    query and a hash of the prompt, so repeat runs and /query-expansion reuse
+    the same variants.
     """
     import asyncio
     import json
     from ..services.search_openai import openai_client
+
+    model = os.getenv("OPENAI_MODEL_SEARCH", "gpt-4o-mini")
+    cache_key = _expansion_cache_key(base_query, model)
+    try:
+        cached = await ASYNC_CACHE.get_json(cache_key)
+        if cached is not None:
+            print(f"[EXPANSION] Cache hit for: {base_query[:50]}...")
+            return _clean_variants(base_query, cached)
+    except Exception as e:
+        print(f"[EXPANSION] Cache read failed: {e}")
     
     def _call_llm() -> List[str]:
         try:
             client = openai_client()
-            model = os.getenv("OPENAI_MODEL_SEARCH", "gpt-4o-mini")
-            
-            system = (
-                "You are a search query expansion expert. Given a base query, generate 3 diverse, "
-                "contextually relevant alternative search queries that would find different but related information. "
-                "Focus on: 1) Different terminologies, 2) Related concepts, 3) Specific aspects. "
-                "Avoid corporate marketing terms like 'trends', 'best practices', 'top 10'. "
-                "Prefer academic, research-oriented, and authoritative language. "
-                "Return as JSON: {\"variants\": [\"query1\", \"query2\", \"query3\"]}"
-            )
             
-            user_prompt = f"Base query: \"{base_query}\"\n\nGenerate 3 diverse search query variants."
+            user_prompt = _EXPANSION_USER_PROMPT.format(base_query=base_query)
             
             resp = client.chat.completions.create(
                 model=model,
                 response_format={"type": "json_object"},
                 messages=[
-                    {"role": "system", "content": system},
+                    {"role": "system", "content": _EXPANSION_SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt},
                 ],
                 temperature=0.7,  # Higher creativity for diverse variants
@@ -90,21 +156,20 @@ async def generate_llm_query_variants(base_query: str) -> List[str]:
             variants = data.get("variants", [])
             
             # Filter and clean variants
-            cleaned_variants = []
-            for variant in variants[:3]:
-                if isinstance(variant, str) and variant.strip():
-                    cleaned = variant.strip()
-                    # Skip if too similar to original
-                    if cleaned.lower() != base_query.lower():
-                        cleaned_variants.append(cleaned)
-            
-            return cleaned_variants
+            return _clean_variants(base_query, variants)
             
         except Exception as e:
             print(f"[ERROR] OpenAI query expansion: {e}")
             return []
     
-    return await asyncio.to_thread(_call_llm)
+    variants = await asyncio.to_thread(_call_llm)
+    if variants:
+        try:
+            ttl = int(os.getenv("QUERY_EXPANSION_TTL", str(7 * 24 * 3600)))
+            await ASYNC_CACHE.set_json(cache_key, variants, ttl)
+        except Exception as e:
+            print(f"[EXPANSION] Cache write failed: {e}")
+    return variants
 
 
 async def run_search(query: str, limit_per_query: int | None = None) -> List[ProviderResult]:
@@ -112,6 +177,22 @@ async def run_search(query: str, limit_per_query: int | None = None) -> List[Pro
     Multi-provider search with consensus tracking and weighted deduplication.
     Returns results with cross-provider consensus signals preserved.
     """
+    async for event in iter_search(query, limit_per_query):
+        if event["type"] == "search_done":
+            return (event["results"], event["provider_performance"])
+    return ([], {})
+
+
+async def iter_search(query: str, limit_per_query: int | None = None) -> AsyncIterator[dict]:
+    """
+    Event-stream form of run_search.
+
+    Yields {"type": "provider_results", "provider", "query", "results"} as each
+    provider/variant search completes, {"type": "query_variants", "variants"}
+    once LLM expansion has finished, then a single
+    {"type": "search_done", "results", "provider_performance"} with the
+    consensus-merged results.
+    """
     if limit_per_query is None:
         limit_per_query = int(os.getenv("SEARCH_LIMIT_PER_QUERY", "15"))  # Reduced per provider due to more providers
     
@@ -137,89 +218,144 @@ async def run_search(query: str, limit_per_query: int | None = None) -> List[Pro
     # Return empty if no providers available
     if not providers:
         print("[ERROR] No search providers available")
-        return []
+        yield {"type": "search_done", "results": [], "provider_performance": {}}
+        return
     
     print(f"[INFO] Running multi-provider search with {len(providers)} providers")
-    variants = await expand_queries(query)
-
-    # Rate limiting setup
-    rate_limits = {
-        # "brave": float(os.getenv("RATE_LIMIT_BRAVE", "0.5")),  # Disabled
-        "tavily": float(os.getenv("RATE_LIMIT_TAVILY", "2")),
-        "openai": float(os.getenv("RATE_LIMIT_OPENAI", "2")),
-        "perplexity": float(os.getenv("RATE_LIMIT_PERPLEXITY", "1")),
-        "gemini": float(os.getenv("RATE_LIMIT_GEMINI", "1"))
-    }
-    
-    # Track last request time for each provider
-    last_request_time = defaultdict(float)
-    
-    async def search_one(p, q: str) -> List[ProviderResult]:
-        """Search one provider with one query variant with rate limiting."""
-        # Apply rate limiting
-        provider_name = p.name.lower()
-        rate_limit = rate_limits.get(provider_name, 1.0)
-        min_interval = 1.0 / rate_limit  # Convert to seconds between requests
-        
-        # Calculate delay needed
-        current_time = time.time()
-        time_since_last = current_time - last_request_time[provider_name]
-        delay_needed = max(0, min_interval - time_since_last)
-        
-        if delay_needed > 0:
-            print(f"[RATE_LIMIT] Waiting {delay_needed:.2f}s before {p.name} request...")
-            await asyncio.sleep(delay_needed)
-        
-        # Update last request time
-        last_request_time[provider_name] = time.time()
-        
+
+    outcomes: dict[int, str] = {}
+
+    async def search_one(idx: int, p, q: str) -> tuple[int, List[ProviderResult]]:
+        """Search one provider with one query variant, served from the response cache when possible."""
+        cached = await PROVIDER_CACHE.get(p.name, q, limit_per_query)
+        if cached is not None:
+            results, fresh = cached
+            outcomes[idx] = "cache_hit" if fresh else "cache_stale"
+            if not fresh:
+                # Serve stale now, refresh for the next run
+                PROVIDER_CACHE.revalidate(p.name, q, limit_per_query, lambda: _search_live(p, q, limit_per_query))
+            print(f"[PROVIDER_CACHE] {p.name} {'hit' if fresh else 'stale hit'} ({len(results)} results) for: {q[:50]}...")
+            return idx, results
+
         try:
-            results = await p.search(q, limit=limit_per_query)
+            results = await _search_live(p, q, limit_per_query)
+            outcomes[idx] = "ok"
             print(f"[INFO] {p.name} returned {len(results)} results for: {q[:50]}...")
-            return results
+            await PROVIDER_CACHE.set(p.name, q, limit_per_query, results)
+            return idx, results
+        except CircuitOpenError as e:
+            outcomes[idx] = "short_circuited"
+            print(f"[BREAKER] Skipping {p.name} ({e}) for: {q[:50]}...")
+            return idx, []
+        except asyncio.TimeoutError:
+            outcomes[idx] = "timeout"
+            print(f"[ERROR] {p.name} timed out after {PROVIDER_BREAKERS.get(p.name).timeout():.1f}s for: {q[:50]}...")
+            return idx, []
         except Exception as e:
+            outcomes[idx] = "error"
             print(f"[ERROR] Search failed for {p.name}: {e}")
-            return []
+            return idx, []
 
-    # Execute searches grouped by provider to respect rate limits better
-    tasks = []
+    # The original query and the deterministic authority variant go out immediately;
+    # LLM variants join the fan-out once generated, off the critical path
+    expansion = asyncio.ensure_future(generate_llm_query_variants(query))
+    variants = initial_query_variants(query)
+    tasks: dict[asyncio.Future, int] = {}
     provider_query_pairs = []
-    
-    # Group by provider to ensure rate limiting works properly
-    for p in providers:
-        # Create tasks for this provider sequentially to respect rate limits
-        provider_tasks = []
-        for q in variants:
-            task = search_one(p, q)
-            provider_tasks.append(task)
-            provider_query_pairs.append((p.name, q))
-        
-        # Add all tasks for this provider
-        tasks.extend(provider_tasks)
-    
-    results_lists = await asyncio.gather(*tasks)
-    all_results: List[ProviderResult] = [r for lst in results_lists for r in lst]
+
+    def dispatch(queries: List[str]) -> List[asyncio.Future]:
+        # Group by provider to ensure rate limiting works properly
+        new_tasks = []
+        for p in providers:
+            for q in queries:
+                task = asyncio.ensure_future(search_one(len(provider_query_pairs), p, q))
+                tasks[task] = len(provider_query_pairs)
+                provider_query_pairs.append((p.name, q))
+                new_tasks.append(task)
+        return new_tasks
+
+    pending = set(dispatch(variants)) | {expansion}
+
+    # Stream each provider/variant result as it lands
+    results_lists: dict[int, List[ProviderResult]] = {}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                if fut is expansion:
+                    try:
+                        llm_variants = fut.result()
+                    except Exception as e:
+                        print(f"[ERROR] LLM query expansion failed: {e}")
+                        llm_variants = []
+                    variants = assemble_query_variants(query, llm_variants)
+                    dispatched = {pq for _, pq in provider_query_pairs}
+                    late = [q for q in variants if q not in dispatched]
+                    pending |= set(dispatch(late))
+                    print(f"[INFO] Query expansion added {len(late)} variants to the search fan-out")
+                    yield {"type": "query_variants", "variants": variants}
+                    continue
+                idx, results_list = fut.result()
+                results_lists[idx] = results_list
+                provider_name, q = provider_query_pairs[idx]
+                yield {"type": "provider_results", "provider": provider_name, "query": q, "results": results_list}
+    finally:
+        for t in list(tasks) + [expansion]:
+            t.cancel()
+
+    # Merge in provider, then variant order regardless of dispatch/completion order
+    provider_rank = {p.name: i for i, p in enumerate(providers)}
+    variant_rank = {q: i for i, q in enumerate(variants)}
+    order = sorted(
+        range(len(provider_query_pairs)),
+        key=lambda i: (provider_rank[provider_query_pairs[i][0]], variant_rank.get(provider_query_pairs[i][1], len(variant_rank))),
+    )
+    all_results: List[ProviderResult] = [r for i in order for r in results_lists.get(i, [])]
     
     # Track provider performance and zero-result cases for debugging
     provider_performance = {}
-    for (provider_name, query), results_list in zip(provider_query_pairs, results_lists):
+    for idx in order:
+        (provider_name, query), results_list = provider_query_pairs[idx], results_lists.get(idx, [])
         if provider_name not in provider_performance:
             provider_performance[provider_name] = {
                 "queries_attempted": 0,
                 "queries_with_results": 0,
                 "total_results": 0,
-                "zero_result_queries": []
+                "zero_result_queries": [],
+                "errors": 0,
+                "timeouts": 0,
+                "short_circuited": 0,
+                "cache_hits": 0,
+                "cache_stale_hits": 0,
             }
         
         stats = provider_performance[provider_name]
         stats["queries_attempted"] += 1
         stats["total_results"] += len(results_list)
+        outcome = outcomes.get(idx)
+        if outcome == "error":
+            stats["errors"] += 1
+        elif outcome == "timeout":
+            stats["timeouts"] += 1
+        elif outcome == "short_circuited":
+            stats["short_circuited"] += 1
+        elif outcome == "cache_hit":
+            stats["cache_hits"] += 1
+        elif outcome == "cache_stale":
+            stats["cache_stale_hits"] += 1
         
         if len(results_list) == 0:
             stats["zero_result_queries"].append(query[:50] + "..." if len(query) > 50 else query)
         else:
             stats["queries_with_results"] += 1
     
+    # Breaker state as of the end of this run's search stage
+    hedging = REQUEST_HEDGER.snapshot()["stats"]
+    for provider_name, stats in provider_performance.items():
+        stats["circuit_breaker"] = PROVIDER_BREAKERS.get(provider_name).snapshot()
+        if provider_name in hedging:
+            stats["hedging"] = hedging[provider_name]
+
     print(f"[INFO] Collected {len(all_results)} total results before consensus merging")
     
     # Log provider performance for debugging
@@ -265,45 +401,134 @@ async def run_search(query: str, limit_per_query: int | None = None) -> List[Pro
     }
     print(f"[RESEARCH] Consensus stats: {consensus_stats}")
     
-    # Return results with provider performance as a tuple
-    return (final_results, provider_performance)
+    yield {"type": "search_done", "results": final_results, "provider_performance": provider_performance}
+
+
+async def _search_live(p, q: str, limit: int) -> List[ProviderResult]:
+    """Query a provider through its circuit breaker, rate limiter and hedger."""
+    # Skip providers whose circuit breaker is open (before spending a rate-limit token)
+    breaker = PROVIDER_BREAKERS.get(p.name)
+    admission = breaker.allow()
+    if admission is None:
+        raise CircuitOpenError(f"circuit {breaker.state}")
+
+    # Shared per-provider token bucket (configured from RATE_LIMIT_* env vars)
+    try:
+        waited = await RATE_LIMITER.acquire(p.name)
+    except BaseException:
+        # Cancelled (straggler) or failed before calling: free a half-open probe slot
+        breaker.release(admission)
+        raise
+    if waited > 0:
+        print(f"[RATE_LIMIT] Waited {waited:.2f}s before {p.name} request...")
+
+    # Slow LLM-backed providers may get a hedge request after their observed p90
+    return await breaker.call(REQUEST_HEDGER.run(p.name, lambda: p.search(q, limit=limit)), admission)
 
 
 async def fetch_top(results: List[ProviderResult], *, max_docs: int | None = None) -> List[dict]:
+    docs_by_index = {}
+    async for event in iter_fetch(results, max_docs=max_docs):
+        if event["type"] == "document":
+            docs_by_index[event["index"]] = event["doc"]
+    # Keep provider ranking order regardless of completion order
+    return [docs_by_index[i] for i in sorted(docs_by_index)]
+
+
+async def iter_fetch(results: List[ProviderResult], *, max_docs: int | None = None) -> AsyncIterator[dict]:
+    """
+    Event-stream form of fetch_top: yields {"type": "document", "index", "doc"}
+    for each page as soon as it is fetched and parsed (index = rank in results),
+    then one {"type": "fetch_done", ...} summary.
+
+    Fetches race against a run-wide deadline (FETCH_DEADLINE_S) and stop early
+    once FETCH_ENOUGH_DOCS good documents (>= FETCH_GOOD_MIN_CHARS of extracted
+    text) are in; stragglers are cancelled and reported as abandoned.
+    """
     if max_docs is None:
         max_docs = int(os.getenv("FETCH_MAX_DOCS", "20"))
+    deadline_s = float(os.getenv("FETCH_DEADLINE_S", "8"))
+    enough_docs = int(os.getenv("FETCH_ENOUGH_DOCS", "12"))
+    good_min_chars = int(os.getenv("FETCH_GOOD_MIN_CHARS", "500"))
     
     # NO PRE-FILTERING - let TRUE citation selector decide based on content
     # reranked_results = await rerank_by_authority(results)  # REMOVED - was biasing toward .gov/.edu
     
-    tasks = [fetch_and_parse(r.url) for r in results[:max_docs]]
-    parsed = await asyncio.gather(*tasks)
-    docs = []
-    for r, p in zip(results[:max_docs], parsed):
-        if not p:
-            continue
-        docs.append({
-            "title": p.get("title") or r.title,  # Prefer extracted title over provider title
-            "url": r.url,
-            "snippet": r.snippet,
-            "published_at": p.get("published_at") or r.published_at,  # Prefer extracted date
-            "provider": r.provider,  # Track which search provider found this source
-            "raw_text": p["text"],
-            "author": p.get("author", ""),
-            "extraction_method": p.get("extraction_method", "unknown"),
-            "content_length": p.get("content_length", 0),
-            "search_provider": r.provider,  # Explicit field for provider attribution analysis
-            # NO HARDCODED CREDIBILITY - let TRUE citation selector decide
-            # "credibility_score": REMOVED
-            # "credibility_band": REMOVED
-            # "credibility_category": REMOVED
-            # "credibility_factors": REMOVED
-            # Preserve consensus data
-            "discovered_by": r.discovered_by,
-            "provider_scores": r.provider_scores,
-            "consensus_boost": r.consensus_boost,
-        })
-    return docs
+    selected = results[:max_docs]
+    tasks = {asyncio.ensure_future(fetch_and_parse(r.url)): i for i, r in enumerate(selected)}
+    pending = set(tasks)
+    failed: List[str] = []
+    good_docs = 0
+    cache_tiers = {"parsed": 0, "html": 0, "network": 0}
+    stop_reason = None
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    try:
+        while pending:
+            timeout = None
+            if deadline_s > 0:
+                timeout = start + deadline_s - loop.time()
+                if timeout <= 0:
+                    stop_reason = "deadline"
+                    break
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for fut in sorted(done, key=tasks.get):
+                idx = tasks[fut]
+                r = selected[idx]
+                p = fut.result() if fut.exception() is None else None
+                if not p:
+                    failed.append(r.url)
+                    continue
+                tier = p.get("cache_tier")
+                if tier in cache_tiers:
+                    cache_tiers[tier] += 1
+                if p.get("content_length", 0) >= good_min_chars and not p.get("extraction_method", "").endswith("fallback"):
+                    good_docs += 1
+                yield {"type": "document", "index": idx, "doc": _doc_from_parsed(r, p)}
+            if enough_docs > 0 and good_docs >= enough_docs and pending:
+                stop_reason = "enough_docs"
+                break
+    finally:
+        for t in pending:
+            t.cancel()
+
+    abandoned = [{"url": selected[tasks[t]].url, "reason": stop_reason or "cancelled"} for t in sorted(pending, key=tasks.get)]
+    if abandoned:
+        print(f"[FETCH] Abandoned {len(abandoned)} slow fetches ({stop_reason})")
+    yield {
+        "type": "fetch_done",
+        "attempted": len(selected),
+        "good_docs": good_docs,
+        "failed_urls": failed,
+        "cache_tiers": cache_tiers,
+        "abandoned": abandoned,
+        "stop_reason": stop_reason,
+        "elapsed_ms": round((loop.time() - start) * 1000),
+    }
+
+
+def _doc_from_parsed(r: ProviderResult, p: dict) -> dict:
+    return {
+        "title": p.get("title") or r.title,  # Prefer extracted title over provider title
+        "url": r.url,
+        "snippet": r.snippet,
+        "published_at": p.get("published_at") or r.published_at,  # Prefer extracted date
+        "provider": r.provider,  # Track which search provider found this source
+        "raw_text": p["text"],
+        "author": p.get("author", ""),
+        "extraction_method": p.get("extraction_method", "unknown"),
+        "content_length": p.get("content_length", 0),
+        "search_provider": r.provider,  # Explicit field for provider attribution analysis
+        # NO HARDCODED CREDIBILITY - let TRUE citation selector decide
+        # "credibility_score": REMOVED
+        # "credibility_band": REMOVED
+        # "credibility_category": REMOVED
+        # "credibility_factors": REMOVED
+        # Preserve consensus data
+        "discovered_by": r.discovered_by,
+        "provider_scores": r.provider_scores,
+        "consensus_boost": r.consensus_boost,
+    }
 
 
 async def rerank_by_authority(results: List[ProviderResult]) -> List[ProviderResult]:
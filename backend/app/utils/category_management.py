@@ -2,16 +2,12 @@
 Utility for managing and extending source categories.
 """
 from typing import Dict, List, Set
-from ..core.cache import CACHE
+from ..core.store import STORE
 
 def get_all_domains_from_runs() -> Dict[str, int]:
     """Get all unique domains from stored runs to help identify new categories."""
-    all_keys = CACHE.keys(f"{CACHE.ai_prefix()}:*")
-    run_keys = [k for k in all_keys if not any(skip in k for skip in [":analysis:", ":recent", ":reports", ":q:", ":query_hash:"])]
-    
     domains = {}
-    for key in run_keys:
-        bundle = CACHE.get_json(key)
+    for _, bundle in STORE.iter_registered(["sources"]):
         if bundle and "sources" in bundle:
             for source in bundle["sources"]:
                 domain = source.get("domain", "").lower()
@@ -22,12 +18,8 @@ def get_all_domains_from_runs() -> Dict[str, int]:
 
 def analyze_uncategorized_sources() -> List[Dict]:
     """Find sources that might need new categories (currently categorized as 'web')."""
-    all_keys = CACHE.keys(f"{CACHE.ai_prefix()}:*")
-    run_keys = [k for k in all_keys if not any(skip in k for skip in [":analysis:", ":recent", ":reports", ":q:", ":query_hash:"])]
-    
     uncategorized = []
-    for key in run_keys:
-        bundle = CACHE.get_json(key)
+    for _, bundle in STORE.iter_registered(["sources"]):
         if bundle and "sources" in bundle:
             for source in bundle["sources"]:
                 if source.get("category") == "web":
@@ -42,14 +34,10 @@ def analyze_uncategorized_sources() -> List[Dict]:
 
 def get_category_distribution() -> Dict[str, Dict]:
     """Get detailed category distribution across all runs."""
-    all_keys = CACHE.keys(f"{CACHE.ai_prefix()}:*")
-    run_keys = [k for k in all_keys if not any(skip in k for skip in [":analysis:", ":recent", ":reports", ":q:", ":query_hash:"])]
-    
     categories = {}
     total_sources = 0
     
-    for key in run_keys:
-        bundle = CACHE.get_json(key)
+    for _, bundle in STORE.iter_registered(["sources"]):
         if bundle and "sources" in bundle:
             for source in bundle["sources"]:
                 category = source.get("category", "unknown")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent cache lookups from coroutines.
+
+Issues --lookups GETs for cached-page keys (cache:content:*) in the configured
+Redis (REDIS_URL) from asyncio.gather, the way fetch_top's fetches look up
+the raw HTML cache, three ways: the blocking Cache.get called on the event
+loop, Cache.get offloaded with asyncio.to_thread, and ASYNC_CACHE.get on the
+redis.asyncio pool. Reports wall time for each. Read-only.
+
+Usage (from backend/):
+    python benchmarks/bench_async_cache.py --lookups 200
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import CACHE, ASYNC_CACHE
+
+
+async def run(keys) -> None:
+    async def blocking(key):
+        return CACHE.get(key)
+
+    async def offloaded(key):
+        return await asyncio.to_thread(CACHE.get, key)
+
+    for label, lookup in (("blocking", blocking), ("to_thread", offloaded), ("async pool", ASYNC_CACHE.get)):
+        start = time.perf_counter()
+        found = sum(1 for v in await asyncio.gather(*[lookup(k) for k in keys]) if v)
+        print(f"{label:>11}: {time.perf_counter() - start:7.3f}s ({found} hits)")
+    await ASYNC_CACHE.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    keys = CACHE.keys("cache:content:*")[:args.lookups]
+    if not keys:
+        raise SystemExit("No cached pages (cache:content:*) to look up")
+    print(f"{len(keys)} concurrent lookups")
+    asyncio.run(run(keys))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-run reads vs batched reads for the insights endpoints.
+
+Loads the sections insights_aggregate needs (run, sources, evidence) for the
+most recent runs in the configured Redis (REDIS_URL), first one run per
+round-trip via Store.get_sections and then batched via
+Store.get_sections_many, and reports wall time for each. Read-only.
+
+Usage (from backend/):
+    python benchmarks/bench_batch_reads.py --runs 1000 --batch-sizes 50,200,500
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import CACHE
+from app.core.store import STORE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1000, help="most recent runs to read")
+    parser.add_argument("--sections", default="sources,evidence")
+    parser.add_argument("--batch-sizes", default="50,200,500")
+    args = parser.parse_args()
+
+    run_ids = [m for m, _ in CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, args.runs - 1)]
+    if not run_ids:
+        raise SystemExit("No runs in the recent index")
+    sections = [s.strip() for s in args.sections.split(",") if s.strip()]
+    print(f"{len(run_ids)} runs, sections={sections}")
+
+    start = time.perf_counter()
+    found = sum(1 for r in run_ids if STORE.get_sections(r, sections))
+    print(f"{'sequential':>14}: {time.perf_counter() - start:7.3f}s ({found} runs)")
+
+    for size in [int(b) for b in args.batch_sizes.split(",")]:
+        CACHE.batch_size = size
+        start = time.perf_counter()
+        found = len(STORE.get_sections_many(run_ids, sections))
+        print(f"{f'batched x{size}':>14}: {time.perf_counter() - start:7.3f}s ({found} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a run dashboard view with and without the in-process bundle cache.
+
+For each of the most recent runs in the configured Redis (REDIS_URL), makes
+the Store reads behind the per-run dashboard endpoints (run, sources, claims,
+evidence, trace, providers, snippets, consensus) --views times, first with
+BUNDLE_CACHE disabled and then enabled, and reports wall time per view and the
+cache's hit rate. Read-only.
+
+Usage (from backend/):
+    python benchmarks/bench_bundle_l1.py --runs 50 --views 5
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import CACHE, BUNDLE_CACHE
+from app.core.store import STORE
+
+DASHBOARD_READS = [
+    ("section", ["run"]),
+    ("section", ["sources"]),
+    ("section", ["claims"]),
+    ("section", ["evidence"]),
+    ("run", None),
+    ("section", ["provider_performance"]),
+    ("section", ["evidence", "claims", "sources"]),
+    ("section", ["sources", "provider_results"]),
+]
+
+
+def view(run_id: str) -> None:
+    for kind, sections in DASHBOARD_READS:
+        if kind == "run":
+            STORE.get_run(run_id, hydrate_text=False)
+        else:
+            STORE.get_sections(run_id, sections)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50, help="most recent runs to view")
+    parser.add_argument("--views", type=int, default=5, help="dashboard views per run")
+    args = parser.parse_args()
+
+    run_ids = [m for m, _ in CACHE.zrevrange_withscores(CACHE.ai_key("recent"), 0, args.runs - 1)]
+    if not run_ids:
+        raise SystemExit("No runs in the recent index")
+    views = len(run_ids) * args.views
+    print(f"{len(run_ids)} runs x {args.views} views, {len(DASHBOARD_READS)} reads per view")
+
+    max_bytes = BUNDLE_CACHE.max_bytes or 64 * 1024 * 1024
+    for label, size in (("no L1", 0), ("L1", max_bytes)):
+        BUNDLE_CACHE.max_bytes = size
+        BUNDLE_CACHE.clear()
+        start = time.perf_counter()
+        for _ in range(args.views):
+            for run_id in run_ids:
+                view(run_id)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>6}: {elapsed / views * 1000:7.2f} ms/view")
+    print(f"L1 stats: {BUNDLE_CACHE.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent-run throughput of one worker with stubbed providers.
+
+Compares the legacy request path (sync handler in Starlette's threadpool,
+nested `asyncio.run` per stage, blocking compose/persist) against the async
+`execute_run` pipeline. Providers, page fetches, the composer LLM call and
+persistence are replaced by stubs with fixed latencies so the numbers reflect
+scheduling, not the network.
+
+Requires the same Redis as the app (the cache is connected on import).
+
+Usage (from backend/):
+    python benchmarks/bench_concurrent_runs.py --runs 200 --concurrency 100
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio
+
+from app.services import run_pipeline
+from app.services.providers.base import ProviderResult
+
+SEARCH_S = 0.6    # provider fan-out
+FETCH_S = 0.4     # page fetches
+COMPOSE_S = 0.8   # blocking OpenAI call
+PERSIST_S = 0.01  # blocking Redis write
+
+
+async def stub_run_search(query: str):
+    await asyncio.sleep(SEARCH_S)
+    results = [ProviderResult(title=f"r{i}", url=f"https://example.com/{i}", provider="stub") for i in range(5)]
+    return results, {"stub": {"queries_attempted": 4, "queries_with_results": 4, "total_results": 5, "zero_result_queries": []}}
+
+
+async def stub_fetch_top(results):
+    await asyncio.sleep(FETCH_S)
+    return [{"url": r.url, "title": r.title, "raw_text": "lorem ipsum " * 50, "search_provider": "stub"} for r in results]
+
+
+async def stub_iter_search(query: str, limit_per_query=None):
+    results, provider_performance = await stub_run_search(query)
+    yield {"type": "search_done", "results": results, "provider_performance": provider_performance}
+
+
+async def stub_iter_fetch(results, *, max_docs=None):
+    docs = await stub_fetch_top(results)
+    for i, doc in enumerate(docs):
+        yield {"type": "document", "index": i, "doc": doc}
+    yield {"type": "fetch_done", "attempted": len(results), "good_docs": len(docs), "failed_urls": [],
+           "cache_tiers": {}, "abandoned": [], "stop_reason": None, "elapsed_ms": round(FETCH_S * 1000)}
+
+
+def stub_compose_answer(query, sources, on_sentence=None):
+    time.sleep(COMPOSE_S)
+    return {"answer_text": "stub", "sentences": [{"text": "stub", "source_ids": [sources[0]["source_id"]]}]}
+
+
+class StubStore:
+    def create_run(self, bundle):
+        time.sleep(PERSIST_S)
+        return bundle["run"]["run_id"]
+
+
+def legacy_handler(query: str) -> str:
+    """Mirror of the old sync create_run: two event loops per request plus blocking calls."""
+    results, _ = asyncio.run(stub_run_search(query))
+    docs = asyncio.run(stub_fetch_top(results))
+    sources = run_pipeline.build_sources(docs, "legacy", "now")
+    stub_compose_answer(query, sources)
+    return StubStore().create_run({"run": {"run_id": "legacy"}})
+
+
+async def drive(mode: str, runs: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with sem:
+            if mode == "legacy":
+                await anyio.to_thread.run_sync(legacy_handler, f"query {i}")
+            else:
+                await run_pipeline.execute_run(f"query {i}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    run_pipeline.iter_search = stub_iter_search
+    run_pipeline.iter_fetch = stub_iter_fetch
+    run_pipeline.compose_answer = stub_compose_answer
+    run_pipeline.STORE = StubStore()
+
+    floor = SEARCH_S + FETCH_S + COMPOSE_S + PERSIST_S
+    print(f"single-run floor: {floor:.2f}s, runs={args.runs}, concurrency={args.concurrency}")
+    for mode in ("legacy", "async"):
+        elapsed = anyio.run(drive, mode, args.runs, args.concurrency)
+        print(f"{mode:>7}: {elapsed:.2f}s total, {args.runs / elapsed:.1f} runs/s per worker")
+
+
+if __name__ == "__main__":
+    main()
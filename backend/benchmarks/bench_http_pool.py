@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-call httpx.AsyncClient vs the shared HTTP_CLIENTS pool.
+
+Spins up a local stub HTTP/1.1 server that counts accepted connections
+(one connection == one TCP+TLS handshake in production) and simulates the
+handshake cost with a per-connection setup delay. Each simulated run issues
+the same request mix as a real pipeline run: 16 provider POSTs (4 providers x
+4 query variants) followed by 20 page GETs.
+
+Usage (from backend/):
+    python benchmarks/bench_http_pool.py --runs 30 --handshake-ms 40
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.core.http import HttpClients
+
+PROVIDERS = ["tavily", "openai", "perplexity", "gemini"]
+VARIANTS = 4
+PAGES = 20
+
+
+class StubServer:
+    def __init__(self, handshake_ms: float, latency_ms: float) -> None:
+        self.handshake_s = handshake_ms / 1000.0
+        self.latency_s = latency_ms / 1000.0
+        self.connections = 0
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        await asyncio.sleep(self.handshake_s)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                await asyncio.sleep(self.latency_s)
+                body = b'{"results": []}'
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> int:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def one_run(base: str, get_client) -> float:
+    start = time.perf_counter()
+
+    async def provider_call(name: str, q: int) -> None:
+        async with get_client(name) as client:
+            await client.post(f"{base}/{name}/search", json={"query": f"q{q}"})
+
+    async def page_fetch(i: int) -> None:
+        async with get_client("fetch") as client:
+            await client.get(f"{base}/page/{i}")
+
+    await asyncio.gather(*(provider_call(p, q) for p in PROVIDERS for q in range(VARIANTS)))
+    await asyncio.gather(*(page_fetch(i) for i in range(PAGES)))
+    return (time.perf_counter() - start) * 1000.0
+
+
+class _PerCall:
+    """Old behaviour: a brand-new AsyncClient (and connection) per request."""
+
+    def __call__(self, name: str):
+        return httpx.AsyncClient(timeout=30.0)
+
+
+class _Pooled:
+    """New behaviour: borrow the shared pooled client for this name."""
+
+    def __init__(self) -> None:
+        self.registry = HttpClients()
+
+    def __call__(self, name: str):
+        registry = self.registry
+
+        class _Borrow:
+            async def __aenter__(self_inner):
+                return registry.get(name)
+
+            async def __aexit__(self_inner, *exc):
+                return False
+
+        return _Borrow()
+
+
+async def bench(mode: str, runs: int, handshake_ms: float, latency_ms: float) -> dict:
+    server = StubServer(handshake_ms, latency_ms)
+    port = await server.start()
+    base = f"http://127.0.0.1:{port}"
+    get_client = _PerCall() if mode == "per-call" else _Pooled()
+
+    latencies = [await one_run(base, get_client) for _ in range(runs)]
+
+    if isinstance(get_client, _Pooled):
+        await get_client.registry.aclose()
+    await server.stop()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "runs": runs,
+        "handshakes": server.connections,
+        "handshakes_per_run": round(server.connections / runs, 1),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)], 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--handshake-ms", type=float, default=40.0, help="simulated TCP+TLS setup cost")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated server time per request")
+    args = parser.parse_args()
+
+    for mode in ("per-call", "pooled"):
+        r = asyncio.run(bench(mode, args.runs, args.handshake_ms, args.latency_ms))
+        print(
+            f"{r['mode']:>9}: handshakes={r['handshakes']} ({r['handshakes_per_run']}/run)  "
+            f"p50={r['p50_ms']}ms  p95={r['p95_ms']}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
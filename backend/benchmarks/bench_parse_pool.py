@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: HTML extraction throughput vs process-pool size.
+
+Parses a corpus of saved HTML pages with the same trafilatura/readability
+extraction the pipeline uses, once inline on the event loop (the old
+`parse_main_text` behaviour) and then through ParsePool with 1..N worker
+processes. For each mode it reports docs/second and the worst event-loop lag
+seen by a 10 ms ticker coroutine running alongside, i.e. how long other
+requests in the same worker would have been stalled.
+
+Without --corpus a synthetic corpus of article-like pages is generated.
+
+Usage (from backend/):
+    python benchmarks/bench_parse_pool.py --corpus ~/saved_pages --workers 1,2,4,8
+"""
+import os
+import sys
+import glob
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.html_extract import ParsePool, extract_main_text
+
+WORDS = ("policy research data analysis energy climate health education market regulation "
+         "study report evidence population model survey outcome government agency").split()
+
+
+def synthetic_page(rng: random.Random) -> str:
+    paras = []
+    for _ in range(rng.randint(8, 30)):
+        sentence_count = rng.randint(3, 8)
+        sentences = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "." for _ in range(sentence_count)]
+        paras.append(f"<p>{' '.join(sentences)}</p>")
+    nav = "".join(f'<li><a href="/s{i}">Section {i}</a></li>' for i in range(40))
+    return (
+        "<html><head><title>Synthetic article</title>"
+        '<meta name="author" content="Bench Author"><meta name="date" content="2024-03-01"></head>'
+        f"<body><nav><ul>{nav}</ul></nav><article><h1>Synthetic article</h1>{''.join(paras)}</article>"
+        "<footer>Copyright</footer></body></html>"
+    )
+
+
+def load_corpus(path: str, size: int) -> list:
+    if path:
+        files = sorted(glob.glob(os.path.join(os.path.expanduser(path), "**", "*.htm*"), recursive=True))
+        pages = []
+        for f in files[:size]:
+            with open(f, encoding="utf-8", errors="ignore") as fh:
+                pages.append(fh.read())
+        if not pages:
+            raise SystemExit(f"No .html files found under {path}")
+        return pages
+    rng = random.Random(7)
+    return [synthetic_page(rng) for _ in range(size)]
+
+
+async def measure(pages: list, parse) -> tuple:
+    lag = 0.0
+    stop = False
+
+    async def ticker() -> None:
+        nonlocal lag
+        loop = asyncio.get_running_loop()
+        while not stop:
+            t = loop.time()
+            await asyncio.sleep(0.01)
+            lag = max(lag, loop.time() - t - 0.01)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.02)
+    start = time.perf_counter()
+    await asyncio.gather(*(parse(p) for p in pages))
+    elapsed = time.perf_counter() - start
+    stop = True
+    await tick
+    return len(pages) / elapsed, lag
+
+
+async def main_async(args) -> None:
+    pages = load_corpus(args.corpus, args.docs)
+    avg_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"corpus: {len(pages)} pages, avg {avg_kb:.1f} KB, cpu_count={os.cpu_count()}")
+
+    async def inline(html: str) -> dict:
+        return extract_main_text(html)
+
+    rate, lag = await measure(pages, inline)
+    print(f"{'inline (event loop)':>22}: {rate:7.1f} docs/s, max loop lag {lag * 1000:7.1f} ms")
+
+    for n in [int(w) for w in args.workers.split(",")]:
+        pool = ParsePool()
+        pool.workers = n
+        await pool.start()  # warm workers are not part of the measurement
+        rate, lag = await measure(pages, pool.extract)
+        pool.shutdown()
+        print(f"{f'process pool x{n}':>22}: {rate:7.1f} docs/s, max loop lag {lag * 1000:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default="", help="directory of saved .html pages")
+    parser.add_argument("--docs", type=int, default=200, help="max pages to parse")
+    parser.add_argument("--workers", default=",".join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})))
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: run-bundle serialization formats for the Cache layer.
+
+Encodes and decodes run bundles with each CACHE_SERIALIZER format (stdlib
+json, orjson, msgpack) using the same options as Cache.dumps/loads, and
+reports per-bundle encode/decode time and stored size, both raw and after
+the zstd/zlib compression Cache applies to large values.
+
+Without --redis a set of synthetic bundles shaped like real runs (sources
+with metadata and raw_text_ref, claims, evidence, analysis, provider stats)
+is generated; with --redis N the N most recent stored runs are used.
+
+Usage (from backend/):
+    python benchmarks/bench_serializers.py --bundles 50 --sources 60
+    python benchmarks/bench_serializers.py --redis 100
+"""
+import os
+import sys
+import json
+import zlib
+import time
+import random
+import hashlib
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+WORDS = ("policy research data analysis energy climate health education market regulation "
+         "study report evidence population model survey outcome government agency").split()
+DOMAINS = ["nature.com", "who.int", "reuters.com", "arxiv.org", "nytimes.com", "gov.uk", "oecd.org", "bbc.co.uk"]
+PROVIDERS = ["tavily", "brave", "perplexity", "gemini", "openai"]
+
+
+def _text(rng: random.Random, lo: int, hi: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def synthetic_bundle(rng: random.Random, n_sources: int) -> dict:
+    run_id = hashlib.md5(str(rng.random()).encode()).hexdigest()
+    sources = []
+    for i in range(n_sources):
+        domain = rng.choice(DOMAINS)
+        found_by = rng.sample(PROVIDERS, rng.randint(1, 3))
+        sources.append({
+            "source_id": f"s{i}", "url": f"https://{domain}/{_text(rng, 3, 6).replace(' ', '-')}",
+            "domain": domain, "title": _text(rng, 5, 12).capitalize(), "snippet": _text(rng, 25, 50),
+            "published_at": "2024-0%d-1%dT00:00:00" % (rng.randint(1, 9), rng.randint(0, 9)),
+            "author": "Bench Author", "media_type": "news", "category": rng.choice(["academic", "news", "government"]),
+            "search_provider": found_by[0], "discovered_by": found_by,
+            "provider_scores": {p: round(rng.random(), 4) for p in found_by},
+            "score": round(rng.random(), 4), "content_length": rng.randint(800, 20000),
+            "extraction_method": "trafilatura", "raw_text_ref": hashlib.sha256(str(i).encode()).hexdigest(),
+        })
+    claims = [{"claim_id": f"c{i}", "text": _text(rng, 12, 30), "paragraph_index": i // 3} for i in range(n_sources // 3)]
+    evidence = [{
+        "claim_id": rng.choice(claims)["claim_id"] if claims else "c0", "source_id": f"s{rng.randrange(n_sources)}",
+        "quote": _text(rng, 15, 40), "score": round(rng.random(), 4), "start": rng.randint(0, 5000),
+    } for _ in range(n_sources)]
+    return {
+        "run": {"run_id": run_id, "query": _text(rng, 4, 9), "subject": "policy", "created_at": "2024-03-01T12:00:00Z",
+                "search_model": "gpt-4o-mini", "paragraphs": [_text(rng, 60, 120) for _ in range(5)]},
+        "sources": sources, "claims": claims, "evidence": evidence,
+        "answer": {"text": _text(rng, 300, 500)},
+        "provider_results": {p: [{"url": s["url"], "rank": r} for r, s in enumerate(sources[:20])] for p in PROVIDERS},
+        "provider_performance": {p: {"count": rng.randint(5, 20), "avg_content_length": 5000.0,
+                                     "latency_ms": rng.randint(300, 4000), "errors": 0} for p in PROVIDERS},
+        "analysis": {"funnel": {"found": n_sources * 2, "fetched": n_sources, "cited": len(evidence)},
+                     "by_category": {"news": 10, "academic": 5}, "consensus": {str(k): rng.randint(0, 20) for k in range(1, 6)}},
+    }
+
+
+def redis_bundles(n: int) -> list:
+    from app.core.store import STORE
+    runs = STORE.list_runs()
+    bundles = list(runs.values())[:n]
+    if not bundles:
+        raise SystemExit("No runs stored in Redis")
+    return bundles
+
+
+def formats() -> dict:
+    # Same options as Cache.dumps/Cache.loads
+    out = {"json": (lambda v: json.dumps(v).encode("utf-8"), json.loads)}
+    if orjson is not None:
+        out["orjson"] = (lambda v: orjson.dumps(v, option=orjson.OPT_NON_STR_KEYS), orjson.loads)
+    if msgpack is not None:
+        out["msgpack"] = (lambda v: msgpack.packb(v, use_bin_type=True),
+                          lambda b: msgpack.unpackb(b, raw=False, strict_map_key=False))
+    return out
+
+
+def compress(data: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def timed(fn, items: list, repeat: int) -> tuple:
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = [fn(x) for x in items]
+        best = min(best, time.perf_counter() - start)
+    return best / len(items), out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundles", type=int, default=50, help="synthetic bundles to generate")
+    parser.add_argument("--sources", type=int, default=60, help="sources per synthetic bundle")
+    parser.add_argument("--redis", type=int, default=0, help="use the N most recent stored runs instead")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.redis:
+        bundles = redis_bundles(args.redis)
+    else:
+        rng = random.Random(7)
+        bundles = [synthetic_bundle(rng, args.sources) for _ in range(args.bundles)]
+    codec = "zstd-3" if zstandard is not None else "zlib-6"
+    print(f"{len(bundles)} bundles; sizes are mean bytes per bundle, times are best-of-{args.repeat} per bundle")
+    print(f"{'format':>8} {'encode ms':>10} {'decode ms':>10} {'bytes':>10} {f'{codec} bytes':>13}")
+
+    for name, (dumps, loads) in formats().items():
+        enc_s, encoded = timed(dumps, bundles, args.repeat)
+        dec_s, decoded = timed(loads, encoded, args.repeat)
+        assert decoded[0]["run"] == bundles[0]["run"], f"{name} round-trip mismatch"
+        size = statistics.mean(len(e) for e in encoded)
+        csize = statistics.mean(len(compress(e)) for e in encoded)
+        print(f"{name:>8} {enc_s * 1000:10.3f} {dec_s * 1000:10.3f} {size:10.0f} {csize:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
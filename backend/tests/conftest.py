@@ -0,0 +1,102 @@
+"""
+Test setup: every Redis client the app creates talks to one in-process
+fakeredis server, flushed between tests. The patch has to be in place before
+`app` is imported because the cache connects at import time.
+"""
+import os
+import sys
+
+import fakeredis
+import pytest
+import redis
+import redis.asyncio as aioredis
+from fakeredis import aioredis as fake_aioredis
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_SERVER = fakeredis.FakeServer()
+redis.Redis.from_url = classmethod(lambda cls, url, **kw: fakeredis.FakeRedis(server=_SERVER))
+aioredis.Redis.from_url = classmethod(lambda cls, url, **kw: fake_aioredis.FakeRedis(server=_SERVER))
+
+
+@pytest.fixture(autouse=True)
+def fresh_redis():
+    from app.core.cache import CACHE, BUNDLE_CACHE
+
+    CACHE._redis.flushall()
+    BUNDLE_CACHE.clear()
+    yield
+
+
+@pytest.fixture
+def client():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routers import runs
+
+    app = FastAPI()
+    app.include_router(runs.router, prefix="/api")
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_run():
+    """Store a run created at `created_at` (ISO) and return its bundle."""
+    from app.core.store import STORE
+    from app.services.run_pipeline import empty_bundle
+
+    def _make(run_id: str, created_at: str, subject: str = "Executive Search", cited: int = 1):
+        bundle = empty_bundle(f"query {run_id}", subject, None, run_id)
+        bundle["run"]["created_at"] = created_at
+        bundle["sources"] = [
+            {"source_id": f"s{i}", "url": f"https://example{i}.com/{run_id}", "domain": f"example{i}.com",
+             "search_provider": "tavily"}
+            for i in range(2)
+        ]
+        bundle["evidence"] = [{"source_id": f"s{i % 2}", "snippet": f"e{i}"} for i in range(cited)]
+        STORE.create_run(bundle)
+        return bundle
+
+    return _make
+
+
+STUB_TEXTS = [
+    "Solar capacity in Spain grew by a record amount last year according to the grid operator.",
+    "Wind farms supplied a quarter of German electricity in the first half of the year.",
+]
+
+
+@pytest.fixture
+def stub_pipeline(monkeypatch):
+    """Providers, page fetches and the composer LLM replaced by canned results."""
+    from app.services import run_pipeline
+    from app.services.providers.base import ProviderResult
+
+    calls = {"search": 0, "texts": STUB_TEXTS}
+
+    async def iter_search(query, limit_per_query=None):
+        calls["search"] += 1
+        results = [ProviderResult(title=f"t{i}", url=f"https://site{i}.com/a", provider="tavily") for i in range(2)]
+        yield {"type": "provider_results", "provider": "tavily", "query": query, "results": results}
+        yield {"type": "search_done", "results": results,
+               "provider_performance": {"tavily": {"queries_attempted": 1, "circuit_breaker": {"state": "closed"}}}}
+
+    async def iter_fetch(results, *, max_docs=None):
+        # Completion order differs from rank order
+        for i in reversed(range(len(results))):
+            yield {"type": "document", "index": i,
+                   "doc": {"url": results[i].url, "title": results[i].title, "raw_text": STUB_TEXTS[i],
+                           "search_provider": "tavily"}}
+        yield {"type": "fetch_done", "attempted": len(results), "good_docs": len(results)}
+
+    def compose_answer(query, sources, on_sentence=None):
+        sentences = [{"text": f"Finding {i}.", "source_ids": [s["source_id"]]} for i, s in enumerate(sources)]
+        for sent in sentences:
+            if on_sentence:
+                on_sentence(sent)
+        return {"answer_text": " ".join(s["text"] for s in sentences), "sentences": sentences}
+
+    monkeypatch.setattr(run_pipeline, "iter_search", iter_search)
+    monkeypatch.setattr(run_pipeline, "iter_fetch", iter_fetch)
+    monkeypatch.setattr(run_pipeline, "compose_answer", compose_answer)
+    return calls
@@ -0,0 +1,58 @@
+from app.core.blob_store import BLOBS
+from app.core.cache import CACHE
+from app.core.store import STORE
+
+TEXT = "  Heading\r\n\r\nFirst paragraph, with offsets.\r\n  Indented line.\n\n"
+
+
+def _bundle(run_id, text=TEXT):
+    return {
+        "run": {"run_id": run_id, "query": "q", "created_at": "2024-03-01T00:00:00Z"},
+        "sources": [{"source_id": "s1", "url": "https://a.com", "raw_text": text}],
+        "fetched_docs": [{"url": "https://a.com", "raw_text": text}],
+        "evidence": [{"source_id": "s1", "start": text.index("First"), "end": text.index(" with")}],
+    }
+
+
+def test_text_round_trips_byte_for_byte():
+    STORE.save_bundle("b1", _bundle("b1"))
+    bundle = STORE.get_run("b1")
+    for section in ("sources", "fetched_docs"):
+        assert bundle[section][0]["raw_text"] == TEXT
+    span = bundle["evidence"][0]
+    assert bundle["sources"][0]["raw_text"][span["start"]:span["end"]] == "First paragraph,"
+
+
+def test_identical_text_is_stored_once():
+    STORE.save_bundle("b1", _bundle("b1"))
+    STORE.save_bundle("b2", _bundle("b2"))
+    refs = {
+        item["raw_text_ref"]
+        for run_id in ("b1", "b2")
+        for section in ("sources", "fetched_docs")
+        for item in STORE.get_run(run_id, hydrate_text=False)[section]
+    }
+    assert len(refs) == 1
+    assert CACHE.get(BLOBS.blob_key(refs.pop())) == TEXT
+
+
+def test_whitespace_variants_keep_their_own_text():
+    variant = TEXT.replace("\r\n", "\n").strip()
+    STORE.save_bundle("b1", _bundle("b1"))
+    STORE.save_bundle("b2", _bundle("b2", variant))
+    assert STORE.get_section("b1", "sources", hydrate_text=True)[0]["raw_text"] == TEXT
+    assert STORE.get_section("b2", "sources", hydrate_text=True)[0]["raw_text"] == variant
+
+
+def test_hydrate_leaves_inline_text_and_tolerates_missing_blobs():
+    bundle = {"sources": [{"raw_text": "inline"}, {"raw_text_ref": "0" * 64}], "fetched_docs": []}
+    BLOBS.hydrate(bundle)
+    assert [s["raw_text"] for s in bundle["sources"]] == ["inline", ""]
+
+
+def test_sources_endpoint_hydrates_on_request(client):
+    STORE.save_bundle("b1", _bundle("b1"))
+    with_text = client.get("/api/runs/b1/sources").json()
+    assert with_text[0]["raw_text"] == TEXT
+    refs_only = client.get("/api/runs/b1/sources", params={"include_text": False}).json()
+    assert "raw_text" not in refs_only[0] and refs_only[0]["raw_text_ref"]
@@ -0,0 +1,100 @@
+import json
+import math
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import Cache
+
+
+def _cache(monkeypatch, **env):
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    return Cache()
+
+
+# Serializers (CACHE_SERIALIZER)
+
+@pytest.mark.skipif(cache_module.orjson is None, reason="orjson not installed")
+def test_orjson_reads_stdlib_nan_values(monkeypatch):
+    cache = _cache(monkeypatch, CACHE_SERIALIZER="orjson")
+    cache.set("old", json.dumps({"score": float("nan"), "cap": float("inf")}), ttl=-1)
+    value = cache.get_json("old")
+    assert math.isnan(value["score"]) and value["cap"] == math.inf
+
+
+@pytest.mark.skipif(cache_module.orjson is None, reason="orjson not installed")
+def test_orjson_round_trips_big_ints(monkeypatch):
+    cache = _cache(monkeypatch, CACHE_SERIALIZER="orjson")
+    cache.set_json("big", {"n": 2 ** 70, "xs": [1, 2]}, ttl=-1)
+    value = cache.get_json("big")
+    assert value == {"n": 2 ** 70, "xs": [1, 2]} and isinstance(value["n"], int)
+
+
+def test_json_serializer_reads_with_stdlib(monkeypatch):
+    cache = _cache(monkeypatch, CACHE_SERIALIZER="json")
+    cache.set("old", json.dumps({"n": 2 ** 70}), ttl=-1)
+    assert cache.get_json("old") == {"n": 2 ** 70}
+    assert isinstance(cache.get_json("old")["n"], int)
+
+
+@pytest.mark.parametrize("writer", ["json", "orjson", "msgpack"])
+def test_values_readable_after_serializer_change(monkeypatch, writer):
+    if writer != "json" and getattr(cache_module, writer) is None:
+        pytest.skip(f"{writer} not installed")
+    value = {"run": {"query": "q"}, "scores": [0.5, 1], "text": "é" * 2000}
+    _cache(monkeypatch, CACHE_SERIALIZER=writer).set_json("v", value, ttl=-1)
+    for reader in ("json", "orjson", "msgpack"):
+        assert _cache(monkeypatch, CACHE_SERIALIZER=reader).get_json("v") == value
+
+
+# Compression (CACHE_COMPRESSION)
+
+@pytest.mark.parametrize("codec,magic", [("zlib", cache_module._MAGIC_ZLIB), ("zstd", cache_module._MAGIC_ZSTD)])
+def test_large_values_compressed_with_magic(monkeypatch, codec, magic):
+    if codec == "zstd" and cache_module.zstandard is None:
+        pytest.skip("zstandard not installed")
+    cache = _cache(monkeypatch, CACHE_COMPRESSION=codec, CACHE_COMPRESS_MIN_BYTES="100")
+    html = "<p>" + "lorem ipsum " * 500 + "</p>"
+    cache.set("page", html, ttl=-1)
+    stored = cache._redis.get("page")
+    assert stored.startswith(magic) and len(stored) < len(html)
+    assert cache.get("page") == html
+    cache.set("small", "tiny", ttl=-1)
+    assert cache._redis.get("small") == b"tiny"
+
+
+def test_uncompressed_old_values_still_read(monkeypatch):
+    cache = _cache(monkeypatch, CACHE_COMPRESSION="zstd", CACHE_COMPRESS_MIN_BYTES="10")
+    old = json.dumps({"text": "x" * 5000})
+    cache._redis.set("legacy", old.encode("utf-8"))
+    assert cache.get("legacy") == old
+    assert cache.get_json("legacy") == {"text": "x" * 5000}
+
+
+def test_values_readable_after_codec_change(monkeypatch):
+    value = {"text": "ü" * 3000}
+    _cache(monkeypatch, CACHE_COMPRESSION="zlib", CACHE_COMPRESS_MIN_BYTES="10").set_json("v", value, ttl=-1)
+    for codec in ("zstd", "none"):
+        assert _cache(monkeypatch, CACHE_COMPRESSION=codec).get_json("v") == value
+
+
+@pytest.mark.skipif(cache_module.zstandard is None, reason="zstandard not installed")
+def test_dictionary_values_need_the_dictionary(monkeypatch, tmp_path):
+    import zstandard
+
+    samples = [f"<html><body><div class='nav'>menu {i}</div><p>article {i}</p></body></html>".encode() * 20
+               for i in range(200)]
+    path = tmp_path / "html.zdict"
+    path.write_bytes(zstandard.train_dictionary(4096, samples).as_bytes())
+    cache = _cache(monkeypatch, CACHE_COMPRESSION="zstd", CACHE_COMPRESS_MIN_BYTES="10",
+                   CACHE_ZSTD_DICT_PATH=str(path), CACHE_ZSTD_DICT_PREFIXES="cache:content:")
+    page = samples[7].decode()
+    cache.set("cache:content:1", page, ttl=-1)
+    cache.set("other", page, ttl=-1)
+    assert cache._redis.get("cache:content:1").startswith(cache_module._MAGIC_ZSTD_DICT)
+    assert cache._redis.get("other").startswith(cache_module._MAGIC_ZSTD)
+    assert cache.get("cache:content:1") == page
+    monkeypatch.delenv("CACHE_ZSTD_DICT_PATH")
+    with pytest.raises(RuntimeError, match="dictionary"):
+        Cache().get("cache:content:1")
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr("app.core.circuit_breaker.time.monotonic", clock)
+    monkeypatch.setenv("CB_MIN_CALLS", "4")
+    monkeypatch.setenv("CB_WINDOW", "4")
+    monkeypatch.setenv("CB_COOLDOWN_S", "30")
+    b = CircuitBreaker("test")
+    b.clock = clock
+    return b
+
+
+def _trip(b):
+    for _ in range(4):
+        b.record(False, 0.1, b.allow())
+    assert b.state == "open"
+
+
+def test_breaker_opens_on_failure_rate(breaker):
+    breaker.record(True, 0.1, breaker.allow())
+    for _ in range(2):
+        breaker.record(False, 0.1, breaker.allow())
+    assert breaker.state == "closed"
+    breaker.record(False, 0.1, breaker.allow())
+    assert breaker.state == "open"
+    assert breaker.allow() is None
+    assert breaker.short_circuited == 1
+
+
+def test_breaker_half_open_probe_closes(breaker):
+    _trip(breaker)
+    breaker.clock.now += 31
+    probe = breaker.allow()
+    assert probe is not None and probe.probe and breaker.state == "half_open"
+    assert breaker.allow() is None
+    breaker.record(True, 0.1, probe)
+    assert breaker.state == "closed"
+    assert breaker.failure_rate() == 0.0
+
+
+def test_breaker_failed_probe_reopens(breaker):
+    _trip(breaker)
+    breaker.clock.now += 31
+    breaker.record(False, 0.1, breaker.allow())
+    assert breaker.state == "open" and breaker.times_opened == 2
+
+
+def test_breaker_ignores_late_non_probe_outcomes(breaker):
+    stale = breaker.allow()
+    _trip(breaker)
+    breaker.clock.now += 31
+    probe = breaker.allow()
+    breaker.record(True, 0.1, stale)
+    assert breaker.state == "half_open"
+    breaker.record(False, 0.1, probe)
+    assert breaker.state == "open"
+
+
+def test_breaker_released_probe_frees_slot(breaker):
+    _trip(breaker)
+    breaker.clock.now += 31
+    probe = breaker.allow()
+    breaker.release(probe)
+    again = breaker.allow()
+    assert again is not None and again.probe
+
+
+def test_breaker_cancelled_call_releases_probe(breaker):
+    _trip(breaker)
+    breaker.clock.now += 31
+    probe = breaker.allow()
+
+    async def cancelled():
+        task = asyncio.ensure_future(breaker.call(asyncio.sleep(10), probe))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled())
+    assert breaker.state == "half_open"
+    assert breaker.allow() is not None
+
+
+def test_breaker_timeout_counts_as_failure(monkeypatch):
+    monkeypatch.setenv("CB_TIMEOUT_MAX_S", "0.05")
+    b = CircuitBreaker("slow")
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(b.call(asyncio.sleep(1), b.allow()))
+    assert b.timeouts == 1 and b.failure_rate() == 1.0
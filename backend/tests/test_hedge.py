@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.core.circuit_breaker import PROVIDER_BREAKERS
+from app.core.hedge import RequestHedger
+
+
+def _hedger(monkeypatch, provider, ratio="1"):
+    monkeypatch.setenv("HEDGE_ENABLED", "true")
+    monkeypatch.setenv("HEDGE_PROVIDERS", provider)
+    monkeypatch.setenv("HEDGE_MIN_DELAY_S", "0.05")
+    monkeypatch.setenv("HEDGE_BUDGET_RATIO", ratio)
+    b = PROVIDER_BREAKERS.get(provider)
+    for _ in range(b.min_calls):
+        b.record(True, 0.01)
+    return RequestHedger()
+
+
+def _factory(*behaviours):
+    calls = []
+
+    async def factory():
+        delay, result = behaviours[len(calls)]
+        calls.append(result)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return factory, calls
+
+
+def test_hedger_off_without_latency_samples(monkeypatch):
+    monkeypatch.setenv("HEDGE_ENABLED", "true")
+    monkeypatch.setenv("HEDGE_PROVIDERS", "fresh")
+    assert RequestHedger().delay_for("fresh") is None
+
+
+def test_hedge_wins_over_slow_primary(monkeypatch):
+    hedger = _hedger(monkeypatch, "hedge-win")
+    factory, calls = _factory((1.0, "primary"), (0.0, "hedge"))
+    assert asyncio.run(hedger.run("hedge-win", factory)) == "hedge"
+    stats = hedger.snapshot()["stats"]["hedge-win"]
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+
+def test_hedge_denied_without_budget(monkeypatch):
+    hedger = _hedger(monkeypatch, "hedge-budget", ratio="0")
+    factory, calls = _factory((0.1, "primary"), (0.0, "hedge"))
+    assert asyncio.run(hedger.run("hedge-budget", factory)) == "primary"
+    assert calls == ["primary"]
+    assert hedger.snapshot()["stats"]["hedge-budget"]["budget_denied"] == 1
+
+
+def test_hedge_both_failing_raises_primary_error(monkeypatch):
+    hedger = _hedger(monkeypatch, "hedge-fail")
+    factory, _ = _factory((0.1, ValueError("primary")), (0.0, KeyError("hedge")))
+    with pytest.raises(ValueError, match="primary"):
+        asyncio.run(hedger.run("hedge-fail", factory))
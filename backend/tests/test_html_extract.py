@@ -0,0 +1,40 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services import html_extract
+from app.services.html_extract import ParsePool
+
+
+def _pool(monkeypatch, work_s, cpu_limit_s="0.1", workers="1"):
+    """ParsePool over a thread pool whose 'extraction' takes work_s of wall time."""
+    monkeypatch.setenv("PARSE_POOL_WORKERS", workers)
+    monkeypatch.setenv("PARSE_CPU_LIMIT_S", cpu_limit_s)
+    pool = ParsePool()
+    executor = ThreadPoolExecutor(max_workers=int(workers))
+    monkeypatch.setattr(pool, "_get_pool", lambda: executor)
+
+    def extract(html, cpu_limit_s):
+        time.sleep(work_s)
+        return {"text": html, "extraction_method": "stub"}
+
+    monkeypatch.setattr(html_extract, "_extract_with_cpu_limit", extract)
+    return pool
+
+
+def test_queued_documents_do_not_hit_wall_limit(monkeypatch):
+    # Each document needs 0.2s, under the 0.3s guard, but five of them
+    # queue for one worker for ~1s in total
+    pool = _pool(monkeypatch, work_s=0.2)
+
+    async def burst():
+        return await asyncio.gather(*(pool.extract(f"<p>{i}</p>") for i in range(5)))
+
+    results = asyncio.run(burst())
+    assert [r["extraction_method"] for r in results] == ["stub"] * 5
+
+
+def test_stuck_worker_falls_back(monkeypatch):
+    pool = _pool(monkeypatch, work_s=0.5)
+    result = asyncio.run(pool.extract("<p>slow</p>"))
+    assert result["extraction_method"] == "timeout_fallback"
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_reserves_in_order(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    bucket = TokenBucket(rate=10, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2:] == pytest.approx([0.1, 0.2])
+    clock.now += 1.0
+    assert bucket.reserve() == 0.0
+
+
+def test_redis_bucket_is_shared(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_BACKEND", "redis")
+    monkeypatch.setenv("RATE_LIMIT_TAVILY", "2")
+    first, second = RateLimiter(), RateLimiter()
+    assert first._redis_reserve("tavily") == 0.0
+    # The second process's bucket sees the token the first one took
+    assert second._redis_reserve("tavily") == pytest.approx(0.5, abs=0.05)
+
+
+def test_zero_rate_disables_limit(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_BRAVE", "0")
+    limiter = RateLimiter()
+    assert asyncio.run(limiter.acquire("brave")) == 0.0
+    assert asyncio.run(limiter.acquire("brave")) == 0.0
+
+
+def test_concurrent_acquires_queue_at_rate(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_OPENAI", "20")
+    limiter = RateLimiter()
+
+    async def burst():
+        return await asyncio.gather(*(limiter.acquire("OpenAI") for _ in range(3)))
+
+    waits = asyncio.run(burst())
+    assert waits == pytest.approx([0.0, 0.05, 0.1], abs=0.01)
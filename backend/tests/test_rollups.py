@@ -0,0 +1,85 @@
+import pytest
+import redis
+
+from app.core.cache import CACHE
+from app.services import rollups
+from app.services.rollups import ROLLUPS
+
+
+@pytest.fixture
+def runs(make_run):
+    for i in range(6):
+        make_run(f"r{i}", f"2024-03-0{i + 1}T00:00:00Z", subject="A" if i % 2 else "B", cited=i)
+    CACHE.set(ROLLUPS.built_key, "1", ttl=-1)
+
+
+def test_rollups_match_full_scan(runs):
+    for subject in (None, "A", "B"):
+        report = ROLLUPS.check(subject)
+        assert report["consistent"], report["mismatches"]
+    assert ROLLUPS.read("all")["totals"]["runs"] == 6
+
+
+def test_collect_uses_rollups_only_for_whole_dataset(runs, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ROLLUPS, "scan", lambda **kw: calls.append(kw) or {})
+    ROLLUPS.collect()
+    assert calls == []
+    ROLLUPS.collect(limit=2)
+    assert calls and calls[0]["limit"] == 2
+
+
+def test_apply_is_idempotent(runs, make_run):
+    bundle = make_run("r6", "2024-03-09T00:00:00Z", cited=2)
+    assert ROLLUPS.apply("r6", bundle) is False
+    assert ROLLUPS.check()["consistent"]
+
+
+def test_failed_apply_leaves_run_unapplied(runs, monkeypatch):
+    execute = redis.client.Pipeline.execute
+
+    def failing(self, *args, **kwargs):
+        if self.command_stack:
+            raise redis.ConnectionError("down")
+        return execute(self, *args, **kwargs)
+
+    monkeypatch.setattr(redis.client.Pipeline, "execute", failing)
+    with pytest.raises(redis.ConnectionError):
+        ROLLUPS.apply("late", {"run": {"run_id": "late"}, "evidence": [{"source_id": "s0"}]})
+    monkeypatch.setattr(redis.client.Pipeline, "execute", execute)
+    assert not CACHE._redis.sismember(ROLLUPS.applied_key, "late")
+    assert ROLLUPS.check()["consistent"]
+
+
+def test_lists_are_capped_newest_first(make_run, monkeypatch):
+    monkeypatch.setattr(rollups, "LIST_LIMIT", 3)
+    for i in range(5):
+        make_run(f"r{i}", f"2024-03-0{i + 1}T00:00:00Z", cited=1)
+    CACHE.set(ROLLUPS.built_key, "1", ttl=-1)
+    cited = ROLLUPS.read("all")["cited"]
+    assert len(cited) == 3
+    assert ROLLUPS.check()["consistent"]
+    ROLLUPS.rebuild()
+    assert ROLLUPS.read("all")["cited"] == cited
+    assert ROLLUPS.check()["consistent"]
+
+
+def test_aggregate_stats_count_evidence_and_distinct_sources(runs):
+    from app.redis.redis_utils import RedisUtils
+
+    expected = {"total_sources": 12, "total_cited_sources": 15, "total_distinct_cited_sources": 9}
+    stats = RedisUtils.get_aggregate_stats()
+    assert {k: stats["totals"][k] for k in expected} == expected
+    assert stats["totals"]["avg_citation_rate"] == round(15 / 12, 4)
+    # Same numbers from the full scan
+    CACHE.delete(ROLLUPS.built_key)
+    stats = RedisUtils.get_aggregate_stats()
+    assert {k: stats["totals"][k] for k in expected} == expected
+
+
+def test_rollups_from_older_version_are_ignored(runs):
+    CACHE.delete(ROLLUPS.built_key)
+    CACHE.set(CACHE.ai_key("rollup:built_at"), "1", ttl=-1)
+    assert not ROLLUPS.is_built()
+    ROLLUPS.rebuild()
+    assert ROLLUPS.is_built() and ROLLUPS.check()["consistent"]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services import run_events
+from app.services.run_events import IDLE_ERROR, RunEventChannel
+from app.services.run_jobs import RunQueue
+
+
+def _parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def _collect(events):
+    return [event async for event in events]
+
+
+@pytest.fixture
+def channel(monkeypatch):
+    """A fresh local event channel behind the stream endpoint."""
+    from app.routers import runs
+
+    channel = RunEventChannel()
+    channel.mirror_to_redis = False
+    monkeypatch.setattr(runs, "RUN_EVENTS", channel)
+    return channel
+
+
+def test_stream_replays_local_run_events(client, channel):
+    async def run():
+        channel.open("r1")
+        await channel.publish("r1", {"type": "stage", "stage": "searching"})
+        await channel.publish("r1", {"type": "sentence", "text": "Finding 0."})
+        await channel.publish("r1", {"type": "done", "run_id": "r1"})
+
+    asyncio.run(run())
+    resp = client.get("/api/runs/r1/stream")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    assert [name for name, _ in _parse_sse(resp.text)] == ["stage", "sentence", "done"]
+
+
+def test_stream_unknown_run_is_404(client, channel):
+    assert client.get("/api/runs/missing/stream").status_code == 404
+
+
+def test_stream_stored_run_without_channel_ends_immediately(client, channel, make_run):
+    make_run("old", "2024-03-01T00:00:00Z")
+    assert _parse_sse(client.get("/api/runs/old/stream").text) == [("done", {"type": "done", "run_id": "old"})]
+
+
+def test_stream_follows_job_record_of_another_worker(client, channel):
+    # Run executing elsewhere with no mirrored events: only its job record is shared
+    async def run():
+        queue = RunQueue()
+        await queue._set_status("r2", "composing")
+        await queue._set_status("r2", "done")
+
+    asyncio.run(run())
+    assert not channel.is_local("r2")
+    assert _parse_sse(client.get("/api/runs/r2/stream").text) == [("done", {"type": "done", "run_id": "r2"})]
+
+
+def test_redis_mirror_reaches_subscriber_in_another_worker():
+    producer, consumer = RunEventChannel(), RunEventChannel()
+    producer.mirror_to_redis = consumer.mirror_to_redis = True
+    consumer.poll_interval = 0.01
+
+    async def run():
+        await RunQueue()._set_status("r3", "fetching")
+        producer.open("r3")
+        await producer.publish("r3", {"type": "stage", "stage": "fetching"})
+        follower = asyncio.create_task(_collect(consumer.subscribe("r3")))
+        await asyncio.sleep(0.05)
+        await producer.publish("r3", {"type": "done", "run_id": "r3"})
+        return await asyncio.wait_for(follower, 5)
+
+    events = asyncio.run(run())
+    assert [e["type"] for e in events] == ["stage", "done"]
+    assert not consumer.is_local("r3")
+
+
+def test_idle_channel_is_collected_and_subscribers_released():
+    channel = RunEventChannel()
+    channel.mirror_to_redis = False
+
+    async def run():
+        channel.open("crashed")
+        await channel.publish("crashed", {"type": "stage", "stage": "searching"})
+        follower = asyncio.create_task(_collect(channel.subscribe("crashed")))
+        await asyncio.sleep(0)
+        # No terminal event ever arrives; the next open() collects the channel
+        channel._last_event_at["crashed"] -= channel.idle_ttl + 1
+        channel.open("next")
+        return await asyncio.wait_for(follower, 5)
+
+    events = asyncio.run(run())
+    assert events[-1] == {"type": "failed", "run_id": "crashed", "error": IDLE_ERROR}
+    assert not channel.is_local("crashed")
+    assert "crashed" not in channel._last_event_at
+    assert channel.is_local("next")
+
+
+def test_finished_channel_kept_until_events_ttl():
+    channel = RunEventChannel()
+    channel.mirror_to_redis = False
+    channel.idle_ttl = 0
+
+    async def run():
+        await channel.publish("r4", {"type": "done", "run_id": "r4"})
+
+    asyncio.run(run())
+    channel._last_event_at["r4"] -= 10
+    channel.open("other")
+    assert channel.is_local("r4")
+    channel._finished_at["r4"] -= run_events.EVENTS_TTL + 1
+    channel.open("other")
+    assert not channel.is_local("r4")
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import CACHE
+from app.core.store import STORE
+from app.services.run_jobs import RunQueue, get_job, get_job_async
+
+
+@pytest.fixture
+def no_sync_redis(monkeypatch):
+    """Fail any blocking Cache call made from the code under test."""
+    def blocked(*args, **kwargs):
+        raise AssertionError("blocking Redis call on the event loop")
+
+    for name in ("get_json", "set_json", "exists", "smembers", "brpop"):
+        monkeypatch.setattr(CACHE, name, blocked)
+
+
+async def _wait_for_status(run_id, status, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        job = await get_job_async(run_id)
+        if job and job.get("status") == status:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"run {run_id} never reached {status}: {await get_job_async(run_id)}")
+
+
+@pytest.mark.parametrize("backend", ["local", "redis"])
+def test_background_run_records_stages(stub_pipeline, monkeypatch, backend):
+    monkeypatch.setenv("RUN_QUEUE_BACKEND", backend)
+    queue = RunQueue()
+
+    async def scenario():
+        await queue.start()
+        try:
+            run_id = await queue.enqueue("heat pumps", "Energy")
+            return run_id, await _wait_for_status(run_id, "done")
+        finally:
+            await queue.stop()
+
+    run_id, job = asyncio.run(scenario())
+    assert list(job["stages"]) == ["queued", "searching", "fetching", "composing", "aligning", "done"]
+    assert job["query"] == "heat pumps"
+    assert get_job(run_id) == job
+    assert STORE.get_section(run_id, "run")["subject"] == "Energy"
+
+
+def test_job_status_uses_async_client(no_sync_redis):
+    queue = RunQueue()
+
+    async def scenario():
+        await queue._set_status("r1", "queued", query="q")
+        await queue._set_status("r1", "searching")
+        return await get_job_async("r1")
+
+    job = asyncio.run(scenario())
+    assert job["status"] == "searching" and job["query"] == "q"
+    assert list(job["stages"]) == ["queued", "searching"]
+
+
+def test_subjects_endpoint_reads_index_without_blocking(make_run, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routers import search
+
+    make_run("a", "2024-03-01T00:00:00Z", subject="Energy")
+    make_run("b", "2024-03-02T00:00:00Z", subject="Health ")
+    app = FastAPI()
+    app.include_router(search.router, prefix="/api/search")
+    client = TestClient(app)
+
+    # Not backfilled: falls back to the run headers
+    assert client.get("/api/search/subjects").json() == {"subjects": ["Energy", "Health"]}
+    STORE.backfill_subject_index()
+    for name in ("get_json", "exists", "smembers"):
+        monkeypatch.setattr(CACHE, name, lambda *a, **k: pytest.fail("blocking Redis call"))
+    assert client.get("/api/search/subjects").json() == {"subjects": ["Energy", "Health"]}
+
+
+@pytest.fixture
+def slow_search(stub_pipeline, monkeypatch):
+    """Searches that only finish when released."""
+    from app.services import run_pipeline
+
+    release = {}
+    fast = run_pipeline.iter_search
+
+    async def iter_search(query, limit_per_query=None):
+        if "event" not in release:
+            release["event"] = asyncio.Event()
+        await release["event"].wait()
+        async for event in fast(query):
+            yield event
+
+    monkeypatch.setattr(run_pipeline, "iter_search", iter_search)
+    return release
+
+
+def test_stop_fails_local_jobs_in_flight_and_queued(slow_search, monkeypatch):
+    from app.services.run_events import RUN_EVENTS
+    from app.services.run_jobs import INTERRUPTED
+
+    monkeypatch.setenv("RUN_QUEUE_BACKEND", "local")
+    monkeypatch.setenv("RUN_WORKERS", "1")
+    queue = RunQueue()
+
+    async def scenario():
+        await queue.start()
+        running = await queue.enqueue("first")
+        waiting = await queue.enqueue("second")
+        await _wait_for_status(running, "searching")
+        await queue.stop()
+        return running, waiting
+
+    running, waiting = asyncio.run(scenario())
+    for run_id in (running, waiting):
+        job = get_job(run_id)
+        assert job["status"] == "failed" and job["error"] == INTERRUPTED
+        assert RUN_EVENTS._history[run_id][-1]["type"] == "failed"
+    assert list(get_job(running)["stages"]) == ["queued", "searching", "failed"]
+    with pytest.raises(RuntimeError):
+        asyncio.run(queue.enqueue("after stop"))
+
+
+def test_stop_requeues_redis_jobs_for_another_worker(slow_search, monkeypatch):
+    monkeypatch.setenv("RUN_QUEUE_BACKEND", "redis")
+    monkeypatch.setenv("RUN_WORKERS", "1")
+
+    async def interrupted():
+        queue = RunQueue()
+        await queue.start()
+        run_id = await queue.enqueue("heat pumps")
+        await _wait_for_status(run_id, "searching")
+        await queue.stop()
+        return run_id
+
+    run_id = asyncio.run(interrupted())
+    assert get_job(run_id)["status"] == "queued"
+    assert CACHE._redis.llen(RunQueue.queue_key()) == 1
+
+    async def resumed():
+        slow_search["event"] = asyncio.Event()
+        slow_search["event"].set()
+        queue = RunQueue()
+        await queue.start()
+        try:
+            return await _wait_for_status(run_id, "done")
+        finally:
+            await queue.stop()
+
+    assert asyncio.run(resumed())["status"] == "done"
+    assert STORE.get_section(run_id, "run")["query"] == "heat pumps"
@@ -0,0 +1,74 @@
+import json
+
+from app.core.store import STORE
+
+
+def _page_all(limit):
+    seen, cursor = [], None
+    while True:
+        items, cursor = STORE.page_run_ids(cursor, limit)
+        seen += [r for r, _ in items]
+        if cursor is None:
+            return seen
+
+
+def test_cursor_round_trips_score_exactly(make_run):
+    make_run("a", "2024-03-01T12:00:00.123456Z")
+    make_run("b", "2024-03-01T12:00:00.123457Z")
+    items, cursor = STORE.page_run_ids(None, 1)
+    assert [r for r, _ in items] == ["b"]
+    score, run_id = cursor.split(":", 1)
+    assert float(score) == items[0][1] and run_id == "b"
+    items, cursor = STORE.page_run_ids(cursor, 1)
+    assert [r for r, _ in items] == ["a"]
+
+
+def test_equal_scores_across_page_boundary(make_run):
+    for run_id in ("r1", "r2", "r3", "r4", "r5"):
+        make_run(run_id, "2024-03-01T12:00:00Z")
+    make_run("older", "2024-02-01T12:00:00Z")
+    for limit in (1, 2, 4):
+        assert _page_all(limit) == ["r5", "r4", "r3", "r2", "r1", "older"]
+
+
+def test_runs_added_meanwhile_do_not_shift_pages(make_run):
+    for i in range(4):
+        make_run(f"r{i}", f"2024-03-0{i + 1}T00:00:00Z")
+    items, cursor = STORE.page_run_ids(None, 2)
+    make_run("new", "2024-04-01T00:00:00Z")
+    items, cursor = STORE.page_run_ids(cursor, 2)
+    assert [r for r, _ in items] == ["r1", "r0"]
+
+
+def test_list_runs_pages_and_summaries(client, make_run):
+    make_run("a", "2024-03-01T00:00:00Z", cited=3)
+    make_run("b", "2024-03-02T00:00:00Z")
+    first = client.get("/api/runs", params={"limit": 1}).json()
+    assert [i["run_id"] for i in first["items"]] == ["b"]
+    second = client.get("/api/runs", params={"limit": 1, "cursor": first["next_cursor"]}).json()
+    assert [i["run_id"] for i in second["items"]] == ["a"]
+    # A full page always carries a cursor; the page after the last run is empty
+    third = client.get("/api/runs", params={"limit": 1, "cursor": second["next_cursor"]}).json()
+    assert third == {"items": [], "next_cursor": None}
+    assert second["items"][0]["cited_count"] == 3
+    assert second["items"][0]["cited_sources"] == 2
+
+
+def test_malformed_cursor_is_400(client, make_run):
+    make_run("a", "2024-03-01T00:00:00Z")
+    for cursor in ("garbage", "notanumber:a", ":"):
+        assert client.get("/api/runs", params={"cursor": cursor}).status_code == 400
+
+
+def test_ndjson_export_matches_list_runs(client, make_run):
+    for i in range(7):
+        make_run(f"r{i}", "2024-03-01T00:00:00Z" if i < 3 else f"2024-03-0{i}T00:00:00Z")
+    resp = client.get("/api/export/runs.ndjson")
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line) for line in resp.text.splitlines()]
+    listed = client.get("/api/runs", params={"limit": 500}).json()["items"]
+    assert [b["run"]["run_id"] for b in exported] == [i["run_id"] for i in listed]
+    for bundle, summary in zip(exported, listed):
+        assert bundle["run"]["query"] == summary["query"]
+        assert len(bundle["sources"]) == summary["sources_count"]
+        assert len(bundle["evidence"]) == summary["cited_count"]
@@ -0,0 +1,65 @@
+import asyncio
+
+from app.core.store import STORE
+from app.services import run_pipeline
+
+
+def _execute(query, **kwargs):
+    stages, events = [], []
+
+    async def on_stage(name):
+        stages.append(name)
+
+    async def on_event(event):
+        events.append(event)
+
+    run_id = asyncio.run(run_pipeline.execute_run(query, on_stage=on_stage, on_event=on_event, **kwargs))
+    return run_id, stages, events
+
+
+def test_execute_run_persists_full_bundle(stub_pipeline):
+    run_id, stages, events = _execute("renewables in europe", run_id="fixed-id")
+    assert run_id == "fixed-id"
+    assert stages == run_pipeline.STAGES
+    types = [e["type"] for e in events]
+    assert types == ["provider_results", "search_done", "document", "document", "fetch_done", "sentence", "sentence"]
+    assert [e["index"] for e in events if e["type"] == "sentence"] == [0, 1]
+
+    bundle = STORE.get_run(run_id)
+    assert bundle["run"]["query"] == "renewables in europe"
+    # Sources keep provider rank order, not fetch completion order
+    assert [s["url"] for s in bundle["sources"]] == ["https://site0.com/a", "https://site1.com/a"]
+    assert [s["raw_text"] for s in bundle["sources"]] == stub_pipeline["texts"]
+    assert bundle["answer"]["text"] == "Finding 0. Finding 1."
+    assert len(bundle["claims"]) == 2 and len(bundle["evidence"]) == 2
+    assert bundle["provider_performance"]["tavily"]["circuit_breaker"] == {"state": "closed"}
+    assert bundle["provider_performance"]["tavily"]["count"] == 2
+    assert bundle["fetch_summary"]["good_docs"] == 2
+
+
+def test_execute_run_without_results_stores_empty_bundle(monkeypatch):
+    async def iter_search(query, limit_per_query=None):
+        yield {"type": "search_done", "results": [], "provider_performance": {}}
+
+    monkeypatch.setattr(run_pipeline, "iter_search", iter_search)
+    run_id, stages, _ = _execute("nothing here")
+    assert stages == ["searching", "done"]
+    bundle = STORE.get_run(run_id)
+    assert bundle["sources"] == [] and bundle["run"]["search_model"] == "None"
+
+
+def test_search_endpoint_dedupes_by_query(stub_pipeline):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.routers import search
+
+    app = FastAPI()
+    app.include_router(search.router, prefix="/api/search")
+    client = TestClient(app)
+
+    first = client.post("/api/search/run", json={"query": "Heat pumps"}).json()
+    again = client.post("/api/search/run", json={"query": "  heat PUMPS "}).json()
+    assert again["run_id"] == first["run_id"] and stub_pipeline["search"] == 1
+    forced = client.post("/api/search/run", json={"query": "heat pumps", "force": True}).json()
+    assert forced["run_id"] != first["run_id"] and stub_pipeline["search"] == 2
+    assert STORE.get_run(forced["run_id"])["answer"]["text"]
@@ -0,0 +1,174 @@
+import pytest
+
+from app.core.store import STORE
+
+
+def test_create_run_keeps_search_stage_provider_stats():
+    from app.services.run_pipeline import empty_bundle
+
+    bundle = empty_bundle("q", None, None, "pp")
+    bundle["sources"] = [
+        {"source_id": "s1", "url": "https://a.com/1", "domain": "a.com", "search_provider": "tavily", "content_length": 100},
+        {"source_id": "s2", "url": "https://a.com/2", "domain": "a.com", "search_provider": "tavily", "content_length": 300},
+    ]
+    breaker = {"state": "closed", "timeouts": 1, "short_circuited": 0}
+    bundle["provider_performance"] = {
+        "tavily": {"queries_attempted": 3, "errors": 1, "timeouts": 1, "cache_hits": 2, "cache_stale_hits": 0,
+                   "circuit_breaker": breaker, "hedging": {"hedges": 1, "hedge_wins": 1}},
+        "brave": {"queries_attempted": 3, "errors": 3, "short_circuited": 2, "cache_hits": 0,
+                  "circuit_breaker": {"state": "open"}},
+    }
+    STORE.create_run(bundle)
+
+    saved = STORE.get_sections("pp", ["provider_performance"])["provider_performance"]
+    tavily = saved["tavily"]
+    assert tavily["circuit_breaker"] == breaker
+    assert tavily["hedging"] == {"hedges": 1, "hedge_wins": 1}
+    assert (tavily["errors"], tavily["timeouts"], tavily["cache_hits"]) == (1, 1, 2)
+    assert (tavily["count"], tavily["avg_content_length"]) == (2, 200)
+    # A provider without sources keeps its search stats and gets zero counts
+    assert saved["brave"]["circuit_breaker"] == {"state": "open"}
+    assert (saved["brave"]["short_circuited"], saved["brave"]["count"]) == (2, 0)
+
+
+# Legacy JSON-string bundles and migration to the hash layout
+
+def _legacy_bundle(run_id):
+    return {
+        "run": {"run_id": run_id, "query": "legacy query", "subject": "Executive Search",
+                "created_at": "2023-06-01T00:00:00Z"},
+        "sources": [{"source_id": "s1", "url": "https://a.com", "raw_text": "Alpha page text."}],
+        "fetched_docs": [{"url": "https://a.com", "raw_text": "Alpha page text."}],
+        "evidence": [{"source_id": "s1", "snippet": "Alpha"}],
+        "answer": {"text": "Alpha."},
+    }
+
+
+def _without_refs(bundle):
+    # Hydrated documents keep raw_text_ref next to raw_text
+    return {
+        name: [{k: v for k, v in item.items() if k != "raw_text_ref"} for item in section]
+        if name in ("sources", "fetched_docs") else section
+        for name, section in bundle.items()
+    }
+
+
+def _store_legacy(run_id, ttl=-1):
+    from app.core.cache import CACHE
+
+    bundle = _legacy_bundle(run_id)
+    CACHE.set_json(STORE.legacy_key(run_id), bundle, ttl=ttl)
+    return bundle
+
+
+def test_legacy_bundles_are_read():
+    bundle = _store_legacy("old-1")
+    assert STORE.get_run("old-1") == bundle
+    assert STORE.get_sections("old-1", ["evidence"]) == {"run": bundle["run"], "evidence": bundle["evidence"]}
+    assert STORE.get_sections_many(["old-1", "nope"], ["answer"]) == {
+        "old-1": {"run": bundle["run"], "answer": bundle["answer"]}
+    }
+
+
+def test_migrate_run_rewrites_as_hash_with_blobs():
+    from app.core.cache import CACHE
+
+    bundle = _store_legacy("old-2", ttl=600)
+    assert STORE.migrate_run("old-2") is True
+    assert not CACHE.exists(STORE.legacy_key("old-2"))
+    assert CACHE._redis.type(STORE.run_key("old-2")) == b"hash"
+    assert 0 < CACHE.ttl(STORE.run_key("old-2")) <= 600
+    stored = CACHE.hgetall_json(STORE.run_key("old-2"))
+    assert "raw_text" not in stored["sources"][0]
+    assert stored["sources"][0]["raw_text_ref"] == stored["fetched_docs"][0]["raw_text_ref"]
+    assert _without_refs(STORE.get_run("old-2")) == bundle
+    assert STORE.get_run("old-2", hydrate_text=False)["sources"][0].get("raw_text") is None
+    assert STORE.migrate_run("old-2") is False
+
+
+def test_migrate_bundles_command():
+    from app.redis.redis_utils import RedisUtils
+
+    run_id = "3f2b7c1e-8d4a-4c1b-9a51-0e6f2d7b9c10"
+    bundle = _store_legacy(run_id)
+    result = RedisUtils.migrate_bundles()
+    assert result["migrated"] == 1
+    assert _without_refs(STORE.get_run(run_id)) == bundle
+
+
+@pytest.mark.parametrize("registries", [False, True])
+def test_status_counts_legacy_bundles_separately(make_run, registries):
+    from app.redis.redis_utils import RedisUtils
+
+    make_run("new-1", "2024-03-01T00:00:00Z")
+    _store_legacy("old-3")
+    if registries:
+        STORE.backfill_registries()
+    status = RedisUtils.show_status()
+    assert status["source"] == ("registry" if registries else "scan")
+    assert status["detailed_keys"]["search_bundles"] == [STORE.run_key("new-1")]
+    assert status["detailed_keys"]["legacy_bundles"] == [STORE.legacy_key("old-3")]
+    assert status["total_keys"] == sum(status["key_types"].values())
+
+
+# In-process L1 (BUNDLE_CACHE) for single-run reads
+
+def _count_redis_reads(monkeypatch):
+    from app.core.cache import CACHE
+
+    reads = []
+    for name in ("hgetall_raw", "hmget_raw"):
+        original = getattr(CACHE, name)
+
+        def spy(key, *args, _original=original, _name=name):
+            reads.append((_name, list(args[0]) if args else None))
+            return _original(key, *args)
+
+        monkeypatch.setattr(CACHE, name, spy)
+    return reads
+
+
+def test_l1_loads_only_requested_sections(make_run, monkeypatch):
+    make_run("l1", "2024-03-01T00:00:00Z", cited=3)
+    reads = _count_redis_reads(monkeypatch)
+    sources = STORE.get_sections("l1", ["sources"])
+    assert set(sources) == {"run", "sources"}
+    assert reads == [("hmget_raw", ["run", "sources"])]
+    # Cached sections are served from L1; only the new one is read
+    evidence = STORE.get_sections("l1", ["sources", "evidence"])
+    assert len(evidence["evidence"]) == 3
+    assert reads[1:] == [("hmget_raw", ["evidence"])]
+    STORE.get_sections("l1", ["evidence"])
+    assert len(reads) == 2
+    bundle = STORE.get_run("l1")
+    assert reads[2:] == [("hgetall_raw", None)]
+    assert STORE.get_run("l1") == bundle and len(reads) == 3
+
+
+def test_l1_results_are_copies(make_run):
+    make_run("l1", "2024-03-01T00:00:00Z", cited=2)
+    first = STORE.get_sections("l1", ["evidence"], hydrate_text=True)
+    first["evidence"].clear()
+    first["run"]["query"] = "mutated"
+    again = STORE.get_run("l1")
+    again["sources"][0]["url"] = "mutated"
+    assert len(STORE.get_sections("l1", ["evidence"])["evidence"]) == 2
+    bundle = STORE.get_run("l1")
+    assert bundle["run"]["query"] == "query l1"
+    assert bundle["sources"][0]["url"] != "mutated"
+
+
+def test_l1_invalidated_on_save_bundle(make_run):
+    bundle = make_run("l1", "2024-03-01T00:00:00Z")
+    assert STORE.get_sections("l1", ["answer"])["answer"]["text"] != "rewritten"
+    bundle["answer"] = {"text": "rewritten"}
+    STORE.save_bundle("l1", bundle)
+    assert STORE.get_sections("l1", ["answer"])["answer"]["text"] == "rewritten"
+    assert STORE.get_run("l1")["answer"]["text"] == "rewritten"
+
+
+def test_l1_missing_runs_are_not_cached(make_run):
+    assert STORE.get_sections("later", ["sources"]) is None
+    assert STORE.get_run("later") is None
+    make_run("later", "2024-03-01T00:00:00Z")
+    assert STORE.get_sections("later", ["sources"])["run"]["run_id"] == "later"